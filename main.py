@@ -1,13 +1,29 @@
+import argparse
+import contextlib
+import multiprocessing as mp
+import os
+import sqlite3
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-from typing import Optional
-import random
+from typing import List, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from uno_logic import Game, Card, COLORS
+from uno_history import MatchHistory, HUMAN, MIXED_BOT
+from uno_speculate import BotReplySpeculator, state_key
+from uno_hints import HintEngine
+from uno_review import DecisionPoint, Review, format_grade, summary
+from uno_uimon import DEFAULT_OUT, UiMonitor
+
+# Spectator mode: ms per bot move (0 = as fast as possible)
+SPECTATE_SPEEDS = {"Normal": 800, "Fast": 150, "Very fast": 20, "Max": 0}
+MAX_FPS = 20
+LOG_LIMIT = 2000  # log lines kept; older ones are dropped
 
 
 class UnoGUI:
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, history: Optional[MatchHistory] = None):
         self.root = root
         self.root.title("UNO (Python)")
         self.root.geometry("1140x820")
@@ -24,10 +40,40 @@ class UnoGUI:
         self.hand_page = 0
         # Round-end guard
         self._round_end_processed = False
+        # Bot replies precomputed while the human decides
+        self.speculator = BotReplySpeculator()
+        self._speculated_for: Optional[tuple] = None
+        # Move hints (win probability per option), computed on a process pool
+        self.hints = HintEngine()
+        self._hint_timer: Optional[str] = None
+        self.hand_buttons = {}  # hand index -> (button, base text)
+        # Set by main() with --monitor; modal dialogs pause its timers
+        self.monitor: Optional[UiMonitor] = None
+        # Post-round review: the human's decisions this round and in the last finished one
+        self.decisions: List[DecisionPoint] = []
+        self.last_decisions: List[DecisionPoint] = []
+        self.review_pool: Optional[ProcessPoolExecutor] = None
+        # Spectator mode: every seat is a bot
+        self.spectating = False
+        self._spectate_timer: Optional[str] = None
+        self._render_timer: Optional[str] = None
+        self._last_render = 0.0
+        # Log lines waiting for one batched Listbox insert
+        self._log_buffer = []
+        self._log_flush_id: Optional[str] = None
 
         # Match scoring
         self.scores = [0, 0, 0, 0]
         self.target_score = 500
+        # Persistent history: resume the scores of an unfinished match
+        self.history = history
+        self.match_id: Optional[int] = None
+        if self.history:
+            resumed = self.history.unfinished_match("gui")
+            if resumed:
+                self.match_id, self.scores = resumed
+            else:
+                self.match_id = self.history.start_match("gui", self.target_score)
 
         # Top frame
         self.info_frame = tk.Frame(root, bg="#1e1e1e")
@@ -54,6 +100,17 @@ class UnoGUI:
         # New Game button below scoreboard
         self.new_button = tk.Button(self.right_panel, text="New Game", command=self.new_game, bg="#0e639c", fg="#fff", font=("Segoe UI", 11, "bold"), relief=tk.FLAT, padx=12, pady=8)
         self.new_button.pack(fill=tk.X, padx=12, pady=(2, 10))
+        # Spectator controls
+        spectate_row = tk.Frame(self.right_panel, bg="#1e1e1e")
+        spectate_row.pack(fill=tk.X, padx=12, pady=(0, 10))
+        self.spectate_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(spectate_row, text="Spectate", variable=self.spectate_var, command=self.on_toggle_spectate,
+                       bg="#1e1e1e", fg="#fff", selectcolor="#3c3c3c", activebackground="#1e1e1e",
+                       font=("Segoe UI", 11)).pack(side=tk.LEFT)
+        self.speed_var = tk.StringVar(value="Fast")
+        speed_menu = tk.OptionMenu(spectate_row, self.speed_var, *SPECTATE_SPEEDS)
+        speed_menu.config(bg="#3c3c3c", fg="#fff", relief=tk.FLAT, highlightthickness=0)
+        speed_menu.pack(side=tk.RIGHT)
 
         # Bots summary
         self.bots_frame = tk.Frame(root, bg="#1e1e1e")
@@ -95,6 +152,13 @@ class UnoGUI:
         self.draw_button.grid(row=0, column=0, padx=6)
         self.pass_button = tk.Button(self.controls_frame, text="Pass", command=self.on_pass, bg="#3c3c3c", fg="#fff", font=("Segoe UI", 11), relief=tk.FLAT, padx=12, pady=8)
         self.pass_button.grid(row=0, column=1, padx=6)
+        self.hints_var = tk.BooleanVar(value=False)
+        self.hints_check = tk.Checkbutton(self.controls_frame, text="Hints", variable=self.hints_var, command=self.on_toggle_hints,
+                                          bg="#252526", fg="#fff", selectcolor="#3c3c3c", activebackground="#252526", font=("Segoe UI", 11))
+        self.hints_check.grid(row=0, column=2, padx=6)
+        self.review_button = tk.Button(self.controls_frame, text="Review round", command=self.on_review, bg="#3c3c3c", fg="#fff",
+                                       font=("Segoe UI", 11), relief=tk.FLAT, padx=12, pady=8, state=tk.DISABLED)
+        self.review_button.grid(row=0, column=3, padx=6)
 
         # Player hand
         self.hand_frame = tk.Frame(root, bg="#1e1e1e")
@@ -128,12 +192,35 @@ class UnoGUI:
         # Start
         self.new_game()
 
+    def save_history(self, write, *args):
+        """Run one MatchHistory write; a database error is logged instead of breaking the round."""
+        try:
+            return write(*args)
+        except sqlite3.Error as exc:
+            self.log(f"Match history not saved: {exc}")
+            return None
+
     def log(self, text: str):
         entry = f"Turn {self.turn_no}: {text}" if text else ""
         if entry and entry != self._last_log:
-            self.log_list.insert(tk.END, entry)
-            self.log_list.yview_moveto(1)
+            self._log_buffer.append(entry)
             self._last_log = entry
+            if self._log_flush_id is None:
+                self._log_flush_id = self.root.after_idle(self.flush_log)
+
+    def flush_log(self):
+        """Insert all buffered log lines at once and scroll once."""
+        if self._log_flush_id is not None:
+            self.root.after_cancel(self._log_flush_id)
+            self._log_flush_id = None
+        if not self._log_buffer:
+            return
+        self.log_list.insert(tk.END, *self._log_buffer)
+        self._log_buffer.clear()
+        overflow = self.log_list.size() - LOG_LIMIT
+        if overflow > 0:
+            self.log_list.delete(0, overflow - 1)
+        self.log_list.yview_moveto(1)
 
     def update_scoreboard(self):
         if not self.game:
@@ -146,29 +233,44 @@ class UnoGUI:
         self.game = Game(num_players=4)
         self.game.setup()
         self.turn_no = 0
+        self.decisions = []
         self._last_log = None
         self._last_turn_owner = self.game.current_index
         # Reset hand pager each round
         self.hand_page = 0
         self._round_end_processed = False
+        self._log_buffer.clear()
         self.log_list.delete(0, tk.END)
         self.status("Game started. Official rules, +4 challenge enabled. Draw 1 if you cannot play.")
         self.update_scoreboard()
         self.refresh()
+        if self.spectating:
+            self.schedule_spectate(SPECTATE_SPEEDS.get(self.speed_var.get(), 150))
+            return
         # Handle initial wild color choice if needed
         self.handle_pending_initials()
         self.schedule_bots(1000)
 
     def restart_match(self):
+        if self.history:
+            self.match_id = self.save_history(self.history.start_match, "gui", self.target_score)
         self.scores = [0, 0, 0, 0]
         self.update_scoreboard()
         self.status("Match restarted.")
         self.new_game()
 
+    def show_info(self, title: str, text: str):
+        """A modal message box, kept out of the UI monitor's timings while it is open."""
+        try:
+            with self.monitor.paused() if self.monitor else contextlib.nullcontext():
+                messagebox.showinfo(title, text)
+        except Exception:
+            pass
+
     def status(self, text: str):
         label_text = text
         try:
-            if self.game and not self.game.game_over and self.game.current_index == 0 and self.game.pending_plus4 is None and self.game.pending_initial_wild_for is None:
+            if self.game and not self.spectating and not self.game.game_over and self.game.current_index == 0 and self.game.pending_plus4 is None and self.game.pending_initial_wild_for is None:
                 if "It's your turn!" not in label_text:
                     label_text = f"{label_text}  It's your turn!"
         except Exception:
@@ -237,7 +339,7 @@ class UnoGUI:
         self.color_label.config(text=f"Current color: {col}")
 
         # Toggle +4 decision UI
-        if g.is_plus4_pending_for(0):
+        if g.is_plus4_pending_for(0) and not self.spectating:
             if not self.plus4_frame.winfo_ismapped():
                 self.plus4_frame.pack(pady=8)
                 self.status("You were hit by +4. Accept or Challenge.")
@@ -280,8 +382,9 @@ class UnoGUI:
             cards_container.pack(anchor="w")
 
             # Use object identity for allowed moves to avoid issues with duplicate-equal cards
-            allowed_ids = set(id(c) for c in (g.allowed_moves(0) if g.current_index == 0 else []))
-            for card in hand[start:end]:
+            allowed_ids = set(id(c) for c in (g.allowed_moves(0) if g.current_index == 0 and not self.spectating else []))
+            self.hand_buttons = {}
+            for index, card in enumerate(hand[start:end], start):
                 playable = id(card) in allowed_ids
                 bg = self.card_bg_for(card) if playable else self.dim_card_bg_for(card)
                 fg = ("#000" if not card.is_wild() else "#111") if playable else "#777"
@@ -292,9 +395,10 @@ class UnoGUI:
                                 state=(tk.NORMAL if playable else tk.DISABLED),
                                 command=(lambda c=card: self.on_play(c)) if playable else None)
                 btn.pack(side=tk.LEFT, padx=4, pady=4)
+                self.hand_buttons[index] = (btn, card.display())
 
         # Controls enablement
-        is_human_turn = g.current_index == 0
+        is_human_turn = g.current_index == 0 and not self.spectating
         blocked = g.is_plus4_pending() or (g.pending_initial_wild_for is not None and g.pending_initial_wild_for == 0)
         can_draw, _ = (False, None)
         can_pass, _ = (False, None)
@@ -308,8 +412,20 @@ class UnoGUI:
         if g.game_over and g.winner_index is not None:
             self.handle_round_end()
 
+        # Precompute bot replies (and hints) for every option while the human decides
+        if not g.game_over and g.acting_player() == 0 and not self.spectating:
+            key = state_key(g)
+            if key != self._speculated_for:
+                self._speculated_for = key
+                self.speculator.start(g)
+                if self.hints_var.get():
+                    self.start_hints()
+        elif self.hints.results:
+            self.hints.cancel()
+        self.apply_hint_labels()
+
         # Ensure bot progression if it's their turn and nothing is pending (e.g., after +4 accept)
-        if (not g.game_over and g.current_index != 0 and not g.is_plus4_pending()
+        if (not self.spectating and not g.game_over and g.current_index != 0 and not g.is_plus4_pending()
                 and not (g.pending_initial_wild_for is not None and g.pending_initial_wild_for != 0)):
             try:
                 # If no bot action is queued, queue one
@@ -319,6 +435,50 @@ class UnoGUI:
                 # Fallback to immediate scheduling
                 self.schedule_bots(600)
 
+    # ---- Move hints ----
+    def on_toggle_hints(self):
+        g = self.game
+        if self.hints_var.get() and g and not g.game_over and g.acting_player() == 0:
+            self.start_hints()
+        else:
+            self.hints.cancel()
+        self.apply_hint_labels()
+
+    def start_hints(self):
+        self.hints.start(self.game, 0)
+        if self._hint_timer is None:
+            self._hint_timer = self.root.after(150, self.poll_hints)
+
+    def poll_hints(self):
+        self._hint_timer = None
+        try:
+            changed = self.hints.poll()
+        except Exception as e:
+            # A broken rollout: say so instead of showing no hint forever
+            self.hints_var.set(False)
+            self.apply_hint_labels()
+            self.log(f"Hints stopped: {type(e).__name__}: {e}")
+            return
+        if changed:
+            self.apply_hint_labels()
+        if self.hints.running:
+            self._hint_timer = self.root.after(150, self.poll_hints)
+
+    def apply_hint_labels(self):
+        """Show the current estimates on the card and control buttons without rebuilding them."""
+        def pct(move):
+            p = self.hints.estimate(move)
+            return f" ({p:.0%})" if p is not None else ""
+        for index, (btn, text) in self.hand_buttons.items():
+            best = self.hints.best_for_card(index)
+            if best is not None:
+                text += f"\n{best[0]:.0%}" + (f" → {best[1]}" if best[1] else "")
+            btn.config(text=text)
+        self.draw_button.config(text="Draw card" + pct(("draw", None, None)))
+        self.pass_button.config(text="Pass" + pct(("pass", None, None)))
+        self.accept_btn.config(text="Accept +4 (Draw 4)" + pct(("accept", None, None)))
+        self.challenge_btn.config(text="Challenge +4" + pct(("challenge", None, None)))
+
     def handle_round_end(self):
         # Prevent running multiple times
         if self._round_end_processed:
@@ -332,22 +492,117 @@ class UnoGUI:
         # Update scoreboard
         self.scores[g.winner_index] += points
         self.update_scoreboard()
-        # Show modal
-        try:
-            messagebox.showinfo("Round Over", f"{winner} wins the round and earns {points} points!")
-        except Exception:
-            pass
+        if self.history and self.match_id is not None:
+            personas = [MIXED_BOT if self.spectating else HUMAN, MIXED_BOT, MIXED_BOT, MIXED_BOT]
+            self.save_history(self.history.add_round, self.match_id, g, personas)
+            self.save_history(self.history.flush)
+        if not self.spectating and self.decisions:
+            self.last_decisions = self.decisions
+            self.review_button.config(state=tk.NORMAL)
+        # Show modal (spectator mode just logs and moves on)
+        if self.spectating:
+            self.status(f"{winner} wins the round and earns {points} points!")
+        else:
+            self.show_info("Round Over", f"{winner} wins the round and earns {points} points!")
         # Check match end
         if self.scores[g.winner_index] >= self.target_score:
-            try:
-                messagebox.showinfo("Match Over", f"{winner} wins the match with {self.scores[g.winner_index]} points!")
-            except Exception:
-                pass
+            if self.spectating:
+                self.status(f"{winner} wins the match with {self.scores[g.winner_index]} points!")
+            else:
+                self.show_info("Match Over", f"{winner} wins the match with {self.scores[g.winner_index]} points!")
+            if self.history and self.match_id is not None:
+                self.save_history(self.history.finish_match, self.match_id, g.winner_index)
             # Auto restart match
             self.restart_match()
             return
         # Start next round shortly
-        self.root.after(800, self.new_game)
+        self.root.after(800 if not self.spectating else min(800, 4 * SPECTATE_SPEEDS.get(self.speed_var.get(), 150)), self.new_game)
+
+    # ---- Spectator mode ----
+    def on_toggle_spectate(self):
+        self.spectating = self.spectate_var.get()
+        if self.bot_timer_id:
+            self.root.after_cancel(self.bot_timer_id)
+            self.bot_timer_id = None
+        if self._spectate_timer:
+            self.root.after_cancel(self._spectate_timer)
+            self._spectate_timer = None
+        self.speculator.cancel()
+        self.hints.cancel()
+        self._speculated_for = None
+        self.pending_card = None
+        self.color_choice_frame.pack_forget()
+        self.plus4_frame.pack_forget()
+        if self.spectating:
+            self.status("Spectating: every seat is played by a bot.")
+            self.refresh()
+            self.schedule_spectate(0)
+        else:
+            self.status("You are back in the game.")
+            self.refresh()
+            self.handle_pending_initials()
+            self.schedule_bots(600)
+
+    def schedule_spectate(self, delay_ms: int):
+        if self._spectate_timer is None:
+            self._spectate_timer = self.root.after(delay_ms, self.spectate_tick)
+
+    def spectate_tick(self):
+        self._spectate_timer = None
+        g = self.game
+        if not self.spectating or not g or g.game_over:
+            return
+        delay = SPECTATE_SPEEDS.get(self.speed_var.get(), 150)
+        if delay:
+            self.spectate_step()
+        else:
+            # As fast as possible: run engine steps in ~10 ms batches between UI updates
+            deadline = time.perf_counter() + 0.010
+            while not g.game_over and time.perf_counter() < deadline:
+                self.spectate_step()
+        self.request_render()
+        if not g.game_over:
+            self.schedule_spectate(max(1, delay))
+
+    def spectate_step(self):
+        g = self.game
+        idx = g.acting_player()
+        name = g.players[idx].name
+        target_idx = g.next_player_index(1)
+        plus4 = g.pending_plus4
+        action, card, color = g.bot_act(idx)
+        self.turn_no += 1
+        if action == "color":
+            msg = f"{name} chose starting color {color}."
+        elif action == "accept":
+            msg = f"{name} accepted +4 and drew {g.last_penalty[1]}."
+        elif action == "challenge":
+            msg = f"{name} challenged +4 and {'failed' if plus4.was_legal else 'succeeded'}."
+        elif action == "draw_pass":
+            msg = f"{name} drew and ended the turn."
+        else:
+            verb = "drew and played" if action == "draw_play" else "played"
+            msg = f"{name} {verb} {card.display()}{' choosing ' + color if color else ''}"
+            if card.value in ("+2", "Skip"):
+                msg += f". {g.players[target_idx].name} was skipped"
+            msg += "."
+        self.status(msg)
+
+    def request_render(self):
+        """Redraw at most MAX_FPS times per second; extra requests fold into the pending frame."""
+        if self._render_timer is not None:
+            return
+        wait = self._last_render + 1.0 / MAX_FPS - time.perf_counter()
+        if wait <= 0:
+            self.render_frame()
+        else:
+            self._render_timer = self.root.after(int(wait * 1000) + 1, self.render_frame)
+
+    def render_frame(self):
+        self._render_timer = None
+        self._last_render = time.perf_counter()
+        self.flush_log()
+        self.refresh()
 
     def render_bots(self):
         if not self.game:
@@ -386,11 +641,14 @@ class UnoGUI:
             self.pending_card = card
             return
         target_idx = g.next_player_index(1)
+        position = g.to_bytes()
+        index = self._hand_index(card)
         ok, err = g.play_card(0, card, chosen_color)
         if not ok:
             self.status(err or "Invalid move")
             return
         self.turn_no += 1
+        self.record_decision(position, ("play", index, None))
         msg = f"You played {card.display()}"
         if card.value == "+4":
             msg += ". Waiting for target to accept or challenge."
@@ -425,10 +683,12 @@ class UnoGUI:
         self.color_choice_frame.pack_forget()
         g = self.game
         if initial:
+            position = g.to_bytes()
             ok, err = g.set_initial_wild_color(color)
             if not ok:
                 self.status(err or "Error setting initial color")
                 return
+            self.record_decision(position, ("color", None, color))
             self.status(f"Starting color set to {color}.")
             self.refresh()
             self.schedule_bots(500)
@@ -437,12 +697,15 @@ class UnoGUI:
         if not card:
             return
         target_idx = g.next_player_index(1)
+        position = g.to_bytes()
+        index = self._hand_index(card)
         ok, err = g.play_card(0, card, chosen_color=color)
         self.pending_card = None
         if not ok:
             self.status(err or "Error playing Wild")
             return
         self.turn_no += 1
+        self.record_decision(position, ("play", index, color))
         msg = f"You played {card.display()} choosing {color}"
         if card.value == "+4":
             msg += ". Waiting for target to accept or challenge."
@@ -457,10 +720,12 @@ class UnoGUI:
         g = self.game
         if g.current_index != 0:
             return
+        position = g.to_bytes()
         ok, err, card = g.draw_one_action(0)
         if not ok:
             self.status(err or "Cannot draw now")
             return
+        self.record_decision(position, ("draw", None, None))
         can_play_drawn = g.is_playable(card)
         if not can_play_drawn:
             self.turn_no += 1
@@ -483,6 +748,7 @@ class UnoGUI:
         if not ok:
             self.status(err or "Cannot end turn now")
             return
+        self.record_decision(g.to_bytes(), ("pass", None, None))
         self.turn_no += 1
         g.advance_turn(1)
         self.status("Turn ended.")
@@ -494,32 +760,90 @@ class UnoGUI:
         g = self.game
         if not g or not g.is_plus4_pending_for(0):
             return
+        position = g.to_bytes()
         if decision == 'accept':
             ok, err = g.accept_plus4(0)
             if ok:
                 self.turn_no += 1
-                self.status("You accepted +4 and drew 4 cards; your turn is skipped.")
+                self.status(f"You accepted +4 and drew {g.last_penalty[1]} cards; your turn is skipped.")
         else:
             ok, err, was_legal = g.challenge_plus4(0)
             if ok:
                 self.turn_no += 1
                 if was_legal:
                     # Challenge failed
-                    self.status("Challenge failed. You drew 6 cards and were skipped.")
+                    self.status(f"Challenge failed. You drew {g.last_penalty[1]} cards and were skipped.")
                 else:
                     # Challenge succeeded
-                    self.status("Challenge succeeded! The +4 was illegal. Opponent drew 4; it's your turn.")
+                    self.status(f"Challenge succeeded! The +4 was illegal. Opponent drew {g.last_penalty[1]}; it's your turn.")
+        if ok:
+            self.record_decision(position, (decision, None, None))
         self.refresh()
         if not g.game_over:
             self.schedule_bots(1000)
 
+    # ---- Post-round review ----
+    def record_decision(self, position: bytes, move) -> None:
+        if not self.spectating:
+            self.decisions.append(DecisionPoint(self.turn_no, 0, position, move))
+
+    def _hand_index(self, card: Card) -> int:
+        # Identity lookup: equal cards (two Red 5s) are different hand positions
+        for i, c in enumerate(self.game.players[0].hand):
+            if c is card:
+                return i
+        raise ValueError("card is not in the hand")
+
+    def on_review(self):
+        """Grade the last finished round's decisions by rollouts, filling a window as grades arrive."""
+        if not self.last_decisions:
+            return
+        if self.review_pool is None:
+            # spawn: workers must not inherit the Tk process
+            self.review_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=mp.get_context("spawn"))
+        job = Review(self.last_decisions, self.review_pool)
+        win = tk.Toplevel(self.root)
+        win.title("Round review")
+        win.configure(bg="#1e1e1e")
+        header = tk.Label(win, text="Grading your decisions...", fg="#fff", bg="#1e1e1e", font=("Segoe UI", 11, "bold"))
+        header.pack(fill=tk.X, padx=10, pady=(10, 4))
+        listbox = tk.Listbox(win, width=110, height=20, bg="#252526", fg="#ddd", font=("Consolas", 10))
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        total = len(job.points)
+
+        def poll():
+            if not win.winfo_exists():
+                return
+            if job.poll():
+                grades = job.grades()
+                listbox.delete(0, tk.END)
+                for grade in grades:
+                    listbox.insert(tk.END, format_grade(grade))
+                    if grade.verdict:
+                        listbox.itemconfig(tk.END, fg="#e06c75" if grade.verdict == "blunder" else "#f0ad4e")
+                header.config(text=f"Graded {len(grades)} of {total} decisions...")
+            if job.finished:
+                header.config(text=summary(job.grades()))
+            else:
+                win.after(200, poll)
+
+        def close():
+            job.cancel()
+            win.destroy()
+
+        win.protocol("WM_DELETE_WINDOW", close)
+        if not total:
+            header.config(text="No decision had an alternative this round.")
+        else:
+            win.after(200, poll)
+
     # ---- Bot turn ----
     def schedule_bots(self, delay_ms: int = 1000):
         if not self.game or self.game.game_over:
             return
         g = self.game
         # Handle +4 and initial wild and normal bot turns as before
-        if g.is_plus4_pending() and g.pending_plus4.get('target') != 0:
+        if g.is_plus4_pending() and g.pending_plus4.target != 0:
             if self.bot_timer_id:
                 try:
                     self.root.after_cancel(self.bot_timer_id)
@@ -564,24 +888,21 @@ class UnoGUI:
 
     def process_plus4_for_bot(self):
         g = self.game
-        if not g or not g.is_plus4_pending() or g.pending_plus4.get('target') == 0:
+        if not g or not g.is_plus4_pending() or g.pending_plus4.target == 0:
             return
-        idx = g.pending_plus4['target']
-        played_by = g.pending_plus4['played_by']
-        # Simple decision: 50% chance to challenge
-        if random.random() < 0.5:
-            ok, _, was_legal = g.challenge_plus4(idx)
-            if ok:
-                self.turn_no += 1
-                if was_legal:
-                    self.status(f"{g.players[idx].name} challenged +4 and failed, drew 6 and was skipped.")
-                else:
-                    self.status(f"{g.players[idx].name} challenged +4 successfully. {g.players[played_by].name} drew 4.")
+        idx = g.pending_plus4.target
+        played_by = g.pending_plus4.played_by
+        was_legal = g.pending_plus4.was_legal
+        decision = self.speculator.take(g, idx) or g.bot_decision(idx)
+        action, _, _ = g.apply_bot_decision(idx, decision)
+        self.turn_no += 1
+        if action == "challenge":
+            if was_legal:
+                self.status(f"{g.players[idx].name} challenged +4 and failed, drew {g.last_penalty[1]} and was skipped.")
+            else:
+                self.status(f"{g.players[idx].name} challenged +4 successfully. {g.players[played_by].name} drew {g.last_penalty[1]}.")
         else:
-            ok, _ = g.accept_plus4(idx)
-            if ok:
-                self.turn_no += 1
-                self.status(f"{g.players[idx].name} accepted +4 and drew 4.")
+            self.status(f"{g.players[idx].name} accepted +4 and drew {g.last_penalty[1]}.")
         self.refresh()
         self.schedule_bots(600)
 
@@ -594,23 +915,16 @@ class UnoGUI:
             return
         idx = g.current_index
         player = g.players[idx]
-        action, play, color = g.choose_best_move(idx)
-        if action == "play" and play is not None:
-            target_idx = g.next_player_index(1)
-            ok, err = g.play_card(idx, play, chosen_color=color)
-            if not ok:
-                action = "draw"
-        if action == "draw" or play is None:
-            ok, _, drawn = g.draw_one_action(idx)
-            if ok and drawn and g.is_playable(drawn):
-                color2 = g.choose_color_for_bot(idx) if drawn.is_wild() else None
-                g.play_card(idx, drawn, chosen_color=color2)
-                self.turn_no += 1
-                self.status(f"{player.name} drew and played {drawn.display()}{' choosing ' + color2 if color2 else ''}.")
-            else:
-                g.advance_turn(1)
-                self.turn_no += 1
-                self.status(f"{player.name} drew and ended the turn.")
+        # Use the reply precomputed while the human was thinking, if any
+        decision = self.speculator.take(g, idx) or g.bot_decision(idx)
+        target_idx = g.next_player_index(1)
+        action, play, color = g.apply_bot_decision(idx, decision)
+        if action == "draw_play":
+            self.turn_no += 1
+            self.status(f"{player.name} drew and played {play.display()}{' choosing ' + color if color else ''}.")
+        elif action == "draw_pass":
+            self.turn_no += 1
+            self.status(f"{player.name} drew and ended the turn.")
         else:
             msg = f"{player.name} played {play.display()}"
             if color:
@@ -665,9 +979,37 @@ class UnoGUI:
             self.hand_page += 1
             self.refresh()
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Play UNO against three bots.")
+    parser.add_argument("--monitor", action="store_true", help="show event-loop lag and render timings")
+    parser.add_argument("--monitor-out", default=DEFAULT_OUT, help="where to write the timing report on exit")
+    args = parser.parse_args(argv)
+
     root = tk.Tk()
-    UnoGUI(root)
+    history = MatchHistory()
+    monitor: Optional[UiMonitor] = None
+
+    def on_close():
+        if monitor:
+            monitor.stop()
+            monitor.dump(args.monitor_out)
+        gui.speculator.shutdown()
+        gui.hints.shutdown()
+        if gui.review_pool is not None:
+            gui.review_pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            history.close()
+        except sqlite3.Error as exc:
+            print(f"Match history not saved: {exc}")
+        root.destroy()
+
+    gui = UnoGUI(root, history=history)
+    if args.monitor:
+        monitor = gui.monitor = UiMonitor(root)
+        monitor.instrument(gui, ("refresh", "render_bots", "process_bot_turn", "spectate_tick"))
+        monitor.start()
+        monitor.show_panel()
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
 
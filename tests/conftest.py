@@ -0,0 +1,51 @@
+"""Test helpers. The modules under test are flat files in the repository root."""
+from __future__ import annotations
+
+import os
+import random
+import sys
+from typing import List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uno_logic import WILDS, Card, Game, Hand, HouseRules  # noqa: E402
+
+
+def cards(*names: str) -> List[Card]:
+    """Cards from names like "Red 5", "Blue Skip", "Wild" and "+4"; each call makes new instances."""
+    result = []
+    for name in names:
+        if name in WILDS:
+            result.append(Card(None, name))
+        else:
+            color, value = name.split(" ", 1)
+            result.append(Card(color, value))
+    return result
+
+
+def make_game(hands: Sequence[Sequence[str]], top: str, current: int = 0, color: Optional[str] = None,
+              deck: Optional[Sequence[str]] = None, rules: Optional[HouseRules] = None) -> Game:
+    """A game mid-round with the given hands, top card and seat to play; nothing pending.
+
+    deck lists the cards left to draw, the next one last; by default the rest
+    of a shuffled deck.
+    """
+    game = Game(rng=random.Random(0), bot_rng=random.Random(0), rules=rules)
+    game.setup()
+    for player, names in zip(game.players, hands):
+        player.hand = Hand(cards(*names))
+    game.discard_pile = cards(top)
+    if deck is not None:
+        game.deck.cards = cards(*deck)
+    game.current_index = current
+    game.current_color = color if color is not None else game.discard_pile[-1].color
+    game.direction = 1
+    game.drew_this_turn = False
+    game.last_drawn_card = None
+    game.last_penalty = None
+    game.pending_plus4 = None
+    game.pending_initial_wild_for = None
+    game.draw_stack = 0
+    game.version += 1
+    return game
+
@@ -0,0 +1,47 @@
+"""Cards: every deck in a process shares one set of immutable card instances."""
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from uno_logic import Card, Deck, Game
+
+
+def all_cards(game: Game):
+    return [c for p in game.players for c in p.hand] + game.deck.cards + game.discard_pile
+
+
+def test_decks_share_card_instances_across_games():
+    games = []
+    for seed in (1, 2):
+        game = Game(rng=random.Random(seed), bot_rng=random.Random(seed))
+        game.setup()
+        games.append(game)
+    ids = [set(map(id, all_cards(g))) for g in games]
+    assert len(ids[0]) == 108 and ids[0] == ids[1]
+    # A game in progress and a copy of it still hold each instance once
+    for _ in range(40):
+        games[0].bot_act(games[0].acting_player())
+    for game in (games[0], copy.deepcopy(games[0]), Game.from_bytes(games[0].to_bytes())):
+        assert len(set(map(id, all_cards(game)))) == len(all_cards(game)) == 108
+        assert set(map(id, all_cards(game))) == ids[1]
+
+
+def test_shared_cards_are_immutable():
+    card = Deck(random.Random(0)).cards[0]
+    with pytest.raises(AttributeError):
+        card.color = "Red"
+    with pytest.raises(AttributeError):
+        del card.value
+    assert copy.copy(card) is card and copy.deepcopy(card) is card
+
+
+def test_an_unshared_rebuild_gives_new_instances():
+    deck = Deck(random.Random(0))
+    shared = set(map(id, deck.cards))
+    deck._build_deck(shared=False)
+    assert len(deck.cards) == 108 and not shared & set(map(id, deck.cards))
+    assert sorted(map(repr, deck.cards)) == sorted(map(repr, Deck(random.Random(0)).cards))
+    assert all(isinstance(c, Card) for c in deck.cards)
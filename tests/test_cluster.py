@@ -0,0 +1,138 @@
+"""uno_cluster: a coordinator and worker processes on localhost count every round exactly once."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import List, Sequence
+
+import uno_cluster
+from uno_cluster import Coordinator, run_batch
+from uno_shm import Totals
+from uno_sim import play_round
+
+HOST = "127.0.0.1"
+HEARTBEAT = 0.2
+TIMEOUT = 1.5  # coordinator patience; several heartbeats
+
+
+def reference(rounds: int) -> dict:
+    totals = Totals()
+    for seed in range(rounds):
+        totals.add(play_round(seed))
+    return vars(totals)
+
+
+async def spawn_worker(port: int, *extra: str) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(
+        sys.executable, uno_cluster.__file__, "worker", "--host", HOST, "--port", str(port),
+        "--heartbeat", str(HEARTBEAT), *extra, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def until(condition, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+async def finish(coordinator: Coordinator, procs: Sequence[asyncio.subprocess.Process]) -> None:
+    try:
+        await asyncio.wait_for(coordinator.wait(), 60)
+    finally:
+        coordinator.close()
+        for proc in procs:
+            if proc.returncode is None:
+                try:
+                    await asyncio.wait_for(proc.wait(), 5)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+
+
+def assert_counted_once(coordinator: Coordinator, rounds: int) -> None:
+    assert coordinator.done == set(range(len(coordinator.batches)))
+    assert not coordinator.leases and not coordinator.todo
+    assert coordinator.totals.rounds == rounds
+    assert vars(coordinator.totals) == reference(rounds)
+
+
+def test_several_workers_count_every_round_once():
+    async def scenario() -> Coordinator:
+        coordinator = Coordinator(240, batch=20, timeout=TIMEOUT)
+        await coordinator.start(HOST, 0)
+        procs = [await spawn_worker(coordinator.port) for _ in range(3)]
+        await finish(coordinator, procs)
+        assert [proc.returncode for proc in procs] == [0, 0, 0]
+        return coordinator
+
+    coordinator = asyncio.run(scenario())
+    assert_counted_once(coordinator, 240)
+    assert (coordinator.lost, coordinator.reissued, coordinator.duplicates) == (0, 0, 0)
+
+
+def test_lost_workers_batches_are_reissued_and_counted_once():
+    async def scenario() -> Coordinator:
+        coordinator = Coordinator(300, batch=20, timeout=TIMEOUT)
+        await coordinator.start(HOST, 0)
+        # Only the failing workers at first, so each surely holds a lease when it fails
+        procs = [await spawn_worker(coordinator.port, "--crash-after", "1"),
+                 await spawn_worker(coordinator.port, "--hang-after", "1")]
+        await until(lambda: coordinator.lost == 2)
+        # A worker killed from outside while it holds a lease
+        killed = await spawn_worker(coordinator.port)
+        await until(lambda: any(w.leases for w in coordinator.workers))
+        killed.kill()
+        await killed.wait()
+        await until(lambda: coordinator.lost == 3)
+        procs += [killed] + [await spawn_worker(coordinator.port) for _ in range(2)]
+        await finish(coordinator, procs)
+        return coordinator
+
+    coordinator = asyncio.run(scenario())
+    assert coordinator.lost == 3
+    assert coordinator.reissued >= 3
+    assert_counted_once(coordinator, 300)
+
+
+def test_a_repeated_result_is_rejected():
+    async def scenario() -> List[str]:
+        coordinator = Coordinator(60, batch=20, timeout=TIMEOUT)
+        await coordinator.start(HOST, 0)
+        reader, writer = await asyncio.open_connection(HOST, coordinator.port, limit=uno_cluster.LINE_LIMIT)
+        writer.write(b'{"op":"hello","name":"test"}\n')
+        errors = []
+        first = True
+        while True:
+            msg = json.loads(await reader.readline())
+            if msg["op"] == "done":
+                break
+            if msg["op"] == "error":
+                errors.append(msg["msg"])
+            elif msg["op"] == "batch":
+                data = run_batch(msg["start"], msg["count"], msg["rules"])
+                line = json.dumps({"op": "result", "lease": msg["lease"], "batch": msg["batch"],
+                                   "records": base64.b64encode(data).decode("ascii")}).encode() + b"\n"
+                # The first result is sent twice, as a worker retrying after a timeout would
+                writer.write(line * (2 if first else 1))
+                first = False
+        writer.close()
+        await coordinator.wait()
+        assert_counted_once(coordinator, 60)
+        return errors
+
+    assert asyncio.run(scenario()) == ["Unknown lease"]
+
+
+def test_cli_local_chaos_run_matches_a_single_process_run():
+    root = os.path.dirname(uno_cluster.__file__)
+    result = subprocess.run(
+        [sys.executable, uno_cluster.__file__, "coordinator", "--port", "0", "--rounds", "200", "--batch", "20",
+         "--local", "3", "--chaos", "--verify", "--timeout", str(TIMEOUT), "--heartbeat", str(HEARTBEAT)],
+        cwd=root, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "matches a single-process run" in result.stdout
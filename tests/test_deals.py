@@ -0,0 +1,68 @@
+"""Deals: slice dealing hands out the cards a one-at-a-time deal would, and batches replay exactly."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from uno_deals import CARD_TABLE, DealBatch, simulate
+from uno_logic import VALUES, Deal, Deck, Game
+from uno_sim import play_out, round_result
+
+
+def one_at_a_time(order, num_players: int = 4):
+    """Seven rounds of one card per seat from the end of the deck, as at a real table."""
+    deck = list(order)
+    hands = [[] for _ in range(num_players)]
+    for _ in range(7):
+        for hand in hands:
+            hand.append(deck.pop())
+    return hands, deck
+
+
+def assert_dealt(game: Game, deal: Deal) -> None:
+    hands, rest = one_at_a_time(deal.order, len(game.players))
+    # A +2 starter adds two cards to the first seat's hand after the deal
+    assert [list(map(id, p.hand[:7])) for p in game.players] == [list(map(id, h)) for h in hands]
+    if rest[-1].value in VALUES:
+        # A number starter: no effect, no redraw
+        assert game.discard_pile == [rest[-1]] and game.discard_pile[0] is rest[-1]
+        assert list(map(id, game.deck.cards)) == list(map(id, rest[:-1]))
+        assert game.current_index == deal.start
+    held = [c for p in game.players for c in p.hand] + game.deck.cards + game.discard_pile
+    assert len(set(map(id, held))) == len(held) == 108
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_setup_deals_like_a_table(seed):
+    deal = Deal.shuffled(seed)
+    game = Game(rng=random.Random(0), bot_rng=random.Random(0), deck=Deck(random.Random(0), cards=[]))
+    game.setup(deal)
+    assert_dealt(game, deal)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_batch_rounds_match_their_deals(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    batch = DealBatch.generate(12, seed=5, use_numpy=use_numpy)
+    for i, deal in enumerate(batch):
+        assert sorted(batch.orders[i]) == list(range(len(CARD_TABLE)))
+        assert_dealt(batch.game(i), deal)
+    again = DealBatch.generate(12, seed=5, use_numpy=use_numpy)
+    assert again.orders == batch.orders and again.starts == batch.starts
+
+
+def test_a_dealt_round_replays_exactly():
+    batch = DealBatch.generate(30, seed=9, use_numpy=False)
+    expected = []
+    for i in range(len(batch)):
+        game = batch.game(i)
+        play_out(game)
+        expected.append(round_result(game, i))
+    assert list(simulate(30, seed=9, batch=30, use_numpy=False)) == expected
+    # Replaying one deal twice plays the same round, recycles included
+    first, second = batch.game(7), batch.game(7)
+    play_out(first)
+    play_out(second)
+    assert round_result(first, 7) == round_result(second, 7)
@@ -0,0 +1,49 @@
+"""uno_env: batched environments report an illegal action and keep working."""
+from __future__ import annotations
+
+import random
+from array import array
+
+import pytest
+
+from uno_env import N_ACTIONS, VecEnv, random_actions
+
+
+def illegal_action(masks, i: int) -> int:
+    return next(a for a in range(N_ACTIONS) if not masks[i * N_ACTIONS + a])
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_illegal_action_raises_and_the_next_step_works(workers):
+    rng = random.Random(0)
+    with VecEnv(4, workers=workers, seed=5, use_numpy=False) as env:
+        obs, masks = env.reset()
+        before = bytes(masks)
+        actions = random_actions(masks, rng)
+        actions[3] = illegal_action(masks, 3)
+        with pytest.raises(ValueError, match="not legal"):
+            env.step(actions)
+        assert bytes(masks) == before  # the step left every environment as it was
+        for _ in range(20):
+            _, _, _, masks = env.step(random_actions(masks, rng))
+        if workers:
+            # An illegal action that reaches a worker is reported and the worker keeps serving
+            env._views["actions"][:] = array("i", [illegal_action(masks, i) for i in range(4)])
+            with pytest.raises(ValueError, match="not legal"):
+                env._run(b"s")
+            for _ in range(20):
+                _, _, _, masks = env.step(random_actions(masks, rng))
+        del obs, masks
+
+
+def test_vec_env_matches_in_process_stepping():
+    rng_a, rng_b = random.Random(1), random.Random(1)
+    with VecEnv(6, workers=2, seed=9, use_numpy=False) as a, VecEnv(6, workers=0, seed=9, use_numpy=False) as b:
+        _, masks_a = a.reset()
+        _, masks_b = b.reset()
+        for _ in range(30):
+            assert bytes(masks_a) == bytes(masks_b)
+            _, rewards_a, _, masks_a = a.step(random_actions(masks_a, rng_a))
+            _, rewards_b, _, masks_b = b.step(random_actions(masks_b, rng_b))
+            assert list(rewards_a) == list(rewards_b)
+        del masks_a, masks_b, rewards_a, rewards_b
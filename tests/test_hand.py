@@ -0,0 +1,56 @@
+"""Hands: membership, removal and indexing by card identity, so equal duplicates stay apart."""
+from __future__ import annotations
+
+import copy
+import pickle
+
+import pytest
+
+from conftest import cards
+from uno_logic import Hand
+
+
+def test_equal_cards_are_held_separately():
+    first, second = cards("Red 7", "Red 7")
+    assert first == second and first is not second
+    hand = Hand([first, second])
+    assert len(hand) == 2 and list(hand) == [first, second]
+    hand.remove(first)
+    assert first not in hand and second in hand
+    assert list(hand) == [second] and hand[0] is second
+    with pytest.raises(ValueError):
+        hand.remove(first)
+
+
+def test_an_equal_card_from_elsewhere_is_not_in_the_hand():
+    held, other = cards("Blue Skip", "Blue Skip")
+    hand = Hand([held])
+    assert other not in hand
+    with pytest.raises(ValueError):
+        hand.remove(other)
+    assert list(hand) == [held]
+
+
+def test_indexing_follows_every_change():
+    a, b, c, d = cards("Red 1", "Red 1", "Green 2", "+4")
+    hand = Hand([a, b])
+    assert hand[-1] is b and hand[0] is a
+    hand.append(c)
+    assert hand[-1] is c and hand[1:] == [b, c]
+    hand.remove(b)
+    assert hand[1] is c
+    hand.extend([d])
+    assert [hand[i] for i in range(len(hand))] == [a, c, d]
+    hand.clear()
+    assert len(hand) == 0 and list(hand) == []
+    with pytest.raises(IndexError):
+        hand[0]
+
+
+def test_copies_keep_membership_by_identity():
+    red, red_again = cards("Red 7", "Red 7")
+    hand = Hand([red, red_again])
+    for clone in (copy.deepcopy(hand), pickle.loads(pickle.dumps(hand))):
+        assert len(clone) == 2
+        clone.remove(clone[0])
+        assert len(clone) == 1 and clone[0] == red
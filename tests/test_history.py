@@ -0,0 +1,54 @@
+"""uno_history: several writers share one database without colliding on round ids."""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from uno_history import MIXED_BOT, MatchHistory
+from uno_sim import new_game, play_out
+
+
+def finished(seed: int):
+    game = new_game(seed)
+    play_out(game)
+    return game
+
+
+def test_two_writers_interleave_flushes(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    first, second = MatchHistory(path), MatchHistory(path)
+    try:
+        # Both writers open the database before either has written a round
+        matches = [first.start_match("a"), second.start_match("b")]
+        for seed in range(6):
+            for history, match_id in zip((first, second), matches):
+                history.add_round(match_id, finished(seed), [MIXED_BOT] * 4, seed=seed)
+                history.flush()
+        ids = [row[0] for row in first.conn.execute("SELECT id FROM rounds ORDER BY id")]
+        assert ids == list(range(1, 13))
+        assert [n for n, _, _ in first.win_rates_by_seat().values()] == [12] * 4
+        assert sum(n for n, _, _ in first.win_rates_by_persona().values()) == 48
+        assert first.conn.execute("SELECT COUNT(*) FROM round_seats").fetchone()[0] == 48
+    finally:
+        first.close()
+        second.close()
+
+
+def test_a_failed_flush_keeps_the_rounds_buffered(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    history = MatchHistory(path)
+    other = MatchHistory(path)
+    try:
+        match_id = history.start_match("a")
+        history.add_round(match_id, finished(1), [MIXED_BOT] * 4)
+        other.conn.execute("BEGIN IMMEDIATE")  # hold the write lock
+        history.conn.execute("PRAGMA busy_timeout = 0")
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            history.flush()
+        other.conn.rollback()
+        history.flush()
+        assert history.conn.execute("SELECT COUNT(*) FROM rounds").fetchone()[0] == 1
+    finally:
+        history.close()
+        other.close()
@@ -0,0 +1,194 @@
+"""Rules engine: move validation, cached derived state and drawing from an exhausted deck."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from conftest import make_game
+import uno_logic
+from uno_logic import ChallengeModel, Game, HouseRules, _hand_turn_to
+from uno_sim import determinize
+
+
+def warm(game: Game) -> None:
+    """Fill the per-version cache for every seat."""
+    for seat in range(len(game.players)):
+        game.allowed_moves(seat)
+        game._hand_colors(seat)
+
+
+def assert_fresh(game: Game) -> None:
+    """The cached results equal a recomputation from the current state."""
+    for seat, player in enumerate(game.players):
+        assert list(map(id, game.allowed_moves(seat))) == list(map(id, game._allowed_moves(seat))), seat
+        assert game._hand_colors(seat) == game._color_counts(player.hand), seat
+
+
+def plus4_game() -> Game:
+    # Seat 0 still holds a Red card, so the +4 on Red is a bluff
+    return make_game([["+4", "Red 1", "Blue 2"], ["Blue 5", "Green 3"], ["Blue 9", "Yellow 7"], ["Green 9"]],
+                     top="Red 3")
+
+
+@pytest.mark.parametrize("wild", ["Wild", "+4"])
+@pytest.mark.parametrize("color", [None, "Purple"])
+def test_wild_without_a_valid_color_leaves_the_game_unchanged(wild, color):
+    game = make_game([[wild, "Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3")
+    hand = list(game.players[0].hand)
+    version = game.version
+    assert game.play_card(0, hand[0], color) == (False, "Choose a valid color for Wild")
+    assert list(game.players[0].hand) == hand and hand[0] in game.players[0].hand
+    assert [c.display() for c in game.discard_pile] == ["Red 3"]
+    assert (game.current_index, game.current_color, game.pending_plus4) == (0, "Red", None)
+    assert game.version == version
+
+
+def test_only_the_drawn_card_may_be_played_after_drawing():
+    game = make_game([["Red 5", "Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3", deck=["Red 9"])
+    red5 = game.players[0].hand[0]
+    ok, _, drawn = game.draw_one_action(0)
+    assert ok and game.drew_this_turn and drawn.display() == "Red 9"
+    assert game.play_card(0, red5) == (False, "After drawing, you may only play the drawn card")
+    assert red5 in game.players[0].hand and game.current_index == 0
+    assert game.allowed_moves(0) == [drawn]
+    assert game.play_card(0, drawn) == (True, None)
+    assert red5 in game.players[0].hand and game.top_card() is drawn
+
+
+def test_allowed_moves_is_cached_until_the_state_changes():
+    game = make_game([["Red 5", "Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3")
+    moves = game.allowed_moves(0)
+    assert game.allowed_moves(0) is moves
+    game.play_card(0, moves[0])
+    assert game.allowed_moves(0) is not moves
+
+
+def test_play_card_invalidates():
+    game = make_game([["Red 5", "Blue 7"], ["Red 8", "Blue 1"], ["Green 1"], ["Yellow 2"]], top="Red 3")
+    warm(game)
+    assert game.allowed_moves(1) == []
+    assert game.play_card(0, game.allowed_moves(0)[0]) == (True, None)
+    assert [c.display() for c in game.allowed_moves(1)] == ["Red 8"]
+    assert_fresh(game)
+
+
+def test_draw_cards_invalidates():
+    game = make_game([["Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3",
+                     deck=["Green 4", "Red 6"])
+    warm(game)
+    assert game.allowed_moves(0) == []
+    game.draw_cards(0, 2)
+    assert [c.display() for c in game.allowed_moves(0)] == ["Red 6"]
+    assert_fresh(game)
+
+
+def test_draw_one_action_invalidates():
+    game = make_game([["Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3", deck=["Red 6"])
+    warm(game)
+    ok, _, card = game.draw_one_action(0)
+    assert ok
+    assert game.allowed_moves(0) == [card]
+    assert_fresh(game)
+
+
+def test_plus4_hands_the_turn_to_the_target():
+    game = plus4_game()
+    warm(game)
+    plus4 = next(c for c in game.players[0].hand if c.value == "+4")
+    assert game.play_card(0, plus4, "Blue") == (True, None)
+    assert game.pending_plus4 is not None and game.pending_plus4.target == 1
+    assert all(game.allowed_moves(seat) == [] for seat in range(4))
+    assert_fresh(game)
+
+
+def test_hand_turn_to_invalidates():
+    game = make_game([["Red 5"], ["Red 8"], ["Red 1"], ["Yellow 2"]], top="Red 3")
+    warm(game)
+    assert game.allowed_moves(2) == []
+    _hand_turn_to(game, 2)
+    assert [c.display() for c in game.allowed_moves(2)] == ["Red 1"]
+    assert_fresh(game)
+
+
+@pytest.mark.parametrize("respond", ["accept", "challenge"])
+def test_plus4_responses_invalidate(respond):
+    game = plus4_game()
+    plus4 = next(c for c in game.players[0].hand if c.value == "+4")
+    game.play_card(0, plus4, "Blue")
+    warm(game)
+    if respond == "accept":
+        assert game.accept_plus4(1) == (True, None)
+        assert game.current_index == 2
+    else:
+        assert game.challenge_plus4(1) == (True, None, False)
+        assert game.current_index == 1
+    assert game.pending_plus4 is None
+    assert game.allowed_moves(game.current_index)
+    assert_fresh(game)
+
+
+def test_set_initial_wild_color_invalidates():
+    game = make_game([["Red 5", "Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Wild")
+    game.current_color = None
+    game.pending_initial_wild_for = 0
+    game.version += 1
+    warm(game)
+    assert game.allowed_moves(0) == []
+    assert game.set_initial_wild_color("Blue") == (True, None)
+    assert [c.display() for c in game.allowed_moves(0)] == ["Blue 7"]
+    assert_fresh(game)
+
+
+def test_determinize_invalidates():
+    game = make_game([["Red 5"], ["Green 1", "Green 2", "Green 3"], ["Blue 4", "Blue 5"], ["Yellow 6", "Yellow 7"]],
+                     top="Red 3", deck=["Red 1", "Red 2", "Red 4", "Red 6", "Red 7", "Red 8", "Red 9"])
+    warm(game)
+    before = [dict(game._hand_colors(seat)) for seat in range(4)]
+    determinize(game, 0, random.Random(3))
+    assert [dict(game._hand_colors(seat)) for seat in range(4)] != before
+    assert_fresh(game)
+
+
+def test_random_play_keeps_the_cache_fresh():
+    from uno_sim import new_game
+    for seed in range(20):
+        game = new_game(seed, HouseRules(stacking=True, seven_zero=True, jump_in=True))
+        for _ in range(300):
+            if game.game_over:
+                break
+            warm(game)
+            game.bot_act(game.acting_player())
+            assert_fresh(game)
+
+
+@pytest.mark.parametrize("rules", [HouseRules(), HouseRules(draw_until_playable=True)])
+def test_drawing_with_deck_and_discard_exhausted(rules):
+    game = make_game([["Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3", deck=[], rules=rules)
+    ok, err, card = game.draw_one_action(0)
+    assert ok, err
+    assert card in game.players[0].hand
+    assert len(game.players[0].hand) >= 2
+    assert_fresh(game)
+
+
+def test_draw_cards_with_deck_and_discard_exhausted():
+    game = make_game([["Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3", deck=[])
+    game.draw_cards(1, 3)
+    assert len(game.players[1].hand) == 4
+    assert game.top_card().display() == "Red 3"
+
+
+def test_a_missing_challenge_table_warns_and_falls_back_to_random_challenges(tmp_path, monkeypatch):
+    with pytest.warns(UserWarning, match="challenge-table"):
+        model = ChallengeModel.load(str(tmp_path / "plus4_table.bin"))
+    assert model.table is None
+    monkeypatch.setattr(uno_logic, "PLUS4_MODEL", model)
+    actions = set()
+    for seed in range(20):
+        game = plus4_game()
+        game.bot_rng.seed(seed)
+        plus4 = next(c for c in game.players[0].hand if c.value == "+4")
+        game.play_card(0, plus4, "Blue")
+        actions.add(game.bot_decision(1)[0])
+    assert actions == {"accept", "challenge"}
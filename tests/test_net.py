@@ -0,0 +1,35 @@
+"""uno_net: imitation samples from played rounds and the batched network policy."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from uno_env import N_ACTIONS, OBS_SIZE  # noqa: E402
+from uno_net import MLP, NetPolicy, imitation_samples, played_rounds, train_imitation  # noqa: E402
+from uno_sim import new_game  # noqa: E402
+
+
+def test_imitation_samples_from_played_rounds():
+    obs, masks, labels = imitation_samples(played_rounds(3))
+    n = len(labels)
+    assert n > 0
+    assert obs.shape == (n, OBS_SIZE) and masks.shape == (n, N_ACTIONS) and labels.shape == (n,)
+    # Every logged move is one of the legal actions at that point
+    assert masks[range(n), labels].all()
+    accuracy = train_imitation(MLP.new(), obs, masks, labels, epochs=1, log=lambda _: None)
+    assert 0.0 <= accuracy <= 1.0
+
+
+def test_decide_many_agrees_with_one_at_a_time():
+    policy = NetPolicy(MLP.new(seed=1))
+    games = [new_game(seed) for seed in range(8)]
+    for _ in range(40):
+        live = [g for g in games if not g.game_over]
+        if not live:
+            break
+        seats = [g.acting_player() for g in live]
+        batched = policy.decide_many(live, seats)
+        assert batched == [policy(g, s) for g, s in zip(live, seats)]
+        for game, seat, decision in zip(live, seats, batched):
+            game.apply_bot_decision(seat, decision)
@@ -0,0 +1,17 @@
+"""uno_review: the round summary adds up only losses that stand out from the rollout noise."""
+from __future__ import annotations
+
+from uno_review import Grade, summary
+
+
+def grade(loss: float, se: float) -> Grade:
+    play, draw = ("play", 0, None), ("draw", None, None)
+    return Grade(1, 0, b"", draw, play, {play: 0.5 + loss, draw: 0.5}, loss, se, 100)
+
+
+def test_noisy_losses_are_left_out_of_the_total():
+    grades = [grade(0.04, 0.03), grade(0.06, 0.05), grade(0.03, 0.01), grade(0.2, 0.05)]
+    assert [g.clear for g in grades] == [False, False, True, True]
+    assert [g.verdict for g in grades] == ["", "", "", "blunder"]
+    assert summary(grades) == ("4 decisions graded, total loss 23.0 pp of win probability "
+                               "(clear of the noise), 1 flagged")
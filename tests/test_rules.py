@@ -0,0 +1,124 @@
+"""House rules: card effects dispatched through the rules table, and the draw hook."""
+from __future__ import annotations
+
+import pytest
+
+from conftest import make_game
+from uno_logic import HouseRules, OFFICIAL_RULES
+
+STACKING = HouseRules(stacking=True)
+SEVEN_ZERO = HouseRules(seven_zero=True)
+JUMP_IN = HouseRules(jump_in=True)
+DRAW_UNTIL_PLAYABLE = HouseRules(draw_until_playable=True)
+
+
+def names(hand):
+    return [c.display() for c in hand]
+
+
+def play(game, seat, name, color=None):
+    card = next(c for c in game.players[seat].hand if c.display() == name)
+    assert game.play_card(seat, card, color) == (True, None)
+
+
+def test_variants_replace_only_their_own_entries():
+    official = OFFICIAL_RULES.effects
+    for rules, changed in [(STACKING, {"+2", "+4"}), (SEVEN_ZERO, {"7", "0"}), (JUMP_IN, set()),
+                           (DRAW_UNTIL_PLAYABLE, set())]:
+        assert rules.effects.keys() == official.keys()
+        assert {v for v in official if rules.effects[v] is not official[v]} == changed
+    assert DRAW_UNTIL_PLAYABLE.draw is not OFFICIAL_RULES.draw
+    assert STACKING.draw is OFFICIAL_RULES.draw
+
+
+@pytest.mark.parametrize("enabled", [[], ["stacking"], ["seven_zero", "jump_in"], list(HouseRules.NAMES)])
+def test_names_and_mask_round_trip(enabled):
+    rules = HouseRules.from_names(enabled)
+    assert rules.names() == enabled
+    assert HouseRules.from_mask(rules.mask()) == rules
+    assert HouseRules.from_mask(rules.mask()).effects.keys() == rules.effects.keys()
+
+
+def test_unknown_rule_names_are_rejected():
+    with pytest.raises(ValueError, match="nope"):
+        HouseRules.from_names(["stacking", "nope"])
+
+
+def test_official_effects():
+    game = make_game([["Red Skip", "Red Reverse", "Red +2"], ["Red 8"], ["Red 1"], ["Red 2"]], top="Red 3",
+                     deck=["Blue 1", "Blue 2", "Blue 3"])
+    play(game, 0, "Red Skip")
+    assert game.current_index == 2
+    game.current_index = 0
+    play(game, 0, "Red Reverse")
+    assert (game.direction, game.current_index) == (-1, 3)
+    game.current_index, game.direction = 0, 1
+    play(game, 0, "Red +2")
+    assert len(game.players[1].hand) == 3 and game.last_penalty == (1, 2)
+    assert game.current_index == 2 and game.draw_stack == 0
+
+
+def test_stacked_plus2s_fall_on_the_last_player():
+    game = make_game([["Red +2", "Red 5"], ["Blue +2", "Green 1"], ["Yellow 9"], ["Green 2"]], top="Red 3",
+                     deck=["Blue 1", "Blue 2", "Blue 3", "Blue 4", "Blue 5"], rules=STACKING)
+    play(game, 0, "Red +2")
+    assert (game.draw_stack, game.current_index, len(game.players[1].hand)) == (2, 1, 2)
+    play(game, 1, "Blue +2")
+    assert (game.draw_stack, game.current_index) == (4, 2)
+    assert game.draw_one_action(2)[0] is False
+    assert game.accept_draw_stack(2) == (True, None)
+    assert len(game.players[2].hand) == 5 and game.last_penalty == (2, 4)
+    assert game.draw_stack == 0 and game.current_index == 3
+
+
+def test_stacked_plus4s_add_up():
+    game = make_game([["+4", "Red 5"], ["+4", "Green 1"], ["Yellow 9"], ["Green 2"]], top="Red 3",
+                     deck=[f"Blue {i}" for i in range(1, 10)], rules=STACKING)
+    play(game, 0, "+4", "Blue")
+    assert [c.display() for c in game.allowed_moves(1)] == ["+4"]
+    play(game, 1, "+4", "Green")
+    assert (game.pending_plus4.target, game.pending_plus4.penalty) == (2, 8)
+    assert game.accept_plus4(2) == (True, None)
+    assert len(game.players[2].hand) == 9
+
+
+def test_seven_swaps_with_the_smallest_hand():
+    game = make_game([["Red 7", "Blue 1", "Blue 2"], ["Green 1", "Green 2", "Green 3"], ["Yellow 4"],
+                      ["Red 9", "Red 8"]], top="Red 3", rules=SEVEN_ZERO)
+    play(game, 0, "Red 7")
+    assert names(game.players[0].hand) == ["Yellow 4"]
+    assert names(game.players[2].hand) == ["Blue 1", "Blue 2"]
+    assert game.current_index == 1
+
+
+def test_zero_rotates_hands_along_the_direction_of_play():
+    game = make_game([["Red 0", "Blue 1"], ["Green 1"], ["Yellow 2"], ["Red 9"]], top="Red 3", rules=SEVEN_ZERO)
+    play(game, 0, "Red 0")
+    assert [names(p.hand) for p in game.players] == [["Red 9"], ["Blue 1"], ["Green 1"], ["Yellow 2"]]
+
+
+def test_official_seven_and_zero_just_advance():
+    game = make_game([["Red 7", "Red 0", "Blue 1"], ["Green 1"], ["Yellow 2"], ["Red 9"]], top="Red 3")
+    play(game, 0, "Red 7")
+    assert names(game.players[0].hand) == ["Red 0", "Blue 1"] and game.current_index == 1
+
+
+def test_jump_in_takes_the_turn():
+    game = make_game([["Red 5"], ["Green 1"], ["Red 3", "Blue 7"], ["Yellow 2"]], top="Red 3", rules=JUMP_IN)
+    assert game.jump_in_candidate() == (2, game.players[2].hand[0])
+    play(game, 2, "Red 3")
+    assert game.current_index == 3
+    official = make_game([["Red 5"], ["Green 1"], ["Red 3", "Blue 7"], ["Yellow 2"]], top="Red 3")
+    assert official.jump_in_candidate() is None
+    assert official.play_card(2, official.players[2].hand[0]) == (False, "It's not your turn")
+
+
+@pytest.mark.parametrize("rules, drawn", [(OFFICIAL_RULES, ["Blue 1"]),
+                                          (DRAW_UNTIL_PLAYABLE, ["Blue 1", "Green 2", "Red 6"])])
+def test_draw_hook(rules, drawn):
+    game = make_game([["Blue 7"], ["Red 8"], ["Green 1"], ["Yellow 2"]], top="Red 3",
+                     deck=["Red 9", "Red 6", "Green 2", "Blue 1"], rules=rules)
+    ok, _, card = game.draw_one_action(0)
+    assert ok and card.display() == drawn[-1]
+    assert names(game.players[0].hand) == ["Blue 7"] + drawn
+    assert game.draws == len(drawn) and game.last_drawn_card is card
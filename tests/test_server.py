@@ -0,0 +1,162 @@
+"""uno_server: clients play rounds with the bots, slow readers are dropped and tables replay from their seeds."""
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import List
+
+import uno_server
+from conftest import make_game
+from uno_logic import PendingPlus4
+from uno_server import UnoServer, describe
+from uno_sim import play_out
+
+HOST = "127.0.0.1"
+
+
+class Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.view: dict = {}
+        self.events: List[str] = []
+        self.errors: List[str] = []
+
+    @classmethod
+    async def join(cls, port: int, name: str, table=None) -> Client:
+        client = cls(*await asyncio.open_connection(HOST, port))
+        client.send({"op": "join", "name": name, "table": table})
+        return client
+
+    def send(self, msg: dict) -> None:
+        self.writer.write((json.dumps(msg) + "\n").encode())
+
+    async def receive(self) -> dict:
+        msg = json.loads(await self.reader.readline())
+        if msg["op"] == "state":
+            self.view = msg["state"]
+        elif msg["op"] == "diff":
+            self.view.update(msg["set"])
+        elif msg["op"] == "event":
+            self.events.append(msg["text"])
+        elif msg["op"] == "error":
+            self.errors.append(msg["msg"])
+        return msg
+
+    def act(self) -> None:
+        """A legal action when it is this seat's turn: answer a +4, play, draw or pass."""
+        v = self.view
+        if v.get("game_over") or v.get("current") != v.get("seat"):
+            return
+        if v["initial_color_for"] == v["seat"]:
+            self.send({"op": "color", "color": "Red"})
+        elif v["plus4_target"] == v["seat"]:
+            self.send({"op": "accept"})
+        elif v["playable"]:
+            self.send({"op": "play", "card": v["playable"][0], "color": "Red"})
+        elif v["can_draw"]:
+            self.send({"op": "draw"})
+        elif v["can_pass"]:
+            self.send({"op": "pass"})
+
+    async def play_until_round_over(self) -> None:
+        while not any("wins the round" in e for e in self.events):
+            msg = await self.receive()
+            if msg["op"] in ("state", "diff"):
+                self.act()
+
+
+def test_two_clients_play_a_round_at_one_table():
+    async def scenario():
+        server = UnoServer(round_delay=0.05, seed=1)
+        await server.start(HOST, 0)
+        try:
+            ana = await Client.join(server.port, "Ana")
+            assert (await ana.receive()) == {"op": "joined", "table": 1, "seat": 0}
+            ben = await Client.join(server.port, "Ben", table=1)
+            while True:
+                msg = await ben.receive()
+                if msg["op"] == "joined":
+                    assert msg == {"op": "joined", "table": 1, "seat": 1}
+                    break
+            await asyncio.wait_for(asyncio.gather(ana.play_until_round_over(), ben.play_until_round_over()), 30)
+            for client in (ana, ben):
+                assert client.view["players"][:2] == ["Ana", "Ben"]
+                assert client.view["game_over"] and client.view["winner"] is not None
+                client.writer.close()
+            return ana.events, ben.events
+        finally:
+            server.close()
+
+    ana_events, ben_events = asyncio.run(scenario())
+    # Both seats saw the same round end, announced once
+    assert [e for e in ana_events if "wins the round" in e] == [e for e in ben_events if "wins the round" in e]
+    assert sum("wins the round" in e for e in ana_events) == 1
+
+
+def test_a_client_that_stops_reading_is_dropped(monkeypatch):
+    monkeypatch.setattr(uno_server, "SEND_BUFFER_LIMIT", 2 ** 16)
+
+    async def scenario():
+        server = UnoServer(seed=2)
+        await server.start(HOST, 0)
+        try:
+            stalled = await Client.join(server.port, "Stalled")
+            reader = await Client.join(server.port, "Reader", table=1)
+            while (await reader.receive())["op"] != "joined":
+                pass
+            reading = asyncio.ensure_future(reader.play_until_round_over())
+            # Large pongs pile up for the client that never reads, past what the sockets hold
+            ping = (json.dumps({"op": "ping", "t": "x" * 60000}) + "\n").encode()
+            table = server.tables[1]
+            for _ in range(1000):
+                if 0 not in table.seats:
+                    break
+                stalled.writer.write(ping)
+                try:
+                    await asyncio.wait_for(stalled.writer.drain(), 0.1)
+                except (ConnectionError, asyncio.TimeoutError):
+                    await asyncio.sleep(0.01)
+            seats = dict(table.seats)
+            assert list(seats) == [1] and seats[1].name == "Reader"
+            assert table.game.players[0].name == uno_server.BOT_NAMES[0]
+            reading.cancel()
+            reader.writer.close()
+            stalled.writer.close()
+        finally:
+            server.close()
+
+    asyncio.run(scenario())
+
+
+def test_each_table_replays_from_the_server_seed_and_its_id():
+    def rounds(table, count: int):
+        played = []
+        for _ in range(count):
+            play_out(table.game)
+            played.append(table.game.to_bytes())
+            table.game = table._new_game()
+        return played
+
+    async def scenario():
+        busy, quiet, other = UnoServer(seed=11), UnoServer(seed=11), UnoServer(seed=12)
+        try:
+            busy_tables = [busy.open_table(), busy.open_table()]
+            quiet_tables = [quiet.open_table(), quiet.open_table()]
+            # Table 1 of one server plays three rounds first; table 2 must not notice
+            rounds(busy_tables[0], 3)
+            assert rounds(busy_tables[1], 2) == rounds(quiet_tables[1], 2)
+            assert rounds(busy_tables[0], 1) != rounds(busy_tables[1], 1)
+            assert other.open_table().game.to_bytes() != quiet_tables[0].game.to_bytes()
+        finally:
+            for server in (busy, quiet, other):
+                server.close()
+
+    asyncio.run(scenario())
+
+
+def test_accepting_a_stacked_plus4_reports_the_cards_drawn():
+    game = make_game([["Red 5"], ["Blue 7"], ["Green 1"], ["Yellow 2"]], top="+4", color="Blue")
+    game.pending_plus4 = PendingPlus4(0, 1, True, penalty=8, prev_color="Red")
+    game.accept_plus4(1)
+    assert describe(game, 1, "accept", None, None) == "Bot 2 accepted +4 and drew 8."
@@ -0,0 +1,61 @@
+"""uno_shm: result records survive the ring at the limits of every field."""
+from __future__ import annotations
+
+import pytest
+
+from uno_shm import RECORD, ResultRing, Totals, simulate_parallel
+from uno_sim import RoundResult, play_round
+
+U32 = 2 ** 32 - 1
+EXTREMES = [
+    RoundResult(0, -1, 0, 0, 0, 0, 0),
+    RoundResult(2 ** 64 - 1, 3, U32, U32, U32, U32, U32),
+    # Past the old u16 fields: a long round with many recycles and challenges
+    RoundResult(12345, 2, 70000, 400000, 65536, 65536, 65536),
+]
+
+
+def fields(result: RoundResult) -> tuple:
+    return (result.seed, result.winner, result.winner_points, result.turns, result.recycles,
+            result.plus4_challenges, result.plus4_challenges_won)
+
+
+def test_record_round_trips_at_the_limits():
+    for result in EXTREMES:
+        assert RoundResult(*RECORD.unpack(RECORD.pack(*fields(result)))) == result
+
+
+def test_ring_keeps_records_at_the_limits_and_wraps():
+    ring = ResultRing.create(lanes=2, capacity=2)
+    try:
+        drained = []
+        for result in EXTREMES:
+            ring.write(1, result)
+            drained += ring.drain()
+        assert drained == EXTREMES
+        for result in EXTREMES[1:]:
+            ring.write(0, result)
+        assert list(ring.drain()) == EXTREMES[1:]
+    finally:
+        ring.close()
+
+
+def test_numpy_view_matches_the_record():
+    np = pytest.importorskip("numpy")
+    ring = ResultRing.create(lanes=1, capacity=4)
+    try:
+        for result in EXTREMES:
+            ring.write(0, result)
+        columns = ring.drain_numpy()
+        assert columns["winner_points"].tolist() == [r.winner_points for r in EXTREMES]
+        assert columns["recycles"].tolist() == [r.recycles for r in EXTREMES]
+        assert columns["seed"].dtype == np.dtype("<u8") and int(columns["seed"][1]) == 2 ** 64 - 1
+    finally:
+        ring.close()
+
+
+def test_parallel_totals_match_a_single_process_run():
+    expected = Totals()
+    for seed in range(60):
+        expected.add(play_round(seed))
+    assert vars(simulate_parallel(60, workers=2)) == vars(expected)
@@ -0,0 +1,56 @@
+"""Game.to_bytes / from_bytes: exact round trips in a compact form."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from uno_logic import Game, HouseRules
+from uno_sim import new_game
+
+
+def positions():
+    """Games at every point of a few rounds, plain and with house rules."""
+    for seed, rules in [(1, None), (2, HouseRules(stacking=True, seven_zero=True, jump_in=True))]:
+        game = new_game(seed, rules)
+        while not game.game_over and game.turns < 400:
+            yield game
+            game.bot_act(game.acting_player())
+        yield game
+
+
+def without_rng(state: dict) -> dict:
+    return {k: v for k, v in state.items() if k not in ("rng", "bot_rng")}
+
+
+def test_round_trip_is_exact():
+    for game in positions():
+        data = game.to_bytes()
+        copy = Game.from_bytes(data)
+        assert copy.to_bytes() == data
+        assert without_rng(copy.to_state()) == without_rng(game.to_state())
+
+
+def test_round_trip_with_random_streams():
+    game = new_game(7)
+    for _ in range(30):
+        game.bot_act(game.acting_player())
+    copy = Game.from_bytes(game.to_bytes(include_rng=True))
+    assert copy.to_state() == game.to_state()
+    assert copy.rng.random() == game.rng.random() and copy.bot_rng.random() == game.bot_rng.random()
+
+
+def test_size():
+    sizes = [len(game.to_bytes()) for game in positions()]
+    assert max(sizes) <= 160
+    assert sum(sizes) / len(sizes) <= 150
+
+
+@pytest.mark.parametrize("value", [127, 128, 300, 2 ** 16, 2 ** 40])
+def test_large_counters_round_trip(value):
+    game = new_game(3)
+    game.turns = game.recycles = game.draws = value
+    game.persona_picks = [value] * len(game.persona_picks)
+    game.color_draws = [random.Random(value).choice([0, value]) for _ in game.color_draws]
+    copy = Game.from_bytes(game.to_bytes())
+    assert without_rng(copy.to_state()) == without_rng(game.to_state())
@@ -0,0 +1,118 @@
+"""uno_stats: streaming moments and the t-digest, alone and merged from parts."""
+from __future__ import annotations
+
+import math
+import random
+import statistics
+
+import pytest
+
+from uno_stats import Moments, RoundStats, TDigest, simulate_stats
+from uno_sim import play_round
+
+
+def moments(values) -> Moments:
+    m = Moments()
+    for x in values:
+        m.add(x)
+    return m
+
+
+def digest(values, compression: float = 100) -> TDigest:
+    d = TDigest(compression)
+    for x in values:
+        d.add(x)
+    return d
+
+
+def exact_quantile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def test_moments_match_the_textbook_formulas():
+    values = [random.Random(1).gauss(50, 12) for _ in range(5000)]
+    m = moments(values)
+    assert m.count == 5000
+    assert m.mean == pytest.approx(statistics.fmean(values))
+    assert m.variance == pytest.approx(statistics.variance(values))
+    assert (m.min, m.max) == (min(values), max(values))
+
+
+@pytest.mark.parametrize("split", [0, 1, 2500, 4999])
+def test_merged_moments_equal_one_pass(split):
+    rng = random.Random(2)
+    values = [rng.expovariate(0.1) + 1e6 for _ in range(5000)]  # a large offset stresses cancellation
+    left, right = moments(values[:split]), moments(values[split:])
+    left.merge(right)
+    whole = moments(values)
+    assert left.count == whole.count
+    assert left.mean == pytest.approx(whole.mean, rel=1e-12)
+    assert left.variance == pytest.approx(whole.variance, rel=1e-9)
+    assert (left.min, left.max) == (whole.min, whole.max)
+
+
+def test_merging_an_empty_part_changes_nothing():
+    m = moments([1.0, 2.0, 4.0])
+    m.merge(Moments())
+    assert (m.count, m.mean, m.min, m.max) == (3, pytest.approx(7 / 3), 1.0, 4.0)
+    empty = Moments()
+    empty.merge(moments([5.0]))
+    assert (empty.count, empty.mean, empty.variance) == (1, 5.0, 0.0)
+
+
+def test_digest_is_exact_below_the_compression():
+    values = list(range(1, 41))
+    d = digest(values)
+    assert len(d) == 40
+    assert d.quantile(0) == 1 and d.quantile(1) == 40
+    assert d.quantile(0.5) == pytest.approx(statistics.median(values), abs=0.5)
+
+
+def test_digest_quantiles_are_close_and_memory_is_bounded():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(3, 0.8) for _ in range(50000)]
+    d = digest(values)
+    assert len(d) <= 100
+    for q in (0.01, 0.5, 0.9, 0.99):
+        # Rank error, which the t-digest bounds, rather than value error
+        estimate = d.quantile(q)
+        rank = sum(v <= estimate for v in values) / len(values)
+        assert abs(rank - q) < 0.01, (q, rank)
+    assert d.count == 50000 and (d.min, d.max) == (min(values), max(values))
+
+
+def test_merged_digests_track_one_digest():
+    rng = random.Random(4)
+    values = [rng.gauss(0, 1) for _ in range(40000)]
+    parts = [digest(values[i::8]) for i in range(8)]
+    merged = TDigest()
+    for part in parts:
+        merged.merge(part)
+    whole = digest(values)
+    assert merged.count == whole.count == 40000
+    assert len(merged) <= 100
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        assert merged.quantile(q) == pytest.approx(exact_quantile(values, q), abs=0.05)
+        assert merged.quantile(q) == pytest.approx(whole.quantile(q), abs=0.05)
+
+
+def test_empty_digest():
+    assert math.isnan(TDigest().quantile(0.5))
+
+
+def test_round_stats_merge_equals_one_pass():
+    results = [play_round(seed) for seed in range(200)]
+    whole = RoundStats()
+    whole.extend(results)
+    left, right = RoundStats(), RoundStats()
+    left.extend(results[:70])
+    right.extend(results[70:])
+    left.merge(right)
+    assert (left.rounds, left.aborted, left.wins, left.persona_picks) == (
+        whole.rounds, whole.aborted, whole.wins, whole.persona_picks)
+    for name, metric in whole.metrics.items():
+        assert left.metrics[name].moments.mean == pytest.approx(metric.moments.mean)
+        assert left.metrics[name].moments.variance == pytest.approx(metric.moments.variance)
+    chunked = simulate_stats(200, chunk=30)
+    assert (chunked.rounds, chunked.wins) == (whole.rounds, whole.wins)
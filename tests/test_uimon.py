@@ -0,0 +1,40 @@
+"""uno_uimon: time spent in a modal dialog is left out of method timings and loop lag."""
+from __future__ import annotations
+
+import time
+
+from uno_uimon import UiMonitor
+
+
+class Gui:
+    def __init__(self, monitor: UiMonitor) -> None:
+        self.monitor = monitor
+
+    def refresh(self) -> None:
+        time.sleep(0.01)
+        with self.monitor.paused():
+            time.sleep(0.2)  # the user reading a messagebox
+        self.render_bots()
+
+    def render_bots(self) -> None:
+        time.sleep(0.01)
+
+
+def test_paused_time_is_left_out_of_nested_timings():
+    monitor = UiMonitor(root=None)
+    gui = Gui(monitor)
+    monitor.instrument(gui, ("refresh", "render_bots"))
+    gui.refresh()
+    refresh = monitor.series["refresh"].samples[0]
+    assert 20 <= refresh < 150
+    assert 10 <= monitor.series["render_bots"].samples[0] < refresh
+
+
+def test_a_beat_held_back_by_a_dialog_is_not_lag():
+    monitor = UiMonitor(root=None)
+    monitor._expected = time.perf_counter() + 0.01
+    with monitor.paused():
+        time.sleep(0.2)
+    monitor.root = type("Root", (), {"after": lambda self, ms, fn: "after#1"})()
+    monitor._beat()
+    assert monitor.series["loop lag"].samples[0] < 50
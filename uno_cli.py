@@ -0,0 +1,267 @@
+"""Command-line entry point: play, simulate, bench and replay.
+
+Only `play` touches the GUI; the headless subcommands never import tkinter,
+and every subcommand imports the modules it needs when it runs, so starting
+a simulation costs the engine import and nothing else.
+
+    python uno_cli.py play
+    python uno_cli.py simulate --rounds 10000 [--workers 8] [--log rounds.jsonl] [--rules stacking,jump_in]
+    python uno_cli.py bench [--tables 2000]
+    python uno_cli.py replay rounds.jsonl [--round 3] [--verbose]
+    python uno_cli.py challenge-table [--rounds 100000] [--workers 8] [--out plus4_table.bin]
+
+Move logs are JSON lines, one round per line:
+    {"seed": 7, "winner": 2, "rules": [], "moves": [[seat, action, hand index, color], ...]}
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+
+def cmd_play(args: argparse.Namespace) -> int:
+    import main as gui
+    gui.main(args.gui_args)
+    return 0
+
+
+def house_rules(spec: str):
+    from uno_logic import HouseRules
+    return HouseRules.from_names(n.strip() for n in spec.split(",") if n.strip())
+
+
+def cmd_simulate(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    rules = args.rules
+    if args.workers > 1:
+        if args.log:
+            print("--log records in-process only; drop --workers", file=sys.stderr)
+            return 2
+        from uno_shm import simulate_parallel
+        totals = simulate_parallel(args.rounds, args.workers, args.seed, rules=rules)
+        print(totals.summary())
+    else:
+        from uno_sim import play_round, record_round
+        wins = [0, 0, 0, 0]
+        aborted = 0
+        turns = 0
+        log_file = None
+        if args.log:
+            import json
+            log_file = open(args.log, "w")
+        try:
+            for seed in range(args.seed, args.seed + args.rounds):
+                if log_file is not None:
+                    game, moves = record_round(seed, rules=rules)
+                    winner = game.winner_index if game.game_over and game.winner_index is not None else -1
+                    json.dump({"seed": seed, "winner": winner, "rules": rules.names(),
+                               "moves": [[seat, *move] for seat, move in moves]}, log_file, separators=(",", ":"))
+                    log_file.write("\n")
+                    game_turns = game.turns
+                else:
+                    result = play_round(seed, rules=rules)
+                    winner, game_turns = result.winner, result.turns
+                if winner < 0:
+                    aborted += 1
+                else:
+                    wins[winner] += 1
+                turns += game_turns
+        finally:
+            if log_file is not None:
+                log_file.close()
+        print(f"rounds={args.rounds} wins={wins} aborted={aborted} avg_turns={turns / max(1, args.rounds):.1f}")
+    elapsed = time.perf_counter() - start
+    print(f"{args.rounds / elapsed:.0f} rounds/s ({elapsed:.2f}s)")
+    return 0
+
+
+def _first_round(seed: int) -> int:
+    from uno_sim import play_round
+    return play_round(seed).winner
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    import subprocess
+
+    # Cold start: a fresh interpreter that imports the engine and plays one round
+    probe = ("import time; t = time.perf_counter(); from uno_sim import play_round; t1 = time.perf_counter(); "
+             "play_round(0); t2 = time.perf_counter(); import sys; "
+             "print(t1 - t, t2 - t1, 'tkinter' in sys.modules)")
+    cold = []
+    for _ in range(args.repeat):
+        t = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout.split()
+        cold.append((time.perf_counter() - t, float(out[0]), float(out[1]), out[2] == "True"))
+    best = min(cold)
+    print(f"cold start to first round: {best[0] * 1000:.1f} ms wall "
+          f"(engine import {best[1] * 1000:.1f} ms, first round {best[2] * 1000:.1f} ms, "
+          f"tkinter imported: {best[3]})")
+
+    # Worker spawn cost: time until a fresh pool returns its first result
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+    for method in ("spawn", "forkserver", "fork"):
+        if method not in mp.get_all_start_methods():
+            continue
+        t = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=mp.get_context(method)) as pool:
+            list(pool.map(_first_round, range(args.workers)))
+            ready = time.perf_counter() - t
+        print(f"{method:>10} pool of {args.workers}: first results after {ready * 1000:.1f} ms "
+              f"({ready * 1000 / args.workers:.1f} ms per worker)")
+
+    # Position hand-off: compact bytes versus pickle
+    import pickle
+    from uno_sim import new_game, play_out
+    game = new_game(0)
+    play_out(game, 20)
+    blob, pickled = game.to_bytes(), pickle.dumps(game)
+    type(game).from_bytes(blob)
+    n = 2000
+    t = time.perf_counter()
+    for _ in range(n):
+        type(game).from_bytes(game.to_bytes(), game.rng, game.bot_rng)
+    as_bytes = (time.perf_counter() - t) / n
+    t = time.perf_counter()
+    for _ in range(n):
+        pickle.loads(pickle.dumps(game))
+    as_pickle = (time.perf_counter() - t) / n
+    print(f"state round trip: to_bytes/from_bytes {as_bytes * 1e6:.0f} us ({len(blob)} B), "
+          f"pickle {as_pickle * 1e6:.0f} us ({len(pickled)} B)")
+
+    # Idle table footprint, as the server holds them
+    import tracemalloc
+    from uno_server import UnoServer
+    server = UnoServer()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for _ in range(args.tables):
+        server.open_table()
+    per_table = (tracemalloc.get_traced_memory()[0] - base) / args.tables
+    tracemalloc.stop()
+    server.executor.shutdown()
+    print(f"idle table: {per_table / 1024:.1f} KiB ({args.tables} tables traced; "
+          f"100k tables ~{per_table * 100000 / 2 ** 20:.0f} MiB)")
+
+    # Steady state in this process
+    from uno_sim import play_round
+    t = time.perf_counter()
+    for seed in range(args.rounds):
+        play_round(seed)
+    elapsed = time.perf_counter() - t
+    print(f"steady state: {args.rounds / elapsed:.0f} rounds/s in one process")
+    return 0
+
+
+def cmd_replay(args: argparse.Namespace) -> int:
+    import json
+    from uno_logic import HouseRules
+    from uno_sim import replay
+
+    with open(args.log) as f:
+        for number, line in enumerate(f):
+            if args.round is not None and number != args.round:
+                continue
+            record = json.loads(line)
+            moves = [(seat, (action, index, color)) for seat, action, index, color in record["moves"]]
+
+            def show(game, seat, move):
+                action, index, color = move
+                detail = game.discard_pile[-1].display() if action == "play" else ""
+                print(f"  {game.players[seat].name}: {action} {detail}{' -> ' + color if color else ''}")
+
+            try:
+                game = replay(record["seed"], moves, show if args.verbose else None,
+                              rules=HouseRules.from_names(record.get("rules", ())))
+            except ValueError as e:
+                print(f"round {number} (seed {record['seed']}): {e}")
+                return 1
+            winner = game.winner_index if game.game_over and game.winner_index is not None else -1
+            status = "ok" if winner == record.get("winner", winner) else f"MISMATCH (logged {record['winner']})"
+            print(f"round {number} (seed {record['seed']}): {len(moves)} moves, winner seat {winner} {status}")
+            if winner != record.get("winner", winner):
+                return 1
+    return 0
+
+
+def cmd_challenge_table(args: argparse.Namespace) -> int:
+    from concurrent.futures import ProcessPoolExecutor
+    from uno_logic import COLORS, PLUS4_TABLE, ChallengeModel
+    from uno_sim import challenge_counts
+
+    start = time.perf_counter()
+    chunks = [(s, min(s + args.chunk, args.seed + args.rounds))
+              for s in range(args.seed, args.seed + args.rounds, args.chunk)]
+    illegal = [0] * ChallengeModel.SIZE
+    total = [0] * ChallengeModel.SIZE
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for part_illegal, part_total in pool.map(challenge_counts, *zip(*chunks), [args.rules] * len(chunks)):
+            illegal = [a + b for a, b in zip(illegal, part_illegal)]
+            total = [a + b for a, b in zip(total, part_total)]
+    model = ChallengeModel.from_counts(illegal, total, args.prior)
+    out = args.out or PLUS4_TABLE
+    model.save(out)
+    elapsed = time.perf_counter() - start
+    print(f"{sum(total)} +4s seen, {sum(illegal) / max(1, sum(total)):.1%} illegal, "
+          f"{sum(1 for n in total if n)}/{ChallengeModel.SIZE} keys observed")
+    # Averaged over colors, which are symmetric: P(illegal) by draws on the color (rows) and hand size
+    print("draws\\hand " + " ".join(f"{h + 1:>4}" for h in range(ChallengeModel.HAND)))
+    for d in range(ChallengeModel.DRAWS):
+        row = []
+        for h in range(ChallengeModel.HAND):
+            keys = [(c * ChallengeModel.DRAWS + d) * ChallengeModel.HAND + h for c in range(len(COLORS))]
+            row.append(sum(model.table[k] for k in keys) / len(keys))
+        label = f"{d}+" if d == ChallengeModel.DRAWS - 1 else str(d)
+        print(f"{label:>10} " + " ".join(f"{p:4.2f}" for p in row))
+    print(f"wrote {out} in {elapsed:.1f}s")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="uno", description="UNO game, simulator and tools.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_play = sub.add_parser("play", help="play against three bots (tkinter GUI)")
+    p_play.add_argument("gui_args", nargs=argparse.REMAINDER, help="arguments passed to the GUI (e.g. --monitor)")
+    p_play.set_defaults(func=cmd_play)
+
+    p_sim = sub.add_parser("simulate", help="simulate bot-only rounds")
+    p_sim.add_argument("--rounds", type=int, default=10000)
+    p_sim.add_argument("--seed", type=int, default=0)
+    p_sim.add_argument("--workers", type=int, default=1)
+    p_sim.add_argument("--log", help="write a replayable move log (JSON lines)")
+    p_sim.add_argument("--rules", type=house_rules, default="", help="comma-separated house rules: stacking, seven_zero, "
+                                                    "jump_in, draw_until_playable")
+    p_sim.set_defaults(func=cmd_simulate)
+
+    p_bench = sub.add_parser("bench", help="measure cold start, worker spawn cost, table memory and throughput")
+    p_bench.add_argument("--repeat", type=int, default=5, help="cold starts to sample")
+    p_bench.add_argument("--workers", type=int, default=4)
+    p_bench.add_argument("--rounds", type=int, default=2000)
+    p_bench.add_argument("--tables", type=int, default=2000, help="server tables to open for the memory figure")
+    p_bench.set_defaults(func=cmd_bench)
+
+    p_replay = sub.add_parser("replay", help="replay and verify rounds from a move log")
+    p_replay.add_argument("log")
+    p_replay.add_argument("--round", type=int, help="only this round (0-based line number)")
+    p_replay.add_argument("--verbose", "-v", action="store_true", help="print every move")
+    p_replay.set_defaults(func=cmd_replay)
+
+    p_table = sub.add_parser("challenge-table", help="rebuild the +4 challenge table from simulated rounds")
+    p_table.add_argument("--rounds", type=int, default=100000)
+    p_table.add_argument("--seed", type=int, default=0)
+    p_table.add_argument("--workers", type=int, default=4)
+    p_table.add_argument("--chunk", type=int, default=2000, help="rounds per worker task")
+    p_table.add_argument("--prior", type=float, default=20.0, help="pseudo-samples of the overall rate per key")
+    p_table.add_argument("--rules", type=house_rules, default="", help="comma-separated house rules")
+    p_table.add_argument("--out", help="output file (default: plus4_table.bin next to uno_logic.py)")
+    p_table.set_defaults(func=cmd_challenge_table)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+"""Multi-node simulation: a coordinator hands out seeded batches of rounds to workers over TCP.
+
+The coordinator splits a run into batches of consecutive seeds and leases
+them to whichever workers connect; workers play their batch with the bot
+(uno_sim.play_round) and send back one compact record per round
+(uno_shm.RECORD, base64 in the JSON line). Messages are line-delimited
+JSON, as in uno_server:
+
+Worker -> coordinator
+    {"op": "hello", "name": "host:pid"}
+    {"op": "heartbeat"}                                 every HEARTBEAT seconds
+    {"op": "result", "lease": 3, "batch": 2, "records": "<base64>"}
+
+Coordinator -> worker
+    {"op": "batch", "lease": 3, "batch": 2, "start": 2000, "count": 1000, "rules": []}
+    {"op": "wait"}                                      nothing to lease right now
+    {"op": "done"}                                      the run is complete
+    {"op": "error", "msg": "..."}
+
+A worker that disconnects, or sends nothing for --timeout seconds, is
+dropped and its batches are leased again. Since every round is seeded, a
+batch's records do not depend on which worker played it. Each batch is
+counted once, from the first complete and valid result; any later copy is
+discarded, so the totals are exactly those of a single-process run.
+
+On one machine, --local starts worker processes that stand in for nodes
+(--chaos makes one crash and one hang mid-batch):
+
+    python uno_cluster.py coordinator --rounds 100000 --local 4 --chaos --verify
+    python uno_cluster.py coordinator --rounds 1000000 --host 0.0.0.0 --port 8766
+    python uno_cluster.py worker --host 10.0.0.5 --port 8766
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import os
+import socket
+import sys
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from uno_logic import HouseRules
+from uno_shm import RECORD, Totals
+from uno_sim import RoundResult, play_round
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+HEARTBEAT = 1.0  # seconds between worker heartbeats
+TIMEOUT = 5.0  # silence after which a worker counts as lost
+LINE_LIMIT = 2 ** 22  # a result line is about 43 bytes per round
+
+
+def _send(writer: asyncio.StreamWriter, msg: dict) -> None:
+    if not writer.is_closing():
+        writer.write(json.dumps(msg, separators=(",", ":")).encode() + b"\n")
+
+
+class _Worker:
+    """The coordinator's view of one connected worker."""
+    __slots__ = ("name", "writer", "last_seen", "leases", "idle")
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.name = "?"
+        self.writer = writer
+        self.last_seen = time.monotonic()
+        self.leases: Set[int] = set()
+        self.idle = False
+
+
+class Coordinator:
+    """Leases seeded batches to workers and aggregates their records exactly once."""
+
+    def __init__(self, rounds: int, batch: int = 1000, base_seed: int = 0, rules: Optional[HouseRules] = None,
+                 timeout: float = TIMEOUT) -> None:
+        self.batches: List[Tuple[int, int]] = [(s, min(batch, base_seed + rounds - s))
+                                               for s in range(base_seed, base_seed + rounds, batch)]
+        self.rules = rules if rules is not None else HouseRules()
+        self.timeout = timeout
+        self.totals = Totals()
+        self.todo: Deque[int] = deque(range(len(self.batches)))
+        self.leases: Dict[int, Tuple[int, _Worker]] = {}  # lease id -> (batch, worker)
+        self.done: Set[int] = set()
+        self.workers: Set[_Worker] = set()
+        self.reissued = 0  # leases handed out again after their worker was lost
+        self.duplicates = 0  # results discarded because the batch was already counted
+        self.lost = 0  # workers dropped while holding a lease
+        self._lease_ids = itertools.count(1)
+        self._finished = asyncio.Event()
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self._handlers: Set[asyncio.Task] = set()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+        self._reaper = asyncio.create_task(self._reap())
+        if not self.batches:
+            self._finish()
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def wait(self) -> Totals:
+        """Block until every batch is counted, then tell the workers and stop listening."""
+        await self._finished.wait()
+        self.close()
+        # Closed connections end their handlers at the next read
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=self.timeout)
+        return self.totals
+
+    def close(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self._server is not None:
+            self._server.close()
+        for worker in list(self.workers):
+            worker.writer.close()
+
+    # --- Leases ---
+    def _assign(self, worker: _Worker) -> None:
+        if self._finished.is_set():
+            _send(worker.writer, {"op": "done"})
+            return
+        if not self.todo:
+            # Everything is leased; a lost worker's batch may still come back to this one
+            worker.idle = True
+            _send(worker.writer, {"op": "wait"})
+            return
+        b = self.todo.popleft()
+        lease = next(self._lease_ids)
+        self.leases[lease] = (b, worker)
+        worker.leases.add(lease)
+        worker.idle = False
+        start, count = self.batches[b]
+        _send(worker.writer, {"op": "batch", "lease": lease, "batch": b, "start": start, "count": count,
+                              "rules": self.rules.names()})
+
+    def _complete(self, worker: _Worker, msg: dict) -> Optional[str]:
+        """Count a result unless its batch already was; returns an error for malformed results."""
+        entry = self.leases.pop(msg.get("lease"), None)
+        if entry is None or entry[1] is not worker:
+            return "Unknown lease"
+        worker.leases.discard(msg["lease"])
+        b = entry[0]
+        if b in self.done:
+            self.duplicates += 1
+            return None
+        start, count = self.batches[b]
+        try:
+            data = base64.b64decode(msg.get("records", ""), validate=True)
+        except ValueError:
+            data = b""
+        records = ([RoundResult(*fields) for fields in RECORD.iter_unpack(data)]
+                   if len(data) == count * RECORD.size else [])
+        if [r.seed for r in records] != list(range(start, start + count)):
+            self.todo.append(b)
+            return f"Batch {b} result does not cover seeds {start}..{start + count - 1}"
+        for r in records:
+            self.totals.add(r)
+        self.done.add(b)
+        if len(self.done) == len(self.batches):
+            self._finish()
+        return None
+
+    def _drop(self, worker: _Worker) -> None:
+        """Forget a worker and lease its unfinished batches again."""
+        if worker not in self.workers:
+            return
+        self.workers.discard(worker)
+        if worker.leases:
+            self.lost += 1
+        for lease in worker.leases:
+            b, _ = self.leases.pop(lease)
+            if b not in self.done:
+                self.todo.append(b)
+                self.reissued += 1
+        worker.leases.clear()
+        worker.writer.close()
+        for other in list(self.workers):
+            if other.idle and self.todo:
+                self._assign(other)
+
+    def _finish(self) -> None:
+        self._finished.set()
+        for worker in self.workers:
+            _send(worker.writer, {"op": "done"})
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.timeout / 4)
+            now = time.monotonic()
+            for worker in list(self.workers):
+                if now - worker.last_seen > self.timeout:
+                    self._drop(worker)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        worker = _Worker(writer)
+        self.workers.add(worker)
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while worker in self.workers:
+                line = await reader.readline()
+                if not line:
+                    break
+                worker.last_seen = time.monotonic()
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    _send(writer, {"op": "error", "msg": "Malformed JSON"})
+                    continue
+                if not isinstance(msg, dict):
+                    _send(writer, {"op": "error", "msg": "Expected a JSON object"})
+                    continue
+                op = msg.get("op")
+                if op == "hello":
+                    worker.name = str(msg.get("name") or "?")[:64]
+                    self._assign(worker)
+                elif op == "result":
+                    err = self._complete(worker, msg)
+                    if err:
+                        _send(writer, {"op": "error", "msg": err})
+                    self._assign(worker)
+                elif op != "heartbeat":
+                    _send(writer, {"op": "error", "msg": f"Unknown op {op!r}"})
+                if writer.transport.get_write_buffer_size() > 2 ** 16:
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # ValueError: a line over LINE_LIMIT
+            pass
+        finally:
+            self._drop(worker)
+            self._handlers.discard(task)
+
+
+# --- Worker ---
+def run_batch(start: int, count: int, rules: List[str]) -> bytes:
+    """Play seeds start..start+count-1 and pack one RECORD per round."""
+    house = HouseRules.from_names(rules)
+    parts = []
+    for seed in range(start, start + count):
+        r = play_round(seed, rules=house)
+        parts.append(RECORD.pack(r.seed, r.winner, r.winner_points, r.turns, r.recycles, r.plus4_challenges,
+                                 r.plus4_challenges_won))
+    return b"".join(parts)
+
+
+async def _heartbeat(writer: asyncio.StreamWriter, interval: float) -> None:
+    while True:
+        _send(writer, {"op": "heartbeat"})
+        await asyncio.sleep(interval)
+
+
+async def _connect(host: str, port: int, patience: float) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    # The coordinator may still be starting up
+    deadline = time.monotonic() + patience
+    while True:
+        try:
+            return await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def run_worker(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, heartbeat: float = HEARTBEAT,
+                     crash_after: Optional[int] = None, hang_after: Optional[int] = None,
+                     patience: float = 10.0) -> int:
+    """Play leased batches until the coordinator says done or goes away; returns the batches played.
+
+    Batches run in a thread, so heartbeats keep flowing while a batch is
+    played. crash_after and hang_after simulate a failing node: after that
+    many batches the worker exits, or stops working and heartbeating, in
+    the middle of its next batch.
+    """
+    reader, writer = await _connect(host, port, patience)
+    loop = asyncio.get_running_loop()
+    _send(writer, {"op": "hello", "name": f"{socket.gethostname()}:{os.getpid()}"})
+    beat = asyncio.create_task(_heartbeat(writer, heartbeat))
+    played = 0
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            msg = json.loads(line)
+            op = msg.get("op")
+            if op == "done":
+                break
+            if op == "error":
+                print(f"coordinator: {msg.get('msg')}", file=sys.stderr)
+            elif op == "batch":
+                if crash_after is not None and played >= crash_after:
+                    os._exit(1)
+                if hang_after is not None and played >= hang_after:
+                    beat.cancel()
+                    await reader.read()  # until the coordinator gives up on us
+                    break
+                data = await loop.run_in_executor(None, run_batch, msg["start"], msg["count"], msg["rules"])
+                _send(writer, {"op": "result", "lease": msg["lease"], "batch": msg["batch"],
+                               "records": base64.b64encode(data).decode("ascii")})
+                await writer.drain()
+                played += 1
+    except ConnectionError:
+        pass
+    finally:
+        beat.cancel()
+        writer.close()
+    return played
+
+
+# --- Command line ---
+async def _coordinate(args: argparse.Namespace) -> int:
+    rules = HouseRules.from_names(n.strip() for n in args.rules.split(",") if n.strip())
+    coordinator = Coordinator(args.rounds, args.batch, args.seed, rules, args.timeout)
+    await coordinator.start(args.host, args.port)
+    print(f"coordinator on {args.host}:{coordinator.port}: {len(coordinator.batches)} batches of "
+          f"up to {args.batch} rounds")
+    procs = []
+    for i in range(args.local):
+        cmd = [sys.executable, os.path.abspath(__file__), "worker", "--host", args.host,
+               "--port", str(coordinator.port), "--heartbeat", str(args.heartbeat)]
+        if args.chaos and i == 0:
+            cmd += ["--crash-after", "1"]
+        elif args.chaos and i == 1:
+            cmd += ["--hang-after", "1"]
+        procs.append(await asyncio.create_subprocess_exec(*cmd))
+    start = time.perf_counter()
+    try:
+        totals = await coordinator.wait()
+    finally:
+        for proc in procs:
+            try:
+                await asyncio.wait_for(proc.wait(), 2 * args.timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+    elapsed = time.perf_counter() - start
+    print(totals.summary())
+    print(f"{totals.rounds / elapsed:.0f} rounds/s ({elapsed:.2f}s); workers lost {coordinator.lost}, "
+          f"batches re-issued {coordinator.reissued}, duplicate results dropped {coordinator.duplicates}")
+    if args.verify:
+        reference = Totals()
+        for seed in range(args.seed, args.seed + args.rounds):
+            reference.add(play_round(seed, rules=rules))
+        same = vars(reference) == vars(totals)
+        print("matches a single-process run" if same else "DIFFERS from a single-process run:\n"
+              + reference.summary())
+        return 0 if same else 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Distribute bot-only rounds over TCP workers.")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    p_coord = sub.add_parser("coordinator", help="lease batches and aggregate the results")
+    p_coord.add_argument("--host", default=DEFAULT_HOST)
+    p_coord.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    p_coord.add_argument("--rounds", type=int, default=100000)
+    p_coord.add_argument("--seed", type=int, default=0)
+    p_coord.add_argument("--batch", type=int, default=1000, help="rounds per lease")
+    p_coord.add_argument("--rules", default="", help="comma-separated house rules")
+    p_coord.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds of silence before a worker is lost")
+    p_coord.add_argument("--heartbeat", type=float, default=HEARTBEAT, help="heartbeat interval of --local workers")
+    p_coord.add_argument("--local", type=int, default=0, help="worker processes to start on this host")
+    p_coord.add_argument("--chaos", action="store_true", help="make one local worker crash and one hang")
+    p_coord.add_argument("--verify", action="store_true", help="compare with a single-process run afterwards")
+
+    p_work = sub.add_parser("worker", help="play batches leased by a coordinator")
+    p_work.add_argument("--host", default=DEFAULT_HOST)
+    p_work.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_work.add_argument("--heartbeat", type=float, default=HEARTBEAT)
+    p_work.add_argument("--crash-after", type=int, help="exit mid-batch after this many batches (testing)")
+    p_work.add_argument("--hang-after", type=int, help="stop responding after this many batches (testing)")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.role == "coordinator":
+            return asyncio.run(_coordinate(args))
+        played = asyncio.run(run_worker(args.host, args.port, args.heartbeat, args.crash_after, args.hang_after))
+        print(f"worker {os.getpid()}: {played} batches")
+        return 0
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Pre-generated deals in bulk for simulation setup.
+
+Game.setup() on its own shuffles the 108-card deck three times before
+dealing. A DealBatch generates the shuffles of many rounds at once, as a
+matrix of permutations of CARD_TABLE (the card instances every deck in
+this process shares, in standard order), plus a starting seat and seeds
+for the card and bot streams of each round. Each row becomes a Deal, which
+Game.setup() deals with slice copies. With NumPy the whole matrix comes
+from one call; without it, each row is a random.shuffle of card indices.
+
+    python uno_deals.py --rounds 20000 [--batch 4096] [--no-numpy]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Iterator, List, Optional, Sequence
+
+from uno_logic import _SHARED_DECK, Card, Deal, Deck, Game, HouseRules
+from uno_sim import MAX_ACTIONS, RoundResult, play_out, round_result
+
+# Card index -> the shared instance; a permutation of range(len(CARD_TABLE)) is a shuffled deck
+CARD_TABLE: Sequence[Card] = tuple(_SHARED_DECK)
+
+
+class DealBatch:
+    """Shuffles, starting seats and stream seeds for a run of rounds; batch[i] is round i's Deal."""
+    __slots__ = ("orders", "starts", "recycle_seeds", "bot_seeds")
+
+    def __init__(self, orders: List[List[int]], starts: List[int], recycle_seeds: List[int],
+                 bot_seeds: List[int]) -> None:
+        self.orders = orders  # per round, indices into CARD_TABLE; dealt from the end
+        self.starts = starts
+        self.recycle_seeds = recycle_seeds
+        self.bot_seeds = bot_seeds
+
+    @classmethod
+    def generate(cls, n: int, seed: int, num_players: int = 4, use_numpy: Optional[bool] = None) -> DealBatch:
+        """n rounds derived from seed; use_numpy None uses NumPy when it is installed.
+
+        The two generators give different (equally uniform) shuffles for the same seed.
+        """
+        if use_numpy is not False:
+            try:
+                import numpy as np
+            except ImportError:
+                if use_numpy:
+                    raise
+            else:
+                rng = np.random.default_rng(seed)
+                table = np.broadcast_to(np.arange(len(CARD_TABLE), dtype=np.uint8), (n, len(CARD_TABLE)))
+                orders = rng.permuted(table, axis=1).tolist()
+                starts = rng.integers(num_players, size=n).tolist()
+                seeds = rng.integers(1 << 63, size=(2, n), dtype=np.uint64).tolist()
+                return cls(orders, starts, seeds[0], seeds[1])
+        rng = random.Random(seed)
+        identity = list(range(len(CARD_TABLE)))
+        orders = []
+        for _ in range(n):
+            order = identity[:]
+            rng.shuffle(order)
+            orders.append(order)
+        starts = [rng.randrange(num_players) for _ in range(n)]
+        return cls(orders, starts, [rng.getrandbits(63) for _ in range(n)], [rng.getrandbits(63) for _ in range(n)])
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __getitem__(self, i: int) -> Deal:
+        return Deal(list(map(CARD_TABLE.__getitem__, self.orders[i])), self.starts[i], self.recycle_seeds[i])
+
+    def __iter__(self) -> Iterator[Deal]:
+        return (self[i] for i in range(len(self)))
+
+    def game(self, i: int, rules: Optional[HouseRules] = None) -> Game:
+        """A Game set up with round i's deal and bot stream."""
+        # The card stream is reseeded by setup (Deal.recycle_seed) and the deck comes from
+        # the deal, so the constructor must not seed from the OS or shuffle a deck of its own
+        rng = random.Random(0)
+        game = Game(num_players=4, rng=rng, bot_rng=random.Random(self.bot_seeds[i]), rules=rules,
+                    deck=Deck(rng, cards=[]))
+        game.setup(self[i])
+        return game
+
+
+def simulate(rounds: int, seed: int = 0, rules: Optional[HouseRules] = None, batch: int = 4096,
+             use_numpy: Optional[bool] = None, max_actions: int = MAX_ACTIONS) -> Iterator[RoundResult]:
+    """Bot-only rounds set up from pre-generated deals; RoundResult.seed is the round's number.
+
+    Batch b is generated from seed + b, so a run replays exactly for the same
+    seed, batch size and generator.
+    """
+    for b, start in enumerate(range(0, rounds, batch)):
+        deals = DealBatch.generate(min(batch, rounds - start), seed + b, use_numpy=use_numpy)
+        for i in range(len(deals)):
+            game = deals.game(i, rules)
+            play_out(game, max_actions)
+            yield round_result(game, start + i)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare round setup from fresh shuffles and from deal batches.")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch", type=int, default=4096, help="deals generated at once")
+    parser.add_argument("--no-numpy", dest="use_numpy", action="store_const", const=False, default=None,
+                        help="generate shuffles with random instead of NumPy")
+    args = parser.parse_args(argv)
+
+    from uno_sim import new_game
+    t = time.perf_counter()
+    for seed in range(args.seed, args.seed + args.rounds):
+        new_game(seed)
+    fresh = time.perf_counter() - t
+    t = time.perf_counter()
+    generate = 0.0
+    for b, start in enumerate(range(0, args.rounds, args.batch)):
+        g = time.perf_counter()
+        deals = DealBatch.generate(min(args.batch, args.rounds - start), args.seed + b, use_numpy=args.use_numpy)
+        generate += time.perf_counter() - g
+        for i in range(len(deals)):
+            deals.game(i)
+    batched = time.perf_counter() - t
+    print(f"setup per round: fresh shuffle {fresh / args.rounds * 1e6:.1f} us, "
+          f"deal batch {batched / args.rounds * 1e6:.1f} us "
+          f"(of which generating {generate / args.rounds * 1e6:.1f} us)")
+
+    t = time.perf_counter()
+    wins = [0] * 5
+    for result in simulate(args.rounds, args.seed, batch=args.batch, use_numpy=args.use_numpy):
+        wins[result.winner] += 1  # -1 (aborted) is the last entry
+    elapsed = time.perf_counter() - t
+    print(f"{args.rounds} rounds from deal batches: {args.rounds / elapsed:.0f} rounds/s, "
+          f"wins by seat {wins[:4]}, aborted {wins[4]}")
+
+
+if __name__ == "__main__":
+    main()
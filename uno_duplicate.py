@@ -0,0 +1,215 @@
+"""Duplicate-deal evaluation of bot policies.
+
+Every deal (deck order, starting seat and recycle shuffles, see
+uno_logic.Deal) is replayed once for each distinct arrangement of the
+lineup over the four seats. All policies therefore see the same cards from
+every seat, and policies are compared on per-deal paired differences,
+which cancels part of the luck of the deal. Bot randomness is shared too,
+per decision point rather than as one stream: the k-th decision of a seat
+draws from the same numbers in every arrangement (common random numbers),
+so one policy's extra draw does not shift every later decision.
+
+The report shows the paired standard error next to the one plain random
+deals would give for the same number of rounds (the spread of single-round
+differences), i.e. how many times more rounds an unpaired comparison would
+need. Measured on win rate over 3000 deals: about 1.7x for Aggressive vs
+Conservative and 1.2x for mixed vs Monochrome and for Chaotic vs Finisher.
+Rounds diverge after the first differing decision, so the gain is modest.
+
+    python uno_duplicate.py --policies Aggressive,Conservative --deals 500 --workers 4
+    python uno_duplicate.py --policies mixed,Finisher,Chaotic,Monochrome --deals 200
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from uno_logic import Deal, Game
+from uno_policy import Policy, policy_by_name, policy_names
+from uno_sim import MAX_ACTIONS
+
+# One round, per policy: (seats held, wins, points)
+RoundTotals = Dict[str, Tuple[int, int, int]]
+# All rounds played on one deal, one per arrangement
+DealTotals = List[RoundTotals]
+
+
+def arrangements(lineup: Sequence[str]) -> List[Tuple[str, ...]]:
+    """Every distinct assignment of the lineup to seats (all rotations and permutations)."""
+    return sorted(set(itertools.permutations(lineup)))
+
+
+_MASK64 = (1 << 64) - 1
+
+
+class DecisionRandom(random.Random):
+    """A bot stream that is cheap to reseed at every decision point (SplitMix64).
+
+    Seeding a Mersenne Twister costs about 7 us, as much as the decision it
+    would serve; here it is one assignment.
+    """
+
+    def seed(self, a: Optional[int] = None, version: int = 2) -> None:
+        self._state = (a if a is not None else random.getrandbits(64)) & _MASK64
+
+    def getstate(self) -> int:
+        return self._state
+
+    def setstate(self, state: int) -> None:
+        self._state = state
+
+    def _next(self) -> int:
+        self._state = x = (self._state + 0x9E3779B97F4A7C15) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return x ^ (x >> 31)
+
+    def random(self) -> float:
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        bits = 0
+        for _ in range(0, k, 64):
+            bits = bits << 64 | self._next()
+        return bits >> (-k % 64)
+
+
+def play_common(game: Game, policies: Sequence[Policy], bot_seed: int, max_actions: int = MAX_ACTIONS) -> int:
+    """uno_policy.play_with, reseeding the bot stream before each decision from its decision point.
+
+    The point is (bot_seed, seat, decisions that seat has made), the same in
+    every arrangement of a deal; returns the number of actions. game.bot_rng
+    should be a DecisionRandom.
+    """
+    rng = game.bot_rng
+    decisions = [0] * len(policies)
+    actions = 0
+    while not game.game_over and actions < max_actions:
+        seat = game.acting_player()
+        rng.seed((bot_seed * len(policies) + seat) * max_actions + decisions[seat])
+        decisions[seat] += 1
+        game.apply_bot_decision(seat, policies[seat](game, seat))
+        actions += 1
+    return actions
+
+
+def evaluate_deal(seed: int, lineup: Sequence[str]) -> DealTotals:
+    """Play deal seed once per arrangement of lineup."""
+    deal = Deal.shuffled(seed)
+    bot_seed = random.Random(seed).getrandbits(64) ^ deal.recycle_seed
+    policies = {name: policy_by_name(name) for name in set(lineup)}
+    rounds: DealTotals = []
+    for seats in arrangements(lineup):
+        # Card stream is reseeded by setup(deal), bot stream at every decision
+        game = Game(rng=random.Random(0), bot_rng=DecisionRandom(0))
+        game.setup(deal)
+        play_common(game, [policies[name] for name in seats], bot_seed)
+        winner = game.winner_index if game.game_over else None
+        points = game.winner_points()
+        totals = {name: [0, 0, 0] for name in policies}
+        for seat, name in enumerate(seats):
+            agg = totals[name]
+            agg[0] += 1
+            if seat == winner:
+                agg[1] += 1
+                agg[2] += points
+        rounds.append({name: (n, w, p) for name, (n, w, p) in totals.items()})
+    return rounds
+
+
+def _evaluate_chunk(seeds: Sequence[int], lineup: Sequence[str]) -> List[DealTotals]:
+    return [evaluate_deal(seed, lineup) for seed in seeds]
+
+
+def run(lineup: Sequence[str], deals: int, base_seed: int = 0, workers: int = 1, chunk: int = 16) -> List[DealTotals]:
+    seeds = list(range(base_seed, base_seed + deals))
+    if workers <= 1:
+        return _evaluate_chunk(seeds, lineup)
+    chunks = [seeds[i:i + chunk] for i in range(0, len(seeds), chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [t for part in pool.map(_evaluate_chunk, chunks, itertools.repeat(lineup)) for t in part]
+
+
+def _mean_var(values: Sequence[float]) -> Tuple[float, float]:
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    return mean, var
+
+
+def compare(results: List[DealTotals], a: str, b: str, metric: str = "win") -> Dict[str, float]:
+    """Paired difference a - b per deal in win rate ('win') or points per seat-game ('points').
+
+    unpaired_se is the standard error the same number of rounds would give
+    on independent random deals: the spread of single-round differences.
+    """
+    k = 1 if metric == "win" else 2
+
+    def diff(rounds: List[RoundTotals]) -> float:
+        return (sum(r[a][k] for r in rounds) / sum(r[a][0] for r in rounds)
+                - sum(r[b][k] for r in rounds) / sum(r[b][0] for r in rounds))
+
+    mean, var = _mean_var([diff(deal) for deal in results])
+    paired_se = math.sqrt(var / len(results))
+    single = [diff([r]) for deal in results for r in deal]
+    unpaired_se = math.sqrt(_mean_var(single)[1] / len(single))
+    return {"mean": mean, "paired_se": paired_se, "unpaired_se": unpaired_se,
+            "low": mean - 1.96 * paired_se, "high": mean + 1.96 * paired_se,
+            "speedup": (unpaired_se / paired_se) ** 2 if paired_se else float("inf")}
+
+
+def report(results: List[DealTotals], lineup: Sequence[str]) -> str:
+    names = sorted(set(lineup), key=lineup.index)
+    lines = []
+    for name in names:
+        n = sum(r[name][0] for deal in results for r in deal)
+        w = sum(r[name][1] for deal in results for r in deal)
+        p = sum(r[name][2] for deal in results for r in deal)
+        lines.append(f"{name:>14}: win rate {w / n:.3%}, {p / n:.1f} pts/seat-game over {n} seat-games")
+    for a, b in itertools.combinations(names, 2):
+        for metric, unit in (("win", "win rate"), ("points", "pts/seat-game")):
+            c = compare(results, a, b, metric)
+            scale, fmt = (100.0, "{:+.2f} pp") if metric == "win" else (1.0, "{:+.2f}")
+            lines.append(
+                f"{a} - {b} {unit}: {fmt.format(c['mean'] * scale)} "
+                f"[{fmt.format(c['low'] * scale)}, {fmt.format(c['high'] * scale)}] 95% CI; "
+                f"paired SE {c['paired_se'] * scale:.3f} vs unpaired {c['unpaired_se'] * scale:.3f} "
+                f"(~{c['speedup']:.1f}x fewer rounds)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare bot policies on duplicate deals.")
+    parser.add_argument("--policies", default="Aggressive,Conservative",
+                        help=f"comma-separated, from: {', '.join(policy_names())}")
+    parser.add_argument("--lineup", help="seat lineup (4 names); defaults to the policies repeated")
+    parser.add_argument("--deals", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    policies = [p.strip() for p in args.policies.split(",") if p.strip()]
+    lineup = [p.strip() for p in args.lineup.split(",")] if args.lineup else [policies[i % len(policies)] for i in range(4)]
+    if len(lineup) != 4:
+        parser.error("the lineup needs exactly 4 seats")
+    for name in lineup:
+        try:
+            policy_by_name(name)
+        except ValueError as e:
+            parser.error(str(e))
+    start = time.perf_counter()
+    results = run(lineup, args.deals, args.seed, args.workers)
+    games = args.deals * len(arrangements(lineup))
+    elapsed = time.perf_counter() - start
+    print(f"{args.deals} deals x {len(arrangements(lineup))} arrangements = {games} rounds in {elapsed:.1f}s")
+    print(report(results, lineup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""Gym-style reinforcement-learning environments around Game.
+
+UnoEnv puts a learner in one seat; the other seats are played by the stock
+bot (or any uno_policy policy) until the learner must act again. Its API
+follows Gymnasium without depending on it: reset() -> (obs, info) and
+step(action) -> (obs, reward, terminated, truncated, info), with the legal
+action mask in info["action_mask"]. The reward is 1 when the learner wins
+the round and 0 otherwise. The learner never jumps in out of turn.
+
+Observations are OBS_SIZE floats:
+    [0:54)    own hand: count of each card kind (uno_logic.CARD_KINDS order)
+    [54:108)  top card, one-hot by kind
+    [108:112) effective color, one-hot (COLORS order)
+    [112:115) opponents' hand sizes, in seat order after the learner
+    115       direction (+1 / -1)
+    116       1 if a +4 waits for the learner to accept or challenge
+    117       cards the learner would take by accepting (+4 or stacked +2s)
+    118       1 if the learner drew this turn (play the drawn card or pass)
+
+Actions are N_ACTIONS integers:
+    [0:52)    play a colored card, by kind id
+    [52:56)   play Wild, choosing COLORS[a - 52]
+    [56:60)   play +4, choosing COLORS[a - 56]
+    60 draw, 61 pass, 62 accept (+4 or stacked +2s), 63 challenge +4
+    [64:68)   choose the starting color after a Wild starter
+
+VecEnv steps many environments at once. Environments are split over
+subprocess workers; observations, masks, rewards, done flags and actions
+live in one multiprocessing.shared_memory segment, so a step sends each
+worker a one-byte command and copies nothing else. Finished episodes reset
+automatically: the observation returned with done=1 is the first one of
+the next episode. NumPy, when installed, gives array views of the buffers;
+without it they are memoryviews.
+
+    python uno_env.py --envs 4096 --workers 8 --steps 50
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import time
+from array import array
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from uno_logic import CARD_KINDS, COLORS, Game, HouseRules
+from uno_policy import Policy
+from uno_shm import _attach
+from uno_sim import MAX_ACTIONS, Move, apply_move, legal_moves, new_game
+
+KINDS = len(CARD_KINDS)
+_KIND_IDS = {kind: i for i, kind in enumerate(CARD_KINDS)}
+_COLOR_IDS = {color: i for i, color in enumerate(COLORS)}
+WILD_BASE, PLUS4_BASE = KINDS - 2, KINDS + 2
+DRAW, PASS, ACCEPT, CHALLENGE = KINDS + 6, KINDS + 7, KINDS + 8, KINDS + 9
+COLOR_BASE = KINDS + 10
+N_ACTIONS = COLOR_BASE + len(COLORS)
+_SIMPLE = {"draw": DRAW, "pass": PASS, "accept": ACCEPT, "challenge": CHALLENGE}
+
+HAND, TOP, COLOR = 0, KINDS, 2 * KINDS
+OPPONENTS = COLOR + len(COLORS)
+DIRECTION, PLUS4, PENALTY, DREW = OPPONENTS + 3, OPPONENTS + 4, OPPONENTS + 5, OPPONENTS + 6
+OBS_SIZE = DREW + 1
+
+
+def observe(game: Game, seat: int) -> List[float]:
+    """The fixed-size observation of game for seat (see the module docstring)."""
+    obs = [0.0] * OBS_SIZE
+    ids = _KIND_IDS
+    for card in game.players[seat].hand:
+        obs[ids[card.color, card.value]] += 1.0
+    if game.discard_pile:
+        top = game.discard_pile[-1]
+        obs[TOP + ids[top.color, top.value]] = 1.0
+    if game.current_color is not None:
+        obs[COLOR + _COLOR_IDS[game.current_color]] = 1.0
+    n = len(game.players)
+    for k in range(1, n):
+        obs[OPPONENTS + k - 1] = float(len(game.players[(seat + k) % n].hand))
+    obs[DIRECTION] = float(game.direction)
+    p4 = game.pending_plus4
+    if p4 is not None and p4.target == seat:
+        obs[PLUS4] = 1.0
+        obs[PENALTY] = float(p4.penalty)
+    elif game.current_index == seat:
+        obs[PENALTY] = float(game.draw_stack)
+    obs[DREW] = 1.0 if game.drew_this_turn and game.current_index == seat else 0.0
+    return obs
+
+
+def observe_many(games: Sequence[Game], seats: Sequence[int]):
+    """observe() for many games as one float32 NumPy matrix (requires numpy).
+
+    Every non-zero entry is listed as a flat index with a weight and the
+    matrix is built by a single bincount, instead of one Python list per row.
+    """
+    import numpy as np
+    ids = _KIND_IDS
+    colors = _COLOR_IDS
+    index: List[int] = []
+    weight: List[float] = []
+    cards: List[int] = []  # flat indices of hand cards (weight 1, repeats add up)
+    for row, (game, seat) in enumerate(zip(games, seats)):
+        base = row * OBS_SIZE
+        cards.extend([base + ids[c.color, c.value] for c in game.players[seat].hand])
+        if game.discard_pile:
+            top = game.discard_pile[-1]
+            cards.append(base + TOP + ids[top.color, top.value])
+        if game.current_color is not None:
+            cards.append(base + COLOR + colors[game.current_color])
+        players = game.players
+        n = len(players)
+        for k in range(1, n):
+            index.append(base + OPPONENTS + k - 1)
+            weight.append(len(players[(seat + k) % n].hand))
+        index.append(base + DIRECTION)
+        weight.append(game.direction)
+        p4 = game.pending_plus4
+        if p4 is not None and p4.target == seat:
+            cards.append(base + PLUS4)
+            index.append(base + PENALTY)
+            weight.append(p4.penalty)
+        elif game.current_index == seat:
+            index.append(base + PENALTY)
+            weight.append(game.draw_stack)
+            if game.drew_this_turn:
+                cards.append(base + DREW)
+    size = len(games) * OBS_SIZE
+    obs = np.bincount(cards, minlength=size).astype(np.float32)
+    obs += np.bincount(index, weight, minlength=size).astype(np.float32)
+    return obs.reshape(len(games), OBS_SIZE)
+
+
+def move_to_action(game: Game, seat: int, move: Move) -> int:
+    action, index, color = move
+    if action == "play":
+        card = game.players[seat].hand[index]
+        kind = _KIND_IDS[card.color, card.value]
+        if card.value == "Wild":
+            return WILD_BASE + _COLOR_IDS[color]
+        if card.value == "+4":
+            return PLUS4_BASE + _COLOR_IDS[color]
+        return kind
+    if action == "color":
+        return COLOR_BASE + _COLOR_IDS[color]
+    return _SIMPLE[action]
+
+
+def legal_actions(game: Game, seat: int) -> Dict[int, Move]:
+    """Legal action ids for seat, each with one legal_moves() entry it stands for.
+
+    Cards of the same kind are interchangeable, so an action plays the first
+    such card in the hand.
+    """
+    actions: Dict[int, Move] = {}
+    for move in legal_moves(game, seat):
+        actions.setdefault(move_to_action(game, seat, move), move)
+    return actions
+
+
+def action_mask(game: Game, seat: int) -> bytearray:
+    mask = bytearray(N_ACTIONS)
+    for a in legal_actions(game, seat):
+        mask[a] = 1
+    return mask
+
+
+class UnoEnv:
+    """One round at a time, from the learner's seat; other seats are played by opponent (default: the stock bot)."""
+
+    def __init__(self, seat: int = 0, seed: Optional[int] = None, rules: Optional[HouseRules] = None,
+                 opponent: Optional[Policy] = None, max_actions: int = MAX_ACTIONS) -> None:
+        self.seat = seat
+        self.rules = rules
+        self.opponent = opponent
+        self.max_actions = max_actions
+        self._seeds = random.Random(seed)
+        self.game: Optional[Game] = None
+        self._legal: Dict[int, Move] = {}
+        self._actions = 0
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[List[float], Dict[str, Any]]:
+        self.game = new_game(seed if seed is not None else self._seeds.getrandbits(64), self.rules)
+        self._actions = 0
+        self._advance()
+        return self._observation()
+
+    def step(self, action: int) -> Tuple[List[float], float, bool, bool, Dict[str, Any]]:
+        move = self._legal.get(action)
+        if move is None or self.game is None or self.game.game_over:
+            raise ValueError(f"Action {action} is not legal here")
+        apply_move(self.game, self.seat, move)
+        self._actions += 1
+        self._advance()
+        game = self.game
+        terminated = game.game_over
+        truncated = not terminated and self._actions >= self.max_actions
+        reward = 1.0 if terminated and game.winner_index == self.seat else 0.0
+        obs, info = self._observation()
+        return obs, reward, terminated, truncated, info
+
+    def _advance(self) -> None:
+        # Bots act (and jump in, but never for the learner) until the learner is asked
+        game, seat = self.game, self.seat
+        while not game.game_over and self._actions < self.max_actions:
+            candidate = game.jump_in_candidate()
+            if candidate is not None and candidate[0] != seat:
+                game.play_card(*candidate)
+            else:
+                acting = game.acting_player()
+                if acting == seat:
+                    break
+                if self.opponent is None:
+                    game.bot_act(acting)
+                else:
+                    game.apply_bot_decision(acting, self.opponent(game, acting))
+            self._actions += 1
+        self._legal = legal_actions(game, seat) if not game.game_over else {}
+
+    def _observation(self) -> Tuple[List[float], Dict[str, Any]]:
+        mask = bytearray(N_ACTIONS)
+        for a in self._legal:
+            mask[a] = 1
+        return observe(self.game, self.seat), {"action_mask": mask}
+
+    @property
+    def done(self) -> bool:
+        return self.game is None or self.game.game_over or self._actions >= self.max_actions
+
+
+# --- Batched environments over shared memory ---
+# Per environment: OBS_SIZE float32 observation, N_ACTIONS mask bytes, float32 reward,
+# done byte, int32 action. Arrays are stored one after the other, each 8-byte aligned.
+def _layout(num_envs: int) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    sizes = [("obs", 4 * OBS_SIZE), ("rewards", 4), ("actions", 4), ("masks", N_ACTIONS), ("dones", 1)]
+    offsets, pos = {}, 0
+    for name, item in sizes:
+        offsets[name] = (pos, item * num_envs)
+        pos += -(-item * num_envs // 8) * 8
+    return offsets, pos
+
+
+def _views(buf, num_envs: int) -> Dict[str, memoryview]:
+    offsets, _ = _layout(num_envs)
+    formats = {"obs": "f", "rewards": "f", "actions": "i", "masks": "B", "dones": "B"}
+    return {name: memoryview(buf)[start:start + size].cast(formats[name]) for name, (start, size) in offsets.items()}
+
+
+class _EnvBlock:
+    """Environments [start, stop) of a batch, writing into the shared buffers."""
+
+    def __init__(self, views: Dict[str, memoryview], start: int, stop: int, seed: int, seat: int,
+                 rules: Optional[HouseRules], opponent: Optional[Policy]) -> None:
+        self.views = views
+        self.start = start
+        self.envs = [UnoEnv(seat, seed + i, rules, opponent) for i in range(start, stop)]
+
+    def _write(self, i: int, obs: List[float], mask: bytearray, reward: float, done: bool) -> None:
+        v = self.views
+        v["obs"][i * OBS_SIZE:(i + 1) * OBS_SIZE] = array("f", obs)
+        v["masks"][i * N_ACTIONS:(i + 1) * N_ACTIONS] = mask
+        v["rewards"][i] = reward
+        v["dones"][i] = done
+
+    def reset(self) -> None:
+        for i, env in enumerate(self.envs, self.start):
+            obs, info = env.reset()
+            self._write(i, obs, info["action_mask"], 0.0, False)
+
+    def step(self) -> None:
+        actions = self.views["actions"]
+        for i, env in enumerate(self.envs, self.start):
+            obs, reward, terminated, truncated, info = env.step(actions[i])
+            done = terminated or truncated
+            if done:
+                obs, info = env.reset()
+            self._write(i, obs, info["action_mask"], reward, done)
+
+
+def _worker(conn, name: str, num_envs: int, start: int, stop: int, seed: int, seat: int,
+            rules: Optional[HouseRules], opponent: Optional[Policy]) -> None:
+    shm = _attach(name)
+    views = _views(shm.buf, num_envs)
+    block = _EnvBlock(views, start, stop, seed, seat, rules, opponent)
+    try:
+        while True:
+            cmd = conn.recv_bytes()
+            try:
+                if cmd == b"s":
+                    block.step()
+                elif cmd == b"r":
+                    block.reset()
+                else:
+                    break
+            except ValueError as e:
+                # Report and keep serving; the caller may retry with legal actions
+                conn.send_bytes(f"e{e}".encode())
+                continue
+            conn.send_bytes(b"k")
+    finally:
+        for view in views.values():
+            view.release()
+        shm.close()
+
+
+class VecEnv:
+    """num_envs UnoEnvs stepped together, over workers subprocesses (0: in this process).
+
+    reset() -> (obs, masks); step(actions) -> (obs, rewards, dones, masks).
+    The returned arrays are views of the shared buffers and are overwritten
+    by the next call; obs is num_envs x OBS_SIZE when NumPy is available.
+    An illegal action makes step() raise ValueError with no environment moved.
+    """
+
+    def __init__(self, num_envs: int, workers: int = 0, seed: int = 0, seat: int = 0,
+                 rules: Optional[HouseRules] = None, opponent: Optional[Policy] = None,
+                 use_numpy: Optional[bool] = None) -> None:
+        self.num_envs = num_envs
+        self._procs: List[mp.Process] = []
+        self._conns = []
+        self._block: Optional[_EnvBlock] = None
+        size = _layout(num_envs)[1]
+        if workers > 0:
+            self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(create=True, size=size)
+            buf = self._shm.buf
+        else:
+            self._shm = None
+            buf = bytearray(size)
+        self._views = _views(buf, num_envs)
+        if workers > 0:
+            bounds = [num_envs * w // workers for w in range(workers + 1)]
+            for start, stop in zip(bounds, bounds[1:]):
+                parent, child = mp.Pipe()
+                p = mp.Process(target=_worker, args=(child, self._shm.name, num_envs, start, stop, seed, seat, rules,
+                                                     opponent), daemon=True)
+                p.start()
+                self._procs.append(p)
+                self._conns.append(parent)
+        else:
+            self._block = _EnvBlock(self._views, 0, num_envs, seed, seat, rules, opponent)
+        self._arrays = self._wrap(use_numpy)
+
+    def _wrap(self, use_numpy: Optional[bool]) -> Dict[str, Any]:
+        if use_numpy is not False:
+            try:
+                import numpy as np
+            except ImportError:
+                if use_numpy:
+                    raise
+            else:
+                arrays = {name: np.asarray(view) for name, view in self._views.items()}
+                arrays["obs"] = arrays["obs"].reshape(self.num_envs, OBS_SIZE)
+                arrays["masks"] = arrays["masks"].reshape(self.num_envs, N_ACTIONS).view(bool)
+                arrays["dones"] = arrays["dones"].view(bool)
+                return arrays
+        return dict(self._views)
+
+    def _run(self, cmd: bytes) -> None:
+        if self._block is not None:
+            if cmd == b"r":
+                self._block.reset()
+            else:
+                self._block.step()
+            return
+        for conn in self._conns:
+            conn.send_bytes(cmd)
+        # Read every reply before raising, so none is left queued for the next call
+        errors = [reply[1:].decode() for reply in [conn.recv_bytes() for conn in self._conns] if reply != b"k"]
+        if errors:
+            raise ValueError("; ".join(errors))
+
+    def reset(self) -> Tuple[Any, Any]:
+        self._run(b"r")
+        return self._arrays["obs"], self._arrays["masks"]
+
+    def step(self, actions: Sequence[int]) -> Tuple[Any, Any, Any, Any]:
+        # Checked against the masks up front, so an illegal action leaves every environment as it was
+        masks = self._views["masks"]
+        for i, a in enumerate(actions):
+            if not 0 <= a < N_ACTIONS or not masks[i * N_ACTIONS + a]:
+                raise ValueError(f"Environment {i}: action {a} is not legal here")
+        self._views["actions"][:] = array("i", actions)
+        self._run(b"s")
+        a = self._arrays
+        return a["obs"], a["rewards"], a["dones"], a["masks"]
+
+    def close(self) -> None:
+        """Stop the workers and free the buffers; drop the arrays from step() first."""
+        for conn in self._conns:
+            try:
+                conn.send_bytes(b"q")
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self._procs:
+            p.join(timeout=1.0)
+        self._arrays = {}
+        try:
+            for view in self._views.values():
+                view.release()
+            if self._shm is not None:
+                self._shm.close()
+        except BufferError:
+            # The caller still holds arrays from step(); the mapping goes with them
+            pass
+        self._views = {}
+        if self._shm is not None:
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> VecEnv:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def random_actions(masks, rng: random.Random) -> List[int]:
+    """A uniformly random legal action per environment (masks as returned by VecEnv)."""
+    if getattr(masks, "ndim", 1) == 2:
+        rows = masks.tolist()
+    else:
+        flat = list(masks)
+        rows = [flat[i:i + N_ACTIONS] for i in range(0, len(flat), N_ACTIONS)]
+    return [rng.choice([a for a, ok in enumerate(row) if ok]) for row in rows]
+
+
+def _random_play(env: VecEnv, steps: int, rng: random.Random) -> Tuple[int, int]:
+    # The step() arrays go out of scope here, before the buffers are closed
+    obs, masks = env.reset()
+    episodes = wins = 0
+    for _ in range(steps):
+        obs, rewards, dones, masks = env.step(random_actions(masks, rng))
+        episodes += sum(dones)
+        wins += sum(1 for r in rewards if r > 0)
+    return episodes, wins
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Step batched UNO environments with random legal actions.")
+    parser.add_argument("--envs", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 steps in this process")
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with VecEnv(args.envs, args.workers, seed=args.seed) as env:
+        start = time.perf_counter()
+        episodes, wins = _random_play(env, args.steps, random.Random(args.seed))
+        elapsed = time.perf_counter() - start
+    steps = args.envs * args.steps
+    print(f"{steps} env steps in {elapsed:.2f}s ({steps / elapsed:.0f} steps/s, {args.workers} workers); "
+          f"{episodes} episodes finished, learner won {wins}")
+
+
+if __name__ == "__main__":
+    main()
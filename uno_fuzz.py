@@ -0,0 +1,467 @@
+"""Invariant fuzzer for the rules engine.
+
+Every fuzzed round deals a seeded Game, under a house-rule combination
+derived from the seed unless --rules fixes one, and drives it with random
+legal actions: any uno_sim.legal_moves entry of the seat that must act, a
+jump-in by another seat or, as one more option, a bot step. The GUI path
+(uno_sim.apply_move) and the bot path (Game.apply_bot_decision) are both
+exercised. After every step the game is checked for:
+
+    cards    hands, deck and discard hold 108 cards, plus 107 for each fresh
+             deck draw_cards built while every card was in a hand
+    options  the seat that must act has at least one legal move
+    plus4    a pending +4 is judged against the color in effect before it,
+             targets the next seat, and its resolution moves the right cards
+    cache    allowed_moves (cached per Game.version) of the seat to act
+             matches a recomputation
+    state    color, draw stack, turn and winner fields are consistent
+
+The costlier checks run every FULL_CHECK_EVERY steps and when the round
+ends: every card is a distinct instance within the copies per kind the decks
+allow, the cache holds for every seat, and the probes below try every card
+and seat instead of one of each. Replays and shrinking (which pass
+the choices) run them after every step, so a failure found by a sampled
+check is pinned to the step that caused it.
+
+Before every step, illegal calls probe the checks: can_play_card must agree
+with allowed_moves for the acting seat, and play_card or draw_one_action by
+seats that may not act must be refused without touching the game.
+
+A failing round is shrunk to the shortest list of choices that still breaks
+the same invariant and written as a move log line, which `uno_cli.py replay`
+also reads:
+
+    python uno_fuzz.py --rounds 100000 --workers 8
+    python uno_fuzz.py --rounds 20000 --rules stacking,jump_in --out failures.jsonl
+    python uno_fuzz.py --replay failures.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from uno_logic import COLORS, Deck, Game, HouseRules
+from uno_sim import Move, apply_move, bot_step, legal_moves, new_game
+
+# The full deck, and how many of each card it holds
+DECK_SIZE = 108
+# Share of steps left to the bot: uniformly random play alone draws so often that rounds
+# run for thousands of steps, while bot steps finish them in the usual fifty or so
+BOT_SHARE = 0.5
+# Steps fuzzed per round at most; longer rounds only repeat positions already covered
+MAX_STEPS = 1000
+# Steps between the full card and cache checks; the cheap invariants run after every step
+FULL_CHECK_EVERY = 16
+_KIND_COUNTS = Counter((c.color, c.value) for c in Deck(random.Random(0)).cards)
+# Every new deck holds the same shared instances (Deck._build_deck), so a game still
+# holding exactly those cards needs no count per kind
+_SHARED_IDS = frozenset(map(id, Deck(random.Random(0)).cards))
+
+
+class InvariantError(Exception):
+    def __init__(self, invariant: str, message: str) -> None:
+        super().__init__(f"{invariant}: {message}")
+        self.invariant = invariant
+        self.message = message
+
+
+class Failure(NamedTuple):
+    seed: int
+    rules: Tuple[str, ...]
+    step: int  # steps taken, the failing one included
+    invariant: str
+    message: str
+    choices: Tuple[int, ...]  # option index chosen at each step
+    moves: Tuple[Tuple[int, Move], ...]  # the same steps as (seat, move), bot steps expanded
+
+    def record(self) -> dict:
+        """A move log line (see uno_cli.py) carrying the failure; no winner, so replay does not compare one."""
+        return {"seed": self.seed, "rules": list(self.rules), "invariant": self.invariant,
+                "message": self.message, "choices": list(self.choices),
+                "moves": [[seat, *move] for seat, move in self.moves]}
+
+
+def _fail(invariant: str, message: str) -> None:
+    raise InvariantError(invariant, message)
+
+
+def rules_for_seed(seed: int) -> HouseRules:
+    """The house-rule combination a seed is fuzzed under when none is fixed: all of them in turn."""
+    return HouseRules.from_mask(seed % (1 << len(HouseRules.NAMES)))
+
+
+def options(game: Game) -> List[Tuple[int, Optional[Move]]]:
+    """Everything that may happen next: the acting seat's legal moves, jump-ins, then a bot step (move None)."""
+    seat = game.acting_player()
+    opts: List[Tuple[int, Optional[Move]]] = [(seat, m) for m in legal_moves(game, seat)]
+    if game.rules.jump_in:
+        for other in range(game.num_players):
+            if other != seat:
+                opts.extend((other, m) for m in legal_moves(game, other))
+    opts.append((seat, None))
+    return opts
+
+
+# --- Invariants ---
+def _card_total(game: Game) -> int:
+    """Fresh decks draw_cards built so far, from the number of cards in play; fails on a count no deal gives."""
+    n = len(game.deck.cards) + len(game.discard_pile)
+    for p in game.players:
+        n += len(p.hand)
+    extra, rest = divmod(n - DECK_SIZE, DECK_SIZE - 1)
+    if extra < 0 or rest:
+        _fail("cards", f"{n} cards in play")
+    return extra
+
+
+def check_cards(game: Game) -> None:
+    extra = _card_total(game)
+    cards = [c for p in game.players for c in p.hand] + game.deck.cards + game.discard_pile
+    ids = set(map(id, cards))
+    if len(ids) != len(cards):
+        _fail("cards", "a card instance is in two places")
+    if ids == _SHARED_IDS:
+        return
+    for kind, n in Counter(zip([c.color for c in cards], [c.value for c in cards])).items():
+        if n > _KIND_COUNTS[kind] * (extra + 1):
+            _fail("cards", f"{n} copies of {kind} with {extra} fresh decks")
+
+
+def check_state(game: Game, full: bool = True) -> None:
+    """Invariants of a single position; without full, only the card count and the acting seat's cache."""
+    if full:
+        check_cards(game)
+    else:
+        _card_total(game)
+    for seat in range(game.num_players) if full else (game.current_index,):
+        cached, fresh = game.allowed_moves(seat), game._allowed_moves(seat)
+        if len(cached) != len(fresh) or any(a is not b for a, b in zip(cached, fresh)):
+            _fail("cache", f"allowed_moves({seat}) is stale at version {game.version}")
+    if game.game_over:
+        if game.winner_index is None or game.players[game.winner_index].hand:
+            _fail("state", f"round over with winner {game.winner_index!r} still holding cards")
+        if game.pending_plus4 is not None:
+            _fail("plus4", "round over with a +4 pending")
+        return
+    if game.pending_initial_wild_for is not None:
+        if game.current_color is not None or game.pending_plus4 is not None:
+            _fail("state", "starting color pending with a color or +4 set")
+    elif game.current_color not in COLORS:
+        _fail("state", f"color in effect is {game.current_color!r}")
+    if game.draw_stack < 0 or game.draw_stack % 2 or (game.draw_stack and not game.rules.stacking):
+        _fail("state", f"draw stack of {game.draw_stack}")
+    p4 = game.pending_plus4
+    if p4 is not None:
+        if p4.target != game.current_index or p4.target == p4.played_by:
+            _fail("plus4", f"+4 by {p4.played_by} targets {p4.target}, turn is {game.current_index}")
+        if p4.penalty < 4 or p4.penalty % 4 or (p4.penalty > 4 and not game.rules.stacking):
+            _fail("plus4", f"+4 penalty of {p4.penalty}")
+        if p4.prev_color not in COLORS:
+            _fail("plus4", f"+4 judged against color {p4.prev_color!r}")
+        if game.draw_stack or game.drew_this_turn:
+            _fail("plus4", "+4 pending with a draw stack or a draw this turn")
+
+
+class _Before(NamedTuple):
+    version: int
+    sizes: List[int]
+    color: Optional[str]
+    seat: int  # the seat taking the step
+    had_color: bool  # that seat holds a card of color
+    plus4: object  # the PendingPlus4 instance, or None
+    challenges: int
+    challenges_won: int
+    direction: int
+
+
+def _before(game: Game, seat: int) -> _Before:
+    color = game.effective_color() if game.discard_pile else None
+    return _Before(game.version, [len(p.hand) for p in game.players], color, seat,
+                   game.player_has_color(seat, color), game.pending_plus4,
+                   game.plus4_challenges, game.plus4_challenges_won, game.direction)
+
+
+def check_step(game: Game, before: _Before, action: str) -> None:
+    """Invariants of one step from before; action is the first move the step made."""
+    if game.version == before.version:
+        _fail("state", f"{action} did not bump Game.version")
+    p4, old = game.pending_plus4, before.plus4
+    if p4 is not None and p4 is not old:
+        by = p4.played_by
+        if by != before.seat:
+            _fail("plus4", f"+4 by {by} during a step of seat {before.seat}")
+        if p4.prev_color != before.color:
+            _fail("plus4", f"+4 by {by} judged against {p4.prev_color!r}, {before.color!r} was in effect")
+        if p4.was_legal == before.had_color:
+            _fail("plus4", f"+4 by {by} judged {'legal' if p4.was_legal else 'illegal'} "
+                           f"(held {before.color}: {before.had_color})")
+        if p4.target != (by + game.direction) % game.num_players:
+            _fail("plus4", f"+4 by {by} targets {p4.target}")
+        if p4.penalty != (old.penalty if old is not None else 0) + 4:
+            _fail("plus4", f"+4 penalty {p4.penalty} after {old.penalty if old is not None else 0}")
+    if old is not None and p4 is None and action in ("accept", "challenge"):
+        sizes = [len(p.hand) for p in game.players]
+        expected = list(before.sizes)
+        challenged = action == "challenge"
+        if challenged and not old.was_legal:
+            expected[old.played_by] += old.penalty
+        else:
+            expected[old.target] += old.penalty + 2 * challenged
+        if sizes != expected:
+            _fail("plus4", f"{action} of a {'legal' if old.was_legal else 'illegal'} +4 left hands {sizes}, "
+                           f"expected {expected}")
+        if (game.plus4_challenges - before.challenges != challenged
+                or game.plus4_challenges_won - before.challenges_won != (challenged and not old.was_legal)):
+            _fail("plus4", f"challenge counters moved wrongly on {action}")
+
+
+# --- Illegal-call probes ---
+def _refused(game: Game, what: str, result: Tuple, version: int, seat: int, size: int) -> None:
+    if result[0]:
+        _fail("probe", f"{what} was accepted")
+    if game.version != version or len(game.players[seat].hand) != size:
+        _fail("probe", f"refused {what} changed the game")
+
+
+def probe(game: Game, step: int, full: bool = True) -> None:
+    """Illegal calls that must be refused without side effects; step varies the cards tried.
+
+    Without full, can_play_card is checked for one card of the acting seat
+    and out-of-turn calls are made by one other seat, both chosen by step.
+    """
+    seat = game.acting_player()
+    allowed = set(map(id, game.allowed_moves(seat)))
+    hand = game.players[seat].hand
+    for card in hand if full or not hand else (hand[step % len(hand)],):
+        ok, err = game.can_play_card(seat, card)
+        if ok != (id(card) in allowed):
+            _fail("probe", f"can_play_card({seat}, {card.display()}) is {ok} ({err}), "
+                           f"allowed_moves {'has' if ok is False else 'lacks'} it")
+    version = game.version
+    if not game.can_draw(seat)[0]:
+        _refused(game, f"draw by acting seat {seat}", game.draw_one_action(seat), version, seat, len(hand))
+    illegal, wild = [], None
+    for card in hand:
+        if id(card) not in allowed:
+            illegal.append(card)
+        elif wild is None and card.is_wild():
+            wild = card
+    if illegal:
+        card = illegal[step % len(illegal)]
+        if not game.can_jump_in(seat, card):
+            _refused(game, f"play of {card.display()} by seat {seat}",
+                     game.play_card(seat, card, COLORS[step % len(COLORS)] if card.is_wild() else None),
+                     version, seat, len(hand))
+    if wild is not None:
+        _refused(game, f"{wild.display()} without a color by seat {seat}",
+                 game.play_card(seat, wild, None), version, seat, len(hand))
+    others = [i for i in range(game.num_players) if i != seat]
+    for other in others if full else (others[step % len(others)],):
+        if game.can_pass(other)[0]:
+            _fail("probe", f"seat {other} may pass while seat {seat} must act")
+        cards = game.players[other].hand
+        _refused(game, f"draw by seat {other}", game.draw_one_action(other), version, other, len(cards))
+        if cards:
+            card = cards[step % len(cards)]
+            if not game.can_jump_in(other, card):
+                _refused(game, f"play of {card.display()} by seat {other} out of turn",
+                         game.play_card(other, card, COLORS[0] if card.is_wild() else None),
+                         version, other, len(cards))
+
+
+# --- Rounds ---
+def fuzz_round(seed: int, rules: Optional[HouseRules] = None, choices: Optional[Sequence[int]] = None,
+               max_steps: int = MAX_STEPS, probes: bool = True,
+               full_every: int = FULL_CHECK_EVERY) -> Tuple[int, Optional[Failure]]:
+    """Fuzz one round; returns (steps taken, first failure or None).
+
+    With choices, step i takes option choices[i] (modulo the number of
+    options), the round stops when they run out and every step gets the full
+    checks; otherwise the bot steps with probability BOT_SHARE and any other
+    option is drawn uniformly, from a stream seeded by seed, and the full
+    checks run every full_every steps and at the end.
+    """
+    if choices is not None:
+        full_every = 1
+    rules = rules if rules is not None else rules_for_seed(seed)
+    pick = random.Random(seed)
+    made: List[int] = []
+    log: List[Tuple[int, Move]] = []
+    step = 0
+    try:
+        game = new_game(seed, rules)
+        check_state(game)
+        while not game.game_over and step < max_steps:
+            if choices is not None and step >= len(choices):
+                break
+            opts = options(game)
+            if opts[0][1] is None or opts[0][0] != game.acting_player():
+                _fail("options", f"seat {game.acting_player()} must act but has no legal move")
+            if choices is not None:
+                choice = choices[step] % len(opts)
+            else:
+                choice = len(opts) - 1 if pick.random() < BOT_SHARE else pick.randrange(len(opts) - 1)
+            made.append(choice)
+            step += 1
+            if probes:
+                probe(game, step, step % full_every == 0)
+            seat, move = opts[choice]
+            before = _before(game, seat)
+            if move is None:
+                entries = bot_step(game)
+            else:
+                apply_move(game, seat, move)
+                entries = [(seat, move)]
+            log.extend(entries)
+            check_step(game, before, entries[0][1][0])
+            check_state(game, step % full_every == 0)
+        if step % full_every:
+            check_state(game)
+    except InvariantError as e:
+        return step, Failure(seed, tuple(rules.names()), step, e.invariant, e.message, tuple(made), tuple(log))
+    except Exception as e:  # the engine itself broke
+        return step, Failure(seed, tuple(rules.names()), step, "crash", repr(e), tuple(made), tuple(log))
+    return step, None
+
+
+def shrink(failure: Failure, probes: bool = True, max_runs: int = 2000) -> Failure:
+    """The shortest, smallest choice list found that still breaks failure's invariant.
+
+    Removes runs of choices (halving the run length down to single steps),
+    then lowers each remaining choice, and repeats until nothing helps.
+    """
+    rules = HouseRules.from_names(failure.rules)
+    runs = 0
+
+    def attempt(choices: Sequence[int]) -> Optional[Failure]:
+        nonlocal runs
+        runs += 1
+        _, found = fuzz_round(failure.seed, rules, choices, probes=probes)
+        return found if found is not None and found.invariant == failure.invariant else None
+
+    best = failure
+    improved = True
+    while improved and runs < max_runs:
+        improved = False
+        size = len(best.choices) // 2
+        while size >= 1 and runs < max_runs:
+            i = 0
+            while i < len(best.choices) and runs < max_runs:
+                found = attempt(best.choices[:i] + best.choices[i + size:])
+                if found is not None:
+                    best, improved = found, True
+                else:
+                    i += size
+            size //= 2
+        i = 0
+        while i < len(best.choices) and runs < max_runs:
+            # A success may also shorten the list, so re-read it every time
+            current = best.choices[i]
+            for value in sorted({0, current // 2, current - 1} - {current}):
+                if value < 0:
+                    continue
+                found = attempt(best.choices[:i] + (value,) + best.choices[i + 1:])
+                if found is not None:
+                    best, improved = found, True
+                    break
+            i += 1
+    return best
+
+
+def fuzz_chunk(start: int, stop: int, rules: Optional[HouseRules] = None, probes: bool = True,
+               max_failures: int = 5, full_every: int = FULL_CHECK_EVERY) -> Tuple[int, int, List[Failure]]:
+    """Fuzz rounds start..stop-1; returns (rounds, steps, shrunk failures), at most max_failures of them."""
+    steps = 0
+    failures: List[Failure] = []
+    for seed in range(start, stop):
+        taken, failure = fuzz_round(seed, rules, probes=probes, full_every=full_every)
+        steps += taken
+        if failure is not None and len(failures) < max_failures:
+            failures.append(shrink(failure, probes))
+    return stop - start, steps, failures
+
+
+def fuzz(rounds: int, workers: int = 1, base_seed: int = 0, rules: Optional[HouseRules] = None,
+         probes: bool = True, chunk: int = 500, max_failures: int = 5,
+         full_every: int = FULL_CHECK_EVERY) -> Tuple[int, List[Failure]]:
+    """Fuzz seeded rounds on a process pool; returns (total steps, shrunk failures)."""
+    chunks = [(s, min(s + chunk, base_seed + rounds)) for s in range(base_seed, base_seed + rounds, chunk)]
+    steps = 0
+    failures: List[Failure] = []
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(fuzz_chunk, start, stop, rules, probes, max_failures, full_every)
+                   for start, stop in chunks]
+        for fut in futures:
+            _, taken, found = fut.result()
+            steps += taken
+            failures.extend(found)
+    return steps, failures
+
+
+def replay_failures(path: str, probes: bool = True) -> int:
+    """Re-run every failure in a log; returns how many still fail."""
+    still = 0
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            rules = HouseRules.from_names(record.get("rules", ()))
+            _, failure = fuzz_round(record["seed"], rules, record["choices"], probes=probes)
+            if failure is None:
+                print(f"seed {record['seed']}: passes now ({record['invariant']}: {record['message']})")
+            else:
+                still += 1
+                print(f"seed {record['seed']}: {failure.invariant} after {failure.step} steps: {failure.message}")
+    return still
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fuzz the rules engine with random legal play and invariant checks.")
+    parser.add_argument("--rounds", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=500, help="rounds per worker task")
+    parser.add_argument("--rules", help="comma-separated house rules for every round (default: vary by seed)")
+    parser.add_argument("--no-probes", dest="probes", action="store_false", help="skip the illegal-call probes")
+    parser.add_argument("--full-every", type=int, default=FULL_CHECK_EVERY,
+                        help="steps between the full card and cache checks (1: every step)")
+    parser.add_argument("--max-failures", type=int, default=5, help="failures shrunk per worker task")
+    parser.add_argument("--out", default="fuzz_failures.jsonl", help="where shrunk failures are written")
+    parser.add_argument("--replay", metavar="LOG", help="re-check the failures in a log instead of fuzzing")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        return 1 if replay_failures(args.replay, args.probes) else 0
+    rules = (HouseRules.from_names(n.strip() for n in args.rules.split(",") if n.strip())
+             if args.rules is not None else None)
+    start = time.perf_counter()
+    steps, failures = fuzz(args.rounds, args.workers, args.seed, rules, args.probes, args.chunk, args.max_failures,
+                           args.full_every)
+    elapsed = time.perf_counter() - start
+    rate = args.rounds / elapsed
+    print(f"{args.rounds} rounds, {steps} steps in {elapsed:.1f}s: {rate:.0f} rounds/s "
+          f"({rate * 3600 / 1e6:.2f}M per hour), {steps / elapsed:.0f} steps/s "
+          f"over {args.workers} workers ({rate / args.workers:.0f} rounds/s each)")
+    if not failures:
+        print("no invariant broken")
+        return 0
+    by_invariant: Dict[str, int] = Counter(f.invariant for f in failures)
+    print("failures: " + ", ".join(f"{name}={n}" for name, n in sorted(by_invariant.items())))
+    with open(args.out, "w") as f:
+        for failure in failures:
+            print(f"  seed {failure.seed} {list(failure.rules)}: {failure.invariant} after "
+                  f"{failure.step} steps: {failure.message}")
+            json.dump(failure.record(), f, separators=(",", ":"))
+            f.write("\n")
+    print(f"shrunk replays written to {args.out}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
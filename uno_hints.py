@@ -0,0 +1,124 @@
+"""Background move hints for the human seat.
+
+HintEngine estimates, for each legal move of a seat, the probability that
+the seat goes on to win the round. Estimates come from determinized rollouts
+(uno_sim.rollout_wins) run in small batches on a process pool. Batches are
+handed out round-robin over the moves, so every estimate refines
+progressively. The owner polls with poll(), which never waits; start() or
+cancel() drop all outstanding work immediately. A batch that raised stops
+the estimate and poll() re-raises its exception.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import random
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from uno_logic import Game
+from uno_sim import Move, legal_moves, rollout_wins
+
+BATCH = 8
+
+
+class HintEngine:
+    def __init__(self, workers: Optional[int] = None, max_rollouts: int = 400) -> None:
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_rollouts = max_rollouts
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._rng = random.Random()
+        self._state: Optional[bytes] = None
+        self._seat = 0
+        self._moves: List[Move] = []
+        self._next = 0
+        self._inflight: Dict[Future, Move] = {}
+        # move -> [wins, rollouts]
+        self.results: Dict[Move, List[int]] = {}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: workers must not inherit the Tk process
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"))
+        return self._pool
+
+    @property
+    def running(self) -> bool:
+        return self._state is not None
+
+    def start(self, game: Game, seat: int = 0) -> None:
+        """Cancel any previous work and start estimating seat's moves in game."""
+        self.cancel()
+        moves = legal_moves(game, seat)
+        if len(moves) < 2:
+            return
+        # ~150 bytes per submitted batch instead of a pickled Game or state dict
+        self._state = game.to_bytes()
+        self._seat = seat
+        self._moves = moves
+        self._next = 0
+        self.results = {m: [0, 0] for m in moves}
+        self._top_up()
+
+    def cancel(self) -> None:
+        for fut in self._inflight:
+            fut.cancel()
+        self._inflight = {}
+        self._state = None
+        self.results = {}
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _top_up(self) -> None:
+        budget = self.max_rollouts * len(self._moves)
+        queued = sum(n for _, n in self.results.values()) + BATCH * len(self._inflight)
+        while len(self._inflight) < self.workers * 2 and queued < budget:
+            move = self._moves[self._next % len(self._moves)]
+            self._next += 1
+            fut = self._executor().submit(rollout_wins, self._state, self._seat, move, BATCH,
+                                          self._rng.getrandbits(64))
+            self._inflight[fut] = move
+            queued += BATCH
+
+    def poll(self) -> bool:
+        """Collect finished batches and queue more; returns True if any estimate changed.
+
+        Raises the exception of a batch that failed, after cancelling the rest.
+        """
+        if self._state is None:
+            return False
+        changed = False
+        for fut in [f for f in self._inflight if f.done()]:
+            move = self._inflight.pop(fut)
+            if fut.cancelled():
+                continue
+            exc = fut.exception()
+            if exc is not None:
+                self.cancel()
+                raise exc
+            agg = self.results[move]
+            agg[0] += fut.result()
+            agg[1] += BATCH
+            changed = True
+        self._top_up()
+        if not self._inflight:
+            # Budget exhausted: keep the results, stop polling
+            self._state = None
+        return changed
+
+    def estimate(self, move: Move) -> Optional[float]:
+        wins, n = self.results.get(move, (0, 0))
+        return wins / n if n else None
+
+    def best_for_card(self, index: int) -> Optional[Tuple[float, Optional[str]]]:
+        """Best (win probability, Wild color) among the moves that play hand card index."""
+        best = None
+        for move, (wins, n) in self.results.items():
+            if move[0] == "play" and move[1] == index and n:
+                if best is None or wins / n > best[0]:
+                    best = (wins / n, move[2])
+        return best
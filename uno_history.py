@@ -0,0 +1,248 @@
+"""Persistent match history backed by SQLite.
+
+Stores matches, rounds and per-seat results. Writes are buffered and flushed
+in batches inside one transaction; the database runs in WAL mode so readers
+(dashboards, the stats command) never block the writer. A small rollup table
+keeps per-persona totals for blocks of consecutive rounds, so aggregate
+queries such as "win rate by persona over the last 10^6 rounds" read a few
+hundred rollup rows instead of millions of seat rows.
+
+Several processes may write to the same database: each flush takes the
+write lock up front (BEGIN IMMEDIATE) and numbers its rounds after the
+current maximum id inside that transaction, so a batch can update the
+rollups without a round trip per row and writers never collide on ids.
+
+    python uno_history.py fill --rounds 100000     # simulate bot rounds into the db
+    python uno_history.py stats --last 1000000     # win rate by persona and seat
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from uno_logic import Game
+
+DEFAULT_PATH = "uno_history.sqlite3"
+# Rounds per rollup block
+BLOCK = 1024
+# Persona labels for seats that do not run a fixed persona
+HUMAN = "human"
+MIXED_BOT = "mixed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    target_score INTEGER NOT NULL,
+    winner_seat INTEGER
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    played_at REAL NOT NULL,
+    seed INTEGER,
+    winner_seat INTEGER NOT NULL,
+    winner_points INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    recycles INTEGER NOT NULL,
+    plus4_challenges INTEGER NOT NULL,
+    plus4_challenges_won INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS round_seats (
+    round_id INTEGER NOT NULL,
+    seat INTEGER NOT NULL,
+    persona TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    cards_left INTEGER NOT NULL,
+    hand_points INTEGER NOT NULL,
+    PRIMARY KEY (round_id, seat)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS persona_blocks (
+    block INTEGER NOT NULL,
+    persona TEXT NOT NULL,
+    seat INTEGER NOT NULL,
+    seats INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (block, persona, seat)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_matches_started ON matches(source, started_at);
+CREATE INDEX IF NOT EXISTS idx_rounds_played ON rounds(played_at);
+CREATE INDEX IF NOT EXISTS idx_rounds_match ON rounds(match_id);
+CREATE INDEX IF NOT EXISTS idx_seats_persona ON round_seats(persona, round_id);
+CREATE INDEX IF NOT EXISTS idx_seats_seat ON round_seats(seat, round_id);
+"""
+
+
+class MatchHistory:
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 2000) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # Buffered rounds without their ids, and the per-seat rows of each
+        self._rounds: List[tuple] = []
+        self._seats: List[List[tuple]] = []
+
+    # --- Writing ---
+    def start_match(self, source: str, target_score: int = 500) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO matches (source, started_at, target_score) VALUES (?, ?, ?)",
+                (source, time.time(), target_score))
+        return cur.lastrowid
+
+    def finish_match(self, match_id: int, winner_seat: Optional[int]) -> None:
+        self.flush()
+        with self.conn:
+            self.conn.execute("UPDATE matches SET finished_at = ?, winner_seat = ? WHERE id = ?",
+                              (time.time(), winner_seat, match_id))
+
+    def add_round(self, match_id: int, game: Game, personas: Sequence[str], seed: Optional[int] = None,
+                  played_at: Optional[float] = None) -> None:
+        """Buffer a finished round. Flushes every batch_size rounds."""
+        winner = game.winner_index if game.winner_index is not None else -1
+        self._rounds.append((match_id, played_at if played_at is not None else time.time(), seed,
+                             winner, game.winner_points(), game.turns, game.recycles,
+                             game.plus4_challenges, game.plus4_challenges_won))
+        self._seats.append([(seat, personas[seat], int(seat == winner), len(player.hand),
+                             game.hand_points_for_player(seat)) for seat, player in enumerate(game.players)])
+        if len(self._rounds) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rounds in one transaction; they stay buffered if it fails."""
+        if not self._rounds:
+            return
+        with self.conn:
+            # Take the write lock before reading the max id, so no other writer can claim the same ids
+            self.conn.execute("BEGIN IMMEDIATE")
+            first = (self.conn.execute("SELECT MAX(id) FROM rounds").fetchone()[0] or 0) + 1
+            rounds, seats = [], []
+            rollup: Dict[Tuple[int, str, int], List[int]] = {}
+            for round_id, row, seat_rows in zip(range(first, first + len(self._rounds)), self._rounds, self._seats):
+                rounds.append((round_id, *row))
+                for seat, persona, won, cards_left, hand_points in seat_rows:
+                    seats.append((round_id, seat, persona, won, cards_left, hand_points))
+                    agg = rollup.setdefault((round_id // BLOCK, persona, seat), [0, 0, 0])
+                    agg[0] += 1
+                    agg[1] += won
+                    agg[2] += row[4] if won else 0
+            self.conn.executemany("INSERT INTO rounds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rounds)
+            self.conn.executemany("INSERT INTO round_seats VALUES (?, ?, ?, ?, ?, ?)", seats)
+            self.conn.executemany(
+                "INSERT INTO persona_blocks VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (block, persona, seat) DO UPDATE SET seats = seats + excluded.seats, "
+                "wins = wins + excluded.wins, points = points + excluded.points",
+                [(b, p, s, n, w, pts) for (b, p, s), (n, w, pts) in rollup.items()])
+        self._rounds, self._seats = [], []
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    # --- Queries ---
+    def unfinished_match(self, source: str) -> Optional[Tuple[int, List[int]]]:
+        """Latest unfinished match for source and the seat scores so far, if any."""
+        row = self.conn.execute(
+            "SELECT id FROM matches WHERE source = ? AND finished_at IS NULL ORDER BY started_at DESC LIMIT 1",
+            (source,)).fetchone()
+        if row is None:
+            return None
+        self.flush()
+        scores = [0, 0, 0, 0]
+        for seat, pts in self.conn.execute(
+                "SELECT winner_seat, SUM(winner_points) FROM rounds WHERE match_id = ? AND winner_seat >= 0 "
+                "GROUP BY winner_seat", (row[0],)):
+            scores[seat] = pts
+        return row[0], scores
+
+    def _last_rounds_totals(self, last_rounds: Optional[int], group: str) -> Dict[object, Tuple[int, int, int]]:
+        """(seats, wins, points) per persona or seat over the most recent last_rounds rounds."""
+        self.flush()
+        max_id = self.conn.execute("SELECT MAX(id) FROM rounds").fetchone()[0] or 0
+        lo = 1 if last_rounds is None else max(1, max_id - last_rounds + 1)
+        first_full = -(-lo // BLOCK)  # first block that starts at or after lo
+        totals: Dict[object, List[int]] = {}
+        # Whole blocks come from the rollup table
+        for key, n, w, pts in self.conn.execute(
+                f"SELECT {group}, SUM(seats), SUM(wins), SUM(points) FROM persona_blocks "
+                f"WHERE block >= ? GROUP BY {group}", (first_full,)):
+            totals[key] = [n, w, pts]
+        # The partial block before it is scanned row by row (< BLOCK rounds)
+        for key, n, w, pts in self.conn.execute(
+                f"SELECT s.{group}, COUNT(*), SUM(s.won), SUM(CASE WHEN s.won THEN r.winner_points ELSE 0 END) "
+                f"FROM round_seats s JOIN rounds r ON r.id = s.round_id "
+                f"WHERE s.round_id >= ? AND s.round_id < ? GROUP BY s.{group}", (lo, first_full * BLOCK)):
+            agg = totals.setdefault(key, [0, 0, 0])
+            agg[0] += n
+            agg[1] += w
+            agg[2] += pts
+        return {k: (v[0], v[1], v[2]) for k, v in totals.items()}
+
+    def win_rates_by_persona(self, last_rounds: Optional[int] = None) -> Dict[str, Tuple[int, float, float]]:
+        """persona -> (seat-rounds, win rate, average points per seat-round)."""
+        return {k: (n, w / n, pts / n) for k, (n, w, pts) in self._last_rounds_totals(last_rounds, "persona").items() if n}
+
+    def win_rates_by_seat(self, last_rounds: Optional[int] = None) -> Dict[int, Tuple[int, float, float]]:
+        """seat -> (rounds, win rate, average points per round)."""
+        return {k: (n, w / n, pts / n) for k, (n, w, pts) in self._last_rounds_totals(last_rounds, "seat").items() if n}
+
+    def rounds_between(self, since: float, until: Optional[float] = None) -> int:
+        until = time.time() if until is None else until
+        self.flush()
+        return self.conn.execute("SELECT COUNT(*) FROM rounds WHERE played_at >= ? AND played_at < ?",
+                                 (since, until)).fetchone()[0]
+
+
+def fill(history: MatchHistory, rounds: int, base_seed: int = 0) -> None:
+    """Simulate bot-only rounds into the store as one 'sim' match."""
+    from uno_sim import new_game, play_out
+    match_id = history.start_match("sim")
+    personas = [MIXED_BOT] * 4
+    for seed in range(base_seed, base_seed + rounds):
+        game = new_game(seed)
+        play_out(game)
+        history.add_round(match_id, game, personas, seed=seed)
+    history.finish_match(match_id, None)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query or fill the UNO match history database.")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_fill = sub.add_parser("fill", help="simulate bot-only rounds into the database")
+    p_fill.add_argument("--rounds", type=int, default=10000)
+    p_fill.add_argument("--seed", type=int, default=0)
+    p_stats = sub.add_parser("stats", help="win rates by persona and seat")
+    p_stats.add_argument("--last", type=int, default=None, help="only the most recent N rounds")
+    args = parser.parse_args(argv)
+
+    history = MatchHistory(args.db)
+    try:
+        if args.cmd == "fill":
+            start = time.perf_counter()
+            fill(history, args.rounds, args.seed)
+            print(f"Stored {args.rounds} rounds in {time.perf_counter() - start:.2f}s")
+        else:
+            start = time.perf_counter()
+            by_persona = history.win_rates_by_persona(args.last)
+            by_seat = history.win_rates_by_seat(args.last)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            for persona, (n, rate, pts) in sorted(by_persona.items()):
+                print(f"{persona:>12}: win rate {rate:.3%} over {n} seat-rounds, {pts:.1f} pts/seat-round")
+            for seat, (n, rate, pts) in sorted(by_seat.items()):
+                print(f"{'seat ' + str(seat + 1):>12}: win rate {rate:.3%} over {n} rounds")
+            print(f"(queries took {elapsed_ms:.1f} ms)")
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Rating ladder for many bot policies with adaptive match scheduling.
+
+Every bot carries a TrueSkill-style rating: a skill estimate mu and its
+uncertainty sigma. A match is one deal (uno_logic.Deal) played four times
+with the lineup rotated over the seats; after each round the winner is
+treated as having beaten each of the other bots at the table, and both
+ratings of every such pair are updated (Gaussian win/loss update, as in
+two-player TrueSkill without draws).
+
+Instead of a full round-robin (every set of four bots, quadratic and worse
+in the number of bots) the ladder schedules the next match where it learns
+the most: the most uncertain bot is seated first and its three opponents
+are sampled with weight on their own uncertainty and on how close the
+match is. Matches run on a process pool, a few per worker in flight, and
+results are applied as they arrive. The run stops once every sigma is
+below --sigma (or after --max-rounds), and can be continued later from the
+--state file, also after adding bots.
+
+    python uno_ladder.py --workers 4
+    python uno_ladder.py --bots mixed,Aggressive,Chaotic --variants 4 --sigma 1.5 --state ladder.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence
+
+from uno_logic import PERSONAS, Deal, Game, rng_state, set_rng_state
+from uno_policy import play_with, policy_by_name, policy_names
+
+MU = 25.0
+SIGMA = MU / 3
+# Outcome noise: UNO is mostly luck, so a skill gap of beta still loses often
+BETA = SIGMA
+# Added to every participant's variance before each round so ratings can still move;
+# small, because a bot's skill does not change between matches
+TAU = SIGMA / 1000
+SEATS = 4
+STATE_VERSION = 1
+
+
+class Rating:
+    __slots__ = ("mu", "sigma", "games", "wins")
+
+    def __init__(self, mu: float = MU, sigma: float = SIGMA, games: int = 0, wins: int = 0) -> None:
+        self.mu = mu
+        self.sigma = sigma
+        self.games = games
+        self.wins = wins
+
+    @property
+    def conservative(self) -> float:
+        """Skill the bot has with high confidence (mu - 3 sigma)."""
+        return self.mu - 3 * self.sigma
+
+    def __repr__(self) -> str:
+        return f"Rating(mu={self.mu:.2f}, sigma={self.sigma:.2f}, games={self.games})"
+
+
+def _pdf(x: float) -> float:
+    return math.exp(-x * x / 2) / math.sqrt(2 * math.pi)
+
+
+def _cdf(x: float) -> float:
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+def quality(a: Rating, b: Rating) -> float:
+    """How even a pairing is, 0..1: high when the outcome is hard to predict."""
+    c2 = 2 * BETA * BETA + a.sigma ** 2 + b.sigma ** 2
+    return math.sqrt(2 * BETA * BETA / c2) * math.exp(-((a.mu - b.mu) ** 2) / (2 * c2))
+
+
+def _beat(winner: Rating, loser: Rating) -> tuple:
+    """(winner mu delta, winner variance factor, loser mu delta, loser variance factor)."""
+    c2 = 2 * BETA * BETA + winner.sigma ** 2 + loser.sigma ** 2
+    c = math.sqrt(c2)
+    t = (winner.mu - loser.mu) / c
+    # Guard the tail: v -> -t when the upset is extreme
+    v = _pdf(t) / _cdf(t) if t > -30 else -t
+    w = v * (v + t)
+    return (winner.sigma ** 2 / c * v, 1 - winner.sigma ** 2 / c2 * w,
+            -loser.sigma ** 2 / c * v, 1 - loser.sigma ** 2 / c2 * w)
+
+
+def play_match(seed: int, lineup: Sequence[str]) -> List[Optional[int]]:
+    """Play deal seed once per rotation of lineup; returns the winning lineup index per round (None if aborted)."""
+    deal = Deal.shuffled(seed)
+    bot_seed = random.Random(seed).getrandbits(64) ^ deal.recycle_seed
+    policies = [policy_by_name(name) for name in lineup]
+    winners: List[Optional[int]] = []
+    for shift in range(SEATS):
+        seats = [(i + shift) % len(lineup) for i in range(SEATS)]
+        game = Game(rng=random.Random(0), bot_rng=random.Random(bot_seed))
+        game.setup(deal)
+        play_with(game, [policies[i] for i in seats])
+        winners.append(seats[game.winner_index] if game.game_over and game.winner_index is not None else None)
+    return winners
+
+
+class Ladder:
+    def __init__(self, seed: int = 0) -> None:
+        self.ratings: Dict[str, Rating] = {}
+        self.rng = random.Random(seed)
+        self.rounds = 0
+        self.matches = 0
+
+    def add(self, name: str) -> None:
+        if name not in self.ratings:
+            self.ratings[name] = Rating()
+
+    def ranking(self, names: Optional[Sequence[str]] = None) -> List[str]:
+        names = self.ratings if names is None else names
+        return sorted(names, key=lambda n: self.ratings[n].mu, reverse=True)
+
+    # --- Updates ---
+    def record(self, lineup: Sequence[str], winners: Sequence[Optional[int]]) -> None:
+        """Apply one match: a winner beats every other bot at the table, round by round."""
+        self.matches += 1
+        table = sorted(set(lineup), key=lineup.index)
+        for winner in winners:
+            self.rounds += 1
+            for name in table:
+                r = self.ratings[name]
+                r.sigma = math.sqrt(r.sigma ** 2 + TAU ** 2)
+                r.games += lineup.count(name)
+            if winner is None:
+                continue
+            best = self.ratings[lineup[winner]]
+            best.wins += 1
+            # All pairs are computed from the pre-round ratings, then applied together
+            deltas = {name: [0.0, 1.0] for name in table}
+            for name in table:
+                if name == lineup[winner]:
+                    continue
+                dw, fw, dl, fl = _beat(best, self.ratings[name])
+                deltas[lineup[winner]][0] += dw
+                deltas[lineup[winner]][1] *= fw
+                deltas[name][0] += dl
+                deltas[name][1] *= fl
+            for name, (dmu, factor) in deltas.items():
+                r = self.ratings[name]
+                r.mu += dmu
+                r.sigma *= math.sqrt(max(factor, 1e-4))
+
+    # --- Scheduling ---
+    def next_lineup(self, names: Sequence[str], pending: Dict[str, int]) -> List[str]:
+        """Four seats for the most informative match, discounting bots already in flight."""
+        def load(name: str) -> float:
+            return 1 + pending.get(name, 0)
+
+        anchor = max(names, key=lambda n: (self.ratings[n].sigma ** 2 / load(n), self.rng.random()))
+        a = self.ratings[anchor]
+        pool = [n for n in names if n != anchor]
+        weights = [(a.sigma ** 2 + self.ratings[n].sigma ** 2) * quality(a, self.ratings[n]) / load(n) for n in pool]
+        lineup = [anchor]
+        while len(lineup) < SEATS and pool:
+            pick = self.rng.choices(range(len(pool)), weights=weights)[0]
+            lineup.append(pool.pop(pick))
+            weights.pop(pick)
+        # Fewer bots than seats: repeat the lineup
+        while len(lineup) < SEATS:
+            lineup.append(lineup[len(lineup) % max(1, len(names))])
+        return lineup
+
+    def converged(self, names: Sequence[str], sigma: float) -> bool:
+        return all(self.ratings[n].sigma <= sigma for n in names)
+
+    def run(self, names: Sequence[str], workers: int = 1, sigma: float = 1.0, max_rounds: int = 100000,
+            on_match=None) -> None:
+        """Play scheduled matches until every bot in names is rated within sigma."""
+        for name in names:
+            self.add(name)
+        budget = self.rounds + max_rounds
+        if workers <= 1:
+            while not self.converged(names, sigma) and self.rounds < budget:
+                lineup = self.next_lineup(names, {})
+                self.record(lineup, play_match(self.rng.getrandbits(64), lineup))
+                if on_match:
+                    on_match(self)
+            return
+        pending: Dict[str, int] = {}
+        in_flight = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # Keep every worker busy; stop issuing once the goal is met or the budget is spoken for
+                while (len(in_flight) < 2 * workers and not self.converged(names, sigma)
+                       and self.rounds + SEATS * len(in_flight) < budget):
+                    lineup = self.next_lineup(names, pending)
+                    for name in lineup:
+                        pending[name] = pending.get(name, 0) + 1
+                    in_flight[pool.submit(play_match, self.rng.getrandbits(64), lineup)] = lineup
+                if not in_flight:
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lineup = in_flight.pop(future)
+                    for name in lineup:
+                        pending[name] -= 1
+                    self.record(lineup, future.result())
+                    if on_match:
+                        on_match(self)
+
+    # --- State ---
+    def to_state(self) -> dict:
+        return {"version": STATE_VERSION, "rng": rng_state(self.rng), "rounds": self.rounds,
+                "matches": self.matches,
+                "ratings": {n: [r.mu, r.sigma, r.games, r.wins] for n, r in self.ratings.items()}}
+
+    @classmethod
+    def from_state(cls, data: dict) -> Ladder:
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported ladder state version {data.get('version')!r}")
+        ladder = cls()
+        set_rng_state(ladder.rng, data["rng"])
+        ladder.rounds = data["rounds"]
+        ladder.matches = data["matches"]
+        ladder.ratings = {n: Rating(*values) for n, values in data["ratings"].items()}
+        return ladder
+
+    def save(self, path: str) -> None:
+        """Atomically replace the state file at path."""
+        fd, tmp = tempfile.mkstemp(prefix=".uno-ladder-", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.to_state(), f, indent=1)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Ladder:
+        with open(path) as f:
+            return cls.from_state(json.load(f))
+
+    def report(self, names: Optional[Sequence[str]] = None) -> str:
+        lines = [f"{'#':>3} {'bot':<44} {'mu':>6} {'sigma':>6} {'mu-3s':>6} {'seats':>6} {'win %':>6}"]
+        for rank, name in enumerate(self.ranking(names), 1):
+            r = self.ratings[name]
+            label = name if len(name) <= 44 else name[:41] + "..."
+            lines.append(f"{rank:>3} {label:<44} {r.mu:6.2f} {r.sigma:6.2f} {r.conservative:6.2f} "
+                         f"{r.games:>6} {r.wins / max(1, r.games):6.1%}")
+        return "\n".join(lines)
+
+
+def variants(base: str, count: int, rng: random.Random, spread: float = 0.3) -> List[str]:
+    """Policy names for count random re-weightings of persona base (see uno_policy)."""
+    persona = next(p for p in PERSONAS if p["name"].lower() == base.lower())
+    weights = [k for k, v in persona.items() if isinstance(v, float)]
+    names = []
+    for _ in range(count):
+        tuned = []
+        for key in weights:
+            value = persona[key] * math.exp(rng.gauss(0.0, spread))
+            if key == "random_prob":
+                value = min(value, 0.9)
+            tuned.append(f"{key}={value:.3g}")
+        names.append(":".join([persona["name"]] + tuned))
+    return names
+
+
+def round_robin_rounds(bots: int) -> int:
+    """Rounds in one pass of a round-robin over every table of four (each rotated over the seats)."""
+    return math.comb(bots, SEATS) * SEATS if bots >= SEATS else SEATS
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rate bot policies with adaptively scheduled matches.")
+    parser.add_argument("--bots", default=",".join(policy_names()),
+                        help="comma-separated policies (see uno_policy); default: all stock bots")
+    parser.add_argument("--variants", type=int, default=0, help="add this many tuned variants of each persona")
+    parser.add_argument("--sigma", type=float, default=1.0, help="stop once every bot's sigma is below this")
+    parser.add_argument("--max-rounds", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--state", help="JSON file to continue from and save to")
+    args = parser.parse_args(argv)
+
+    names = [b.strip() for b in args.bots.split(",") if b.strip()]
+    if args.variants:
+        variant_rng = random.Random(args.seed)
+        names += [v for p in PERSONAS for v in variants(p["name"], args.variants, variant_rng)]
+    for name in names:
+        try:
+            policy_by_name(name)
+        except ValueError as e:
+            parser.error(str(e))
+    if len(set(names)) < 2:
+        parser.error("a ladder needs at least two different bots")
+    names = sorted(set(names), key=names.index)
+
+    ladder = Ladder.load(args.state) if args.state and os.path.exists(args.state) else Ladder(args.seed)
+    start_rounds = ladder.rounds
+    start = time.perf_counter()
+    last = [start]
+
+    def progress(lad: Ladder) -> None:
+        now = time.perf_counter()
+        if now - last[0] >= 2.0:
+            last[0] = now
+            worst = max(lad.ratings[n].sigma for n in names)
+            print(f"  {lad.rounds - start_rounds} rounds, max sigma {worst:.2f}, leader {lad.ranking(names)[0]}")
+            if args.state:
+                lad.save(args.state)
+
+    ladder.run(names, args.workers, args.sigma, args.max_rounds, progress)
+    elapsed = time.perf_counter() - start
+    played = ladder.rounds - start_rounds
+    if args.state:
+        ladder.save(args.state)
+    print(ladder.report(names))
+    print(f"{played} rounds in {elapsed:.1f}s ({ladder.rounds} in total for this ladder); "
+          f"one pass of a round-robin over {len(names)} bots takes {round_robin_rounds(len(names))} rounds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Load-test client for uno_server.
+
+Opens many simulated human connections, plays every turn with a trivial
+policy (first playable card, otherwise draw/pass/accept) and reports
+round-trip latency and message throughput. The run fails (exit status 1)
+when the p99 ping or action->state latency exceeds --max-p99-ms or there
+are more than --max-errors errors.
+
+Run against a live server:   python uno_loadtest.py --clients 2000 --port 8765
+Or self-contained:           python uno_loadtest.py --clients 2000 --spawn-server --max-p99-ms 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import List, Optional
+
+from uno_logic import COLORS
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, int(round(q / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class SimClient:
+    def __init__(self, name: str, stats: "LoadStats") -> None:
+        self.name = name
+        self.stats = stats
+        self.state: dict = {}
+        self.version = -1
+        # Snapshot of the state we last acted on; diffs that leave it unchanged
+        # (joins, other seats' counters) must not trigger a duplicate action
+        self._acted_on: Optional[tuple] = None
+        self._sent_at: Optional[float] = None
+
+    async def run(self, host: str, port: int, duration: float, ping_every: float) -> None:
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 16)
+        self.writer = writer
+        self.send({"op": "join", "name": self.name})
+        deadline = time.perf_counter() + duration
+        next_ping = time.perf_counter() + random.random() * ping_every
+        try:
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                if now >= next_ping:
+                    self.send({"op": "ping", "t": now})
+                    next_ping = now + ping_every
+                try:
+                    line = await asyncio.wait_for(reader.readline(), timeout=min(deadline, next_ping) - now)
+                except asyncio.TimeoutError:
+                    continue
+                if not line:
+                    break
+                self.stats.received += 1
+                self.handle(json.loads(line))
+        finally:
+            self.send({"op": "leave"})
+            writer.close()
+
+    def send(self, msg: dict) -> None:
+        self.stats.sent += 1
+        self.writer.write((json.dumps(msg, separators=(",", ":")) + "\n").encode())
+
+    def handle(self, msg: dict) -> None:
+        op = msg.get("op")
+        if op == "pong":
+            self.stats.ping_ms.append((time.perf_counter() - msg["t"]) * 1000.0)
+            return
+        if op == "error":
+            self.stats.errors += 1
+            return
+        if op == "state":
+            self.state = dict(msg["state"])
+        elif op == "diff":
+            self.state.update(msg["set"])
+        else:
+            return
+        if self._sent_at is not None:
+            self.stats.action_ms.append((time.perf_counter() - self._sent_at) * 1000.0)
+            self._sent_at = None
+        self.version = msg["v"]
+        self.maybe_act()
+
+    def maybe_act(self) -> None:
+        s = self.state
+        seat = s.get("seat")
+        key = (s.get("current"), tuple(s.get("hand", ())), s.get("top"), s.get("color"),
+               s.get("plus4_target"), s.get("initial_color_for"), s.get("can_draw"))
+        if s.get("game_over") or key == self._acted_on:
+            return
+        move = None
+        if s.get("plus4_target") == seat:
+            move = {"op": "accept"}
+        elif s.get("initial_color_for") == seat:
+            move = {"op": "color", "color": random.choice(COLORS)}
+        elif s.get("current") == seat:
+            if s.get("playable"):
+                i = s["playable"][0]
+                move = {"op": "play", "card": i}
+                if s["hand"][i] in ("Wild", "+4"):
+                    move["color"] = random.choice(COLORS)
+            elif s.get("can_draw"):
+                move = {"op": "draw"}
+            elif s.get("can_pass"):
+                move = {"op": "pass"}
+        if move is not None:
+            self._acted_on = key
+            self._sent_at = time.perf_counter()
+            self.stats.actions += 1
+            self.send(move)
+
+
+class LoadStats:
+    def __init__(self) -> None:
+        self.sent = 0
+        self.received = 0
+        self.actions = 0
+        self.errors = 0
+        self.ping_ms: List[float] = []
+        self.action_ms: List[float] = []
+
+    def report(self, elapsed: float, clients: int) -> str:
+        lines = [
+            f"clients={clients} elapsed={elapsed:.1f}s",
+            f"messages: sent={self.sent} received={self.received} "
+            f"({(self.sent + self.received) / elapsed:.0f} msg/s)",
+            f"actions: {self.actions} ({self.actions / elapsed:.0f}/s), errors={self.errors}",
+        ]
+        for label, samples in (("ping", self.ping_ms), ("action->state", self.action_ms)):
+            lines.append(
+                f"{label} ms: p50={percentile(samples, 50):.2f} p95={percentile(samples, 95):.2f} "
+                f"p99={percentile(samples, 99):.2f} max={max(samples, default=0.0):.2f} (n={len(samples)})"
+            )
+        return "\n".join(lines)
+
+    def violations(self, max_p99_ms: float, max_errors: int) -> List[str]:
+        """Ways this run broke its latency and error budget; empty when it passed."""
+        failed = []
+        if self.errors > max_errors:
+            failed.append(f"{self.errors} errors (budget {max_errors})")
+        if not self.action_ms:
+            failed.append("no action was answered")
+        for label, samples in (("ping", self.ping_ms), ("action->state", self.action_ms)):
+            p99 = percentile(samples, 99)
+            if p99 > max_p99_ms:
+                failed.append(f"{label} p99 {p99:.2f} ms (budget {max_p99_ms:g} ms)")
+        return failed
+
+
+async def run_load(host: str, port: int, clients: int, duration: float, ramp: float, ping_every: float) -> LoadStats:
+    stats = LoadStats()
+    tasks = []
+    for i in range(clients):
+        tasks.append(asyncio.ensure_future(SimClient(f"sim{i}", stats).run(host, port, duration, ping_every)))
+        if ramp and i % 100 == 99:
+            await asyncio.sleep(ramp * 100 / clients)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    stats.errors += sum(1 for r in results if isinstance(r, Exception))
+    return stats
+
+
+async def _main(args: argparse.Namespace) -> int:
+    server = None
+    port = args.port
+    if args.spawn_server:
+        from uno_server import UnoServer
+        server = UnoServer(round_delay=0.05)
+        await server.start(args.host, 0)
+        port = server.port
+    start = time.perf_counter()
+    try:
+        stats = await run_load(args.host, port, args.clients, args.duration, args.ramp, args.ping_every)
+    finally:
+        if server is not None:
+            server.close()
+    print(stats.report(time.perf_counter() - start, args.clients))
+    failed = stats.violations(args.max_p99_ms, args.max_errors)
+    for reason in failed:
+        print(f"FAIL: {reason}")
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate many UNO clients against uno_server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds each client stays connected")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which connections are opened")
+    parser.add_argument("--ping-every", type=float, default=1.0, help="seconds between latency pings per client")
+    parser.add_argument("--spawn-server", action="store_true", help="run an in-process server on a free port")
+    parser.add_argument("--max-p99-ms", type=float, default=250.0,
+                        help="fail when the p99 ping or action->state latency is above this")
+    parser.add_argument("--max-errors", type=int, default=0, help="fail with more errors than this")
+    args = parser.parse_args(argv)
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
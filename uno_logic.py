@@ -1,20 +1,56 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import os
 import random
-from typing import List, Optional, Tuple
-import math
-import copy
+import struct
+import warnings
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 COLORS = ["Red", "Yellow", "Green", "Blue"]
 VALUES = [str(n) for n in range(0, 10)]  # 0-9
 ACTIONS = ["Skip", "Reverse", "+2"]
 WILDS = ["Wild", "+4"]
+# Default player names by seat; shared strings, not one copy per table
+SEAT_NAMES = ("You", "Bot 2", "Bot 3", "Bot 4")
 
 
-@dataclass(frozen=True)
 class Card:
-    color: Optional[str]  # None for wilds
-    value: str            # "0"-"9", "Skip", "Reverse", "+2", "Wild", "+4"
+    """Immutable card; equal and hashed by (color, value).
+
+    A plain __slots__ class rather than a frozen dataclass so that importing
+    the engine does not pull in dataclasses (and inspect) at startup.
+    """
+    __slots__ = ("color", "value")
+
+    def __init__(self, color: Optional[str], value: str) -> None:
+        object.__setattr__(self, "color", color)  # None for wilds
+        object.__setattr__(self, "value", value)  # "0"-"9", "Skip", "Reverse", "+2", "Wild", "+4"
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Card:
+            return NotImplemented
+        return self.color == other.color and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash((self.color, self.value))
+
+    def __repr__(self) -> str:
+        return f"Card(color={self.color!r}, value={self.value!r})"
+
+    def __reduce__(self):
+        return Card, (self.color, self.value)
+
+    def __copy__(self) -> Card:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Card:
+        # Immutable: copies of a game share its cards (hands stay distinct per game)
+        return self
 
     def is_wild(self) -> bool:
         return self.value in WILDS
@@ -46,34 +82,145 @@ class Card:
         return False
 
 
+_set_card_color = Card.color.__set__
+_set_card_value = Card.value.__set__
+
+
+def _new_card(color: Optional[str], value: str) -> Card:
+    """Card(color, value) without the __init__/__setattr__ overhead, for bulk rebuilds."""
+    card = object.__new__(Card)
+    _set_card_color(card, color)
+    _set_card_value(card, value)
+    return card
+
+
+# Bot play styles; by default each bot turn picks one at random (Game._pick_persona)
+PERSONAS: List[dict] = [
+    {  # Aggressive
+        "name": "Aggressive",
+        "impact_mult": {"+4": 1.4, "+2": 1.3, "Skip": 1.2, "Reverse": 1.0, "_default": 1.0},
+        "color_bias": 1.0,
+        "diversity_bias": 1.0,
+        "wild_penalty": 2.0,
+        "high_points_bias": 0.05,
+        "random_prob": 0.08,
+        "next_uno_scale": 1.2,
+    },
+    {  # Conservative
+        "name": "Conservative",
+        "impact_mult": {"+4": 0.9, "+2": 0.95, "Skip": 1.0, "Reverse": 1.0, "_default": 1.1},
+        "color_bias": 1.2,
+        "diversity_bias": 1.1,
+        "wild_penalty": 5.0,
+        "high_points_bias": 0.02,
+        "random_prob": 0.07,
+        "next_uno_scale": 1.0,
+    },
+    {  # Monochrome (color focusing)
+        "name": "Monochrome",
+        "impact_mult": {"+4": 1.0, "+2": 1.0, "Skip": 1.0, "Reverse": 1.0, "_default": 1.0},
+        "color_bias": 2.0,
+        "diversity_bias": 1.6,
+        "wild_penalty": 3.0,
+        "high_points_bias": 0.03,
+        "random_prob": 0.10,
+        "next_uno_scale": 1.0,
+    },
+    {  # Chaotic
+        "name": "Chaotic",
+        "impact_mult": {"+4": 1.0, "+2": 1.0, "Skip": 1.0, "Reverse": 1.0, "_default": 1.0},
+        "color_bias": 0.8,
+        "diversity_bias": 0.8,
+        "wild_penalty": 2.0,
+        "high_points_bias": 0.0,
+        "random_prob": 0.35,
+        "next_uno_scale": 0.8,
+    },
+    {  # Finisher
+        "name": "Finisher",
+        "impact_mult": {"+4": 1.2, "+2": 1.1, "Skip": 1.1, "Reverse": 1.0, "_default": 1.0},
+        "color_bias": 1.0,
+        "diversity_bias": 1.2,
+        "wild_penalty": 3.5,
+        "high_points_bias": 0.15,
+        "random_prob": 0.12,
+        "next_uno_scale": 1.3,
+    },
+]
+PERSONAS_BY_NAME = {p["name"]: p for p in PERSONAS}
+
+
+class Deal:
+    """A pre-shuffled round for Game.setup(deal).
+
+    order is the deck, drawn from the end; start is the first seat to act;
+    recycle_seed seeds the card stream after dealing, so discard recycles
+    shuffle with the same permutations whenever the deal is replayed.
+    Duplicate evaluation (uno_duplicate) replays one Deal with every seat
+    rotation of the players.
+    """
+    __slots__ = ("order", "start", "recycle_seed")
+
+    def __init__(self, order: List[Card], start: int, recycle_seed: int) -> None:
+        self.order = order
+        self.start = start
+        self.recycle_seed = recycle_seed
+
+    @classmethod
+    def shuffled(cls, seed: int, num_players: int = 4) -> Deal:
+        rng = random.Random(seed)
+        order = Deck(rng).cards
+        return cls(order, rng.randrange(num_players), rng.getrandbits(64))
+
+
+class PendingPlus4:
+    """A +4 waiting for its target to accept or challenge."""
+    __slots__ = ("played_by", "target", "was_legal", "penalty", "prev_color")
+
+    def __init__(self, played_by: int, target: int, was_legal: bool, penalty: int = 4,
+                 prev_color: Optional[str] = None) -> None:
+        self.played_by = played_by
+        self.target = target
+        self.was_legal = was_legal  # legality judged against the color in effect before the +4
+        self.penalty = penalty  # cards to draw; more than 4 when +4s were stacked
+        self.prev_color = prev_color  # that color (public); None if unknown
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not PendingPlus4:
+            return NotImplemented
+        return ((self.played_by, self.target, self.was_legal, self.penalty, self.prev_color)
+                == (other.played_by, other.target, other.was_legal, other.penalty, other.prev_color))
+
+    def __repr__(self) -> str:
+        return (f"PendingPlus4(played_by={self.played_by!r}, target={self.target!r}, "
+                f"was_legal={self.was_legal!r}, penalty={self.penalty!r}, prev_color={self.prev_color!r})")
+
+
 class Deck:
-    def __init__(self) -> None:
-        self.cards: List[Card] = []
+    __slots__ = ("rng", "cards")
+
+    def __init__(self, rng: Optional[random.Random] = None, cards: Optional[List[Card]] = None) -> None:
+        self.rng = rng if rng is not None else random.Random()
+        if cards is not None:
+            # Restoring a saved deck: keep its order
+            self.cards: List[Card] = cards
+            return
+        self.cards = []
         self._build_deck()
         self.shuffle()
 
-    def _build_deck(self) -> None:
-        self.cards.clear()
-        # Number cards
-        for color in COLORS:
-            # one zero
-            self.cards.append(Card(color, "0"))
-            # two of 1-9
-            for n in range(1, 10):
-                self.cards.append(Card(color, str(n)))
-                self.cards.append(Card(color, str(n)))
-        # Action cards (2 of each per color)
-        for color in COLORS:
-            for action in ACTIONS:
-                self.cards.append(Card(color, action))
-                self.cards.append(Card(color, action))
-        # Wilds (4 of each)
-        for _ in range(4):
-            self.cards.append(Card(None, "Wild"))
-            self.cards.append(Card(None, "+4"))
+    def _build_deck(self, shared: bool = True) -> None:
+        """Replace the contents with a full 108-card deck in standard order.
+
+        Cards are immutable, so every deck built in this process holds the
+        same shared instances. Rebuilding while cards of the old deck are
+        still in hands needs shared=False: hands go by identity, so the
+        second set must be distinct objects.
+        """
+        self.cards[:] = _SHARED_DECK if shared else [_new_card(color, value) for color, value in _DECK_KINDS]
 
     def shuffle(self) -> None:
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def draw(self, n: int = 1) -> List[Card]:
         drawn: List[Card] = []
@@ -88,11 +235,74 @@ class Deck:
         self.shuffle()
 
 
+class Hand:
+    """Ordered collection of the cards a player holds.
+
+    Every physical card is its own Card instance, so the object itself is the
+    card's handle: membership and removal are dictionary operations keyed by
+    identity and never confuse two equal duplicates (e.g. both Red 7s).
+    Iteration, len() and indexing/slicing behave like the list this replaces.
+    """
+
+    __slots__ = ("_cards", "_list")
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self._cards: Dict[int, Card] = {}
+        self._list: Optional[List[Card]] = None  # snapshot for indexing; None after any change
+        self.extend(cards)
+
+    def __contains__(self, card: object) -> bool:
+        return self._cards.get(id(card)) is card
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards.values())
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Card, List[Card]]:
+        cards = self._list
+        if cards is None:
+            if key == -1 and self._cards:  # the card just drawn; no snapshot needed
+                return next(reversed(self._cards.values()))
+            cards = self._list = list(self._cards.values())
+        return cards[key]
+
+    def __repr__(self) -> str:
+        return f"Hand({list(self._cards.values())!r})"
+
+    def __reduce__(self):
+        # Keys are object ids, so copies and pickles must rebuild them
+        return (Hand, (list(self._cards.values()),))
+
+    def append(self, card: Card) -> None:
+        self._cards[id(card)] = card
+        self._list = None
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        if not isinstance(cards, list):
+            cards = list(cards)
+        self._cards.update(zip(map(id, cards), cards))
+        self._list = None
+
+    def remove(self, card: Card) -> None:
+        if self._cards.get(id(card)) is not card:
+            raise ValueError("card not in hand")
+        del self._cards[id(card)]
+        self._list = None
+
+    def clear(self) -> None:
+        self._cards.clear()
+        self._list = None
+
+
 class Player:
+    __slots__ = ("name", "is_human", "hand")
+
     def __init__(self, name: str, is_human: bool = False) -> None:
         self.name = name
         self.is_human = is_human
-        self.hand: List[Card] = []
+        self.hand = Hand()
 
     def draw(self, deck: Deck, n: int = 1) -> List[Card]:
         cards = deck.draw(n)
@@ -104,12 +314,26 @@ class Player:
 
 
 class Game:
-    def __init__(self, num_players: int = 4) -> None:
+    __slots__ = ("num_players", "rng", "bot_rng", "rules", "players", "deck", "discard_pile", "current_index",
+                 "direction", "current_color", "game_over", "drew_this_turn", "last_drawn_card", "last_penalty",
+                 "winner_index", "pending_plus4", "pending_initial_wild_for", "draw_stack", "turns", "recycles",
+                 "plus4_challenges", "plus4_challenges_won", "draws", "persona_picks", "color_draws", "version",
+                 "_memo_version", "_memo_cache")
+
+    def __init__(self, num_players: int = 4, rng: Optional[random.Random] = None,
+                 bot_rng: Optional[random.Random] = None, rules: Optional[HouseRules] = None,
+                 deck: Optional[Deck] = None) -> None:
         # Official request: 4 players only (1 human + 3 bots)
         assert num_players == 4, "Game must have exactly 4 players (you + 3 bots)"
         self.num_players = num_players
+        # Separate random streams: rng drives the cards (shuffles, starting player,
+        # recycles), bot_rng drives bot decisions, so seeded games replay exactly
+        self.rng = rng if rng is not None else random.Random()
+        self.bot_rng = bot_rng if bot_rng is not None else random.Random()
+        # Card effects and optional house rules, compiled into a dispatch table
+        self.rules = rules if rules is not None else OFFICIAL_RULES
         self.players: List[Player] = []
-        self.deck = Deck()
+        self.deck = deck if deck is not None else Deck(self.rng)
         self.discard_pile: List[Card] = []
         self.current_index = 0
         self.direction = 1  # 1 for clockwise, -1 for counter-clockwise
@@ -123,30 +347,56 @@ class Game:
         # Track the winner of the round (index)
         self.winner_index: Optional[int] = None
         # Pending states
-        self.pending_plus4: Optional[dict] = None  # {played_by, target, was_legal}
+        self.pending_plus4: Optional[PendingPlus4] = None
         self.pending_initial_wild_for: Optional[int] = None  # index who must choose starting color
-
-    def setup(self) -> None:
+        self.draw_stack = 0  # stacked +2 penalty facing the current player (stacking house rule)
+        # Round statistics
+        self.turns = 0  # turn hand-offs (advance_turn calls)
+        self.recycles = 0  # discard pile reshuffled into the deck
+        self.plus4_challenges = 0
+        self.plus4_challenges_won = 0  # challenges that caught an illegal +4
+        self.draws = 0  # cards drawn after the deal (draw actions and penalties)
+        self.persona_picks = [0] * len(PERSONAS)  # bot turns per persona (PERSONAS order) from _pick_persona
+        # Draw actions per player and color in effect (index player * 4 + color id): public
+        # evidence of the colors a player lacks, used to judge +4 challenges
+        self.color_draws = [0] * (num_players * len(COLORS))
+        # Bumped by every mutation; derived results (allowed moves, hand color counts)
+        # are cached against it. Code that edits fields directly must bump it too.
+        self.version = 0
+        self._memo_version = -1
+        self._memo_cache: Optional[dict] = None
+
+    def setup(self, deal: Optional[Deal] = None) -> None:
+        """Deal a new round: from a fresh shuffle, or replaying deal exactly (see Deal)."""
         # Create players: Player 1 human, rest bots named 2..4 to match UI order
         self.players = [Player("You", is_human=True)]
         for i in range(2, self.num_players + 1):
-            self.players.append(Player(f"Bot {i}"))
+            self.players.append(Player(SEAT_NAMES[i - 1]))
 
-        # Thoroughly shuffle deck before dealing
-        for _ in range(3):
-            self.deck.shuffle()
+        if deal is not None:
+            order = deal.order
+            # Recycles (and any other reshuffle) replay the same permutations
+            self.rng.seed(deal.recycle_seed)
+        else:
+            # Thoroughly shuffle deck before dealing
+            for _ in range(3):
+                self.deck.shuffle()
+            order = self.deck.cards
 
-        # Deal 7 cards each
-        for _ in range(7):
-            for p in self.players:
-                p.draw(self.deck, 1)
+        # Deal 7 cards each, one at a time from the top (the end of the list): seat i
+        # gets every num_players-th card counting back from the i-th last, a slice
+        n = len(self.players)
+        dealt = 7 * n
+        for i, p in enumerate(self.players):
+            p.hand.extend(order[len(order) - 1 - i:len(order) - 1 - dealt:-n])
+        self.deck.cards = order[:len(order) - dealt]
 
         # Flip starter card (never +4 as first card per rules)
         first = self._draw_first_non_wild_plus4()
         self.discard_pile.append(first)
 
         # Randomize starting player
-        self.current_index = random.randrange(len(self.players))
+        self.current_index = deal.start if deal is not None else self.rng.randrange(len(self.players))
         # Reset per-turn flags
         self.drew_this_turn = False
         self.last_drawn_card = None
@@ -155,6 +405,14 @@ class Game:
         self.winner_index = None
         self.pending_plus4 = None
         self.pending_initial_wild_for = None
+        self.draw_stack = 0
+        self.turns = 0
+        self.recycles = 0
+        self.plus4_challenges = 0
+        self.plus4_challenges_won = 0
+        self.draws = 0
+        self.persona_picks = [0] * len(PERSONAS)
+        self.color_draws = [0] * (self.num_players * len(COLORS))
 
         # Apply official first-card effects
         if first.value == "Wild":
@@ -181,12 +439,13 @@ class Game:
         else:
             # Number/symbol – just set color and start with current_index
             self.current_color = first.color
+        self.version += 1
 
     def _draw_first_non_wild_plus4(self) -> Card:
         # Ensure the first card is not a +4; if empty, reshuffle from discard
         while True:
             if not self.deck.cards:
-                self.deck._build_deck()
+                self.deck._build_deck(shared=False)
                 self.deck.shuffle()
             card = self.deck.draw(1)[0]
             if card.value != "+4":
@@ -217,7 +476,7 @@ class Game:
 
     def can_play_card(self, player_idx: int, card: Card) -> Tuple[bool, Optional[str]]:
         # Block any normal action while +4 challenge or initial wild color choice is pending
-        if self.pending_plus4 is not None:
+        if self.pending_plus4 is not None and not self._can_stack_plus4(player_idx, card):
             return False, "+4 is pending: accept or challenge first"
         if self.pending_initial_wild_for is not None and player_idx == self.pending_initial_wild_for:
             return False, "Choose a starting color first"
@@ -225,6 +484,8 @@ class Game:
             return False, "Card not in hand"
         if not self.is_playable(card):
             return False, "Card not playable"
+        if self.draw_stack and card.value != "+2":
+            return False, "Stack a +2 or take the cards"
         # After drawing, only the drawn card may be played this turn
         if self.drew_this_turn and player_idx == self.current_index:
             if self.last_drawn_card is None or card is not self.last_drawn_card:
@@ -235,7 +496,9 @@ class Game:
         return (self.current_index + steps * self.direction) % len(self.players)
 
     def advance_turn(self, steps: int = 1) -> None:
+        self.version += 1
         self.current_index = self.next_player_index(steps)
+        self.turns += 1
         # Reset turn state
         self.drew_this_turn = False
         self.last_drawn_card = None
@@ -244,13 +507,14 @@ class Game:
         return self.pending_plus4 is not None
 
     def is_plus4_pending_for(self, player_idx: int) -> bool:
-        return self.pending_plus4 is not None and self.pending_plus4.get("target") == player_idx
+        return self.pending_plus4 is not None and self.pending_plus4.target == player_idx
 
     def set_initial_wild_color(self, color: str) -> Tuple[bool, Optional[str]]:
         if self.pending_initial_wild_for is None:
             return False, None
         if color not in COLORS:
             return False, "Invalid color"
+        self.version += 1
         self.current_color = color
         self.pending_initial_wild_for = None
         return True, None
@@ -258,28 +522,35 @@ class Game:
     def play_card(self, player_idx: int, card: Card, chosen_color: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         if self.game_over:
             return False, "Game is over"
-        if self.pending_plus4 is not None:
+        if self.pending_plus4 is not None and not self._can_stack_plus4(player_idx, card):
             return False, "+4 is pending: resolve it first"
         if self.pending_initial_wild_for is not None and player_idx == self.pending_initial_wild_for:
             return False, "Choose a starting color first"
         if player_idx != self.current_index:
-            return False, "It's not your turn"
+            if not self.can_jump_in(player_idx, card):
+                return False, "It's not your turn"
+            # Jump-in: play continues from the player who jumped in
+            self.version += 1
+            self.current_index = player_idx
+            self.drew_this_turn = False
+            self.last_drawn_card = None
         if card not in self.players[player_idx].hand:
             return False, "Card not in hand"
         if not self.is_playable(card):
             return False, "Card not playable"
+        if self.draw_stack and card.value != "+2":
+            return False, "Stack a +2 or take the cards"
+        if self.drew_this_turn and card is not self.last_drawn_card:
+            return False, "After drawing, you may only play the drawn card"
+        if card.is_wild() and chosen_color not in COLORS:
+            return False, "Choose a valid color for Wild"
 
         prev_effective_color = self.effective_color()
         player = self.players[player_idx]
+        self.version += 1
         player.remove_card(card)
         self.discard_pile.append(card)
-
-        if card.is_wild():
-            if chosen_color not in COLORS:
-                return False, "Choose a valid color for Wild"
-            self.current_color = chosen_color
-        else:
-            self.current_color = card.color
+        self.current_color = chosen_color if card.is_wild() else card.color
 
         self._apply_action_effect(card, prev_effective_color=prev_effective_color)
 
@@ -287,7 +558,8 @@ class Game:
         if len(player.hand) == 0 and self.pending_plus4 is None:
             self.game_over = True
             self.winner_index = player_idx
-
+        # The effect may have changed state after a nested bump (hand swaps, +4 pending)
+        self.version += 1
         return True, None
 
     def is_playable(self, card: Card) -> bool:
@@ -301,14 +573,33 @@ class Game:
         # +4 legality not enforced here (challenge handles it)
         return self.get_valid_moves(player_idx)
 
+    def _memo(self) -> dict:
+        """Results derived from the current state; emptied whenever version has moved."""
+        if self._memo_version != self.version:
+            self._memo_version = self.version
+            self._memo_cache = {}
+        return self._memo_cache
+
     def allowed_moves(self, player_idx: int) -> List[Card]:
+        """Cards player_idx may play now. Cached per state version: treat the list as read-only."""
+        memo = self._memo()
+        moves = memo.get(player_idx)
+        if moves is None:
+            moves = memo[player_idx] = self._allowed_moves(player_idx)
+        return moves
+
+    def _allowed_moves(self, player_idx: int) -> List[Card]:
         # If a +4 is pending or initial wild color is pending, no normal plays are allowed
         if self.pending_plus4 is not None:
+            if self.rules.stacking and self.pending_plus4.target == player_idx:
+                return [c for c in self.players[player_idx].hand if c.value == "+4"]
             return []
         if self.pending_initial_wild_for is not None and player_idx == self.pending_initial_wild_for:
             return []
         if player_idx != self.current_index:
             return []
+        if self.draw_stack:
+            return [c for c in self.players[player_idx].hand if c.value == "+2"]
         if self.drew_this_turn:
             if self.last_drawn_card and self.is_playable(self.last_drawn_card):
                 # Ensure the card is still in hand (it should be)
@@ -326,6 +617,8 @@ class Game:
             return False, "Choose a starting color first"
         if player_idx != self.current_index:
             return False, "It's not your turn"
+        if self.draw_stack:
+            return False, f"Take the {self.draw_stack} stacked cards or stack a +2"
         if self.drew_this_turn:
             return False, "You can draw only 1 card per turn"
         return True, None
@@ -334,10 +627,11 @@ class Game:
         ok, err = self.can_draw(player_idx)
         if not ok:
             return False, err, None
-        if len(self.deck.cards) < 1:
-            self._recycle_discard_into_deck()
-        drawn = self.players[player_idx].draw(self.deck, 1)
-        card = drawn[0]
+        color = self.effective_color()
+        if color is not None:
+            self.color_draws[player_idx * len(COLORS) + _COLOR_IDS[color]] += 1
+        card = self.rules.draw(self, player_idx)
+        self.version += 1
         self.drew_this_turn = True
         self.last_drawn_card = card
         return True, None, card
@@ -356,7 +650,10 @@ class Game:
         return True, None
 
     def _apply_action_effect(self, card: Card, initial: bool = False, prev_effective_color: Optional[str] = None) -> None:
-        """Apply effects of action cards. For +4, use prev_effective_color to evaluate legality before the wild color change."""
+        """Apply the effect of card through the rule set's dispatch table (see HouseRules).
+
+        For +4, prev_effective_color is the color in effect before the play, used to judge legality.
+        """
         prev_idx = self.current_index
         # Clear previous penalty info
         self.last_penalty = None
@@ -365,38 +662,53 @@ class Game:
             target_idx = self.current_index
         else:
             target_idx = self.next_player_index(1)
-
-        if card.value == "Skip":
-            self.advance_turn(2)
-        elif card.value == "Reverse":
-            self.direction *= -1
-            self.advance_turn(1)
-        elif card.value == "+2":
-            self.draw_cards(target_idx, 2)
-            self.last_penalty = (target_idx, 2)
-            self.advance_turn(2)
-        elif card.value == "Wild":
-            self.advance_turn(1)
-        elif card.value == "+4":
-            # Use prev_effective_color to evaluate legality
-            if prev_effective_color is None:
-                was_legal = True
-            else:
-                was_legal = not self.player_has_color(prev_idx, prev_effective_color)
-            self.pending_plus4 = {"played_by": prev_idx, "target": target_idx, "was_legal": was_legal}
-            self.current_index = target_idx
-        else:
-            self.advance_turn(1)
-        if self.current_index == prev_idx and card.value != "+4":
+        self.rules.effects[card.value](self, card, prev_idx, target_idx, prev_effective_color)
+        if self.current_index == prev_idx and self.pending_plus4 is None:
             self.advance_turn(1)
 
+    # --- House-rule actions ---
+    def _can_stack_plus4(self, player_idx: int, card: Card) -> bool:
+        return self.rules.stacking and card.value == "+4" and self.pending_plus4.target == player_idx
+
+    def accept_draw_stack(self, player_idx: int) -> Tuple[bool, Optional[str]]:
+        """Take the stacked +2 penalty and lose the turn (stacking house rule)."""
+        if self.game_over or not self.draw_stack or player_idx != self.current_index:
+            return False, None
+        n = self.draw_stack
+        self.version += 1
+        self.draw_stack = 0
+        self.draw_cards(player_idx, n)
+        self.last_penalty = (player_idx, n)
+        self.advance_turn(1)
+        return True, None
+
+    def can_jump_in(self, player_idx: int, card: Card) -> bool:
+        """Jump-in house rule: a card identical to the top card may be played out of turn."""
+        return (self.rules.jump_in and not self.game_over and player_idx != self.current_index
+                and self.pending_plus4 is None and self.pending_initial_wild_for is None and not self.draw_stack
+                and not card.is_wild() and card == self.top_card() and card in self.players[player_idx].hand)
+
+    def jump_in_candidate(self) -> Optional[Tuple[int, Card]]:
+        """First seat after the current player, in turn order, that can jump in, with its card."""
+        if not self.rules.jump_in:
+            return None
+        top = self.top_card()
+        for step in range(1, len(self.players)):
+            idx = self.next_player_index(step)
+            for c in self.players[idx].hand:
+                if c == top and self.can_jump_in(idx, c):
+                    return idx, c
+        return None
+
     # --- +4 Challenge resolution ---
     def accept_plus4(self, player_idx: int) -> Tuple[bool, Optional[str]]:
-        if self.pending_plus4 is None or self.pending_plus4.get("target") != player_idx:
+        if self.pending_plus4 is None or self.pending_plus4.target != player_idx:
             return False, None
-        played_by = self.pending_plus4["played_by"]
-        self.draw_cards(player_idx, 4)
-        self.last_penalty = (player_idx, 4)
+        played_by = self.pending_plus4.played_by
+        penalty = self.pending_plus4.penalty
+        self.draw_cards(player_idx, penalty)
+        self.version += 1
+        self.last_penalty = (player_idx, penalty)
         self.pending_plus4 = None
         # If +4 player had no cards (played +4 as last card), they win now
         if len(self.players[played_by].hand) == 0:
@@ -407,13 +719,19 @@ class Game:
         return True, None
 
     def challenge_plus4(self, player_idx: int) -> Tuple[bool, Optional[str], bool]:
-        if self.pending_plus4 is None or self.pending_plus4.get("target") != player_idx:
+        if self.pending_plus4 is None or self.pending_plus4.target != player_idx:
             return False, None, False
-        played_by = self.pending_plus4["played_by"]
-        was_legal = self.pending_plus4["was_legal"]
+        played_by = self.pending_plus4.played_by
+        was_legal = self.pending_plus4.was_legal
+        penalty = self.pending_plus4.penalty
+        self.version += 1
+        self.plus4_challenges += 1
+        if not was_legal:
+            self.plus4_challenges_won += 1
         if was_legal:
-            self.draw_cards(player_idx, 6)
-            self.last_penalty = (player_idx, 6)
+            self.draw_cards(player_idx, penalty + 2)
+            self.version += 1
+            self.last_penalty = (player_idx, penalty + 2)
             self.pending_plus4 = None
             # If +4 player had no cards (played +4 as last card), they win now
             if len(self.players[played_by].hand) == 0:
@@ -422,8 +740,9 @@ class Game:
                 return True, None, was_legal
             self.advance_turn(1)
         else:
-            self.draw_cards(played_by, 4)
-            self.last_penalty = (played_by, 4)
+            self.draw_cards(played_by, penalty)
+            self.version += 1
+            self.last_penalty = (played_by, penalty)
             self.pending_plus4 = None
             # current_index remains with challenger
         return True, None, was_legal
@@ -458,6 +777,186 @@ class Game:
     def current_player(self) -> Player:
         return self.players[self.current_index]
 
+    # --- State export (checkpoints, hand-off to other processes) ---
+    def to_state(self) -> dict:
+        """Full game state as plain JSON-compatible values; see from_state()."""
+        last_drawn = None
+        if self.last_drawn_card is not None and self.players:
+            for i, c in enumerate(self.players[self.current_index].hand):
+                if c is self.last_drawn_card:
+                    last_drawn = i
+                    break
+        return {
+            "players": [{"name": p.name, "is_human": p.is_human, "hand": [_card_state(c) for c in p.hand]}
+                        for p in self.players],
+            "deck": [_card_state(c) for c in self.deck.cards],
+            "discard": [_card_state(c) for c in self.discard_pile],
+            "current_index": self.current_index,
+            "direction": self.direction,
+            "current_color": self.current_color,
+            "game_over": self.game_over,
+            "drew_this_turn": self.drew_this_turn,
+            "last_drawn": last_drawn,
+            "last_penalty": list(self.last_penalty) if self.last_penalty else None,
+            "winner_index": self.winner_index,
+            "pending_plus4": ([self.pending_plus4.played_by, self.pending_plus4.target, self.pending_plus4.was_legal,
+                               self.pending_plus4.penalty, self.pending_plus4.prev_color]
+                              if self.pending_plus4 else None),
+            "pending_initial_wild_for": self.pending_initial_wild_for,
+            "rules": self.rules.names(),
+            "draw_stack": self.draw_stack,
+            "stats": [self.turns, self.recycles, self.plus4_challenges, self.plus4_challenges_won, self.draws],
+            "persona_picks": list(self.persona_picks),
+            "color_draws": list(self.color_draws),
+            "rng": rng_state(self.rng),
+            "bot_rng": rng_state(self.bot_rng),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> Game:
+        """Rebuild a Game from to_state() output; play continues exactly, random streams included."""
+        game = cls(num_players=len(state["players"]), rules=HouseRules.from_names(state.get("rules", ())))
+        set_rng_state(game.rng, state["rng"])
+        set_rng_state(game.bot_rng, state["bot_rng"])
+        piles = _pooled([[_CARD_IDS[c, v] for c, v in pile] for pile in
+                         [ps["hand"] for ps in state["players"]] + [state["deck"], state["discard"]]])
+        for ps, cards in zip(state["players"], piles):
+            player = Player(ps["name"], is_human=ps["is_human"])
+            player.hand.extend(cards)
+            game.players.append(player)
+        game.deck.cards = piles[-2]
+        game.discard_pile = piles[-1]
+        game.current_index = state["current_index"]
+        game.direction = state["direction"]
+        game.current_color = state["current_color"]
+        game.game_over = state["game_over"]
+        game.drew_this_turn = state["drew_this_turn"]
+        if state["last_drawn"] is not None:
+            game.last_drawn_card = game.players[game.current_index].hand[state["last_drawn"]]
+        game.last_penalty = tuple(state["last_penalty"]) if state["last_penalty"] else None
+        game.winner_index = state["winner_index"]
+        if state["pending_plus4"]:
+            game.pending_plus4 = PendingPlus4(*state["pending_plus4"])
+        game.pending_initial_wild_for = state["pending_initial_wild_for"]
+        game.draw_stack = state.get("draw_stack", 0)
+        # States saved before draws and persona picks were counted have neither
+        game.turns, game.recycles, game.plus4_challenges, game.plus4_challenges_won = state["stats"][:4]
+        game.draws = state["stats"][4] if len(state["stats"]) > 4 else 0
+        game.persona_picks = list(state.get("persona_picks", game.persona_picks))
+        game.color_draws = list(state.get("color_draws", game.color_draws))
+        return game
+
+    def to_bytes(self, include_rng: bool = False) -> bytes:
+        """Compact binary state (about 150 bytes) for handing a position to another process.
+
+        Cards are one byte each (see CARD_KINDS), hands, deck and discard are
+        stored as counts followed by card ids, flags are packed into bits and
+        the counters are varints (one byte each while below 128); of the per
+        player and color draw counts only the nonzero ones are stored.
+        Player names are not stored (from_bytes uses the setup names). The
+        random streams add 5 KB, so they are only included on request; without
+        them the position round-trips exactly and the copy gets fresh streams.
+        """
+        p4 = self.pending_plus4
+        flags = ((self.game_over and _GAME_OVER) | (self.drew_this_turn and _DREW) | (self.direction < 0 and _REVERSED)
+                 | (p4 is not None and _PLUS4) | (p4 is not None and p4.was_legal and _PLUS4_LEGAL)
+                 | (include_rng and _HAS_RNG))
+        humans = 0
+        for i, p in enumerate(self.players):
+            if p.is_human:
+                humans |= 1 << i
+        last_drawn = _NONE
+        if self.last_drawn_card is not None and self.players:
+            for i, c in enumerate(self.players[self.current_index].hand):
+                if c is self.last_drawn_card:
+                    last_drawn = i
+                    break
+        penalty_target, penalty = self.last_penalty if self.last_penalty else (_NONE, 0)
+        head = _BYTES_HEADER.pack(
+            _BYTES_VERSION, flags, self.rules.mask(), humans, self.current_index,
+            _NONE if self.current_color is None else _COLOR_IDS[self.current_color],
+            _NONE if self.winner_index is None else self.winner_index,
+            p4.played_by if p4 else _NONE, p4.target if p4 else _NONE, p4.penalty if p4 else 0,
+            _NONE if p4 is None or p4.prev_color is None else _COLOR_IDS[p4.prev_color],
+            _NONE if self.pending_initial_wild_for is None else self.pending_initial_wild_for,
+            last_drawn, penalty_target, penalty, self.draw_stack, len(self.players))
+        piles = [p.hand for p in self.players] + [self.deck.cards, self.discard_pile]
+        ids = _CARD_IDS
+        drawn = 0
+        for i, n in enumerate(self.color_draws):
+            if n:
+                drawn |= 1 << i
+        parts = [head, drawn.to_bytes(-(-len(self.color_draws) // 8), "little"),
+                 _pack_varints((self.turns, self.recycles, self.plus4_challenges, self.plus4_challenges_won,
+                                self.draws, *self.persona_picks, *filter(None, self.color_draws))),
+                 bytes(map(len, piles))]
+        parts.extend(bytes([ids[c.color, c.value] for c in pile]) for pile in piles)
+        if include_rng:
+            parts.append(_pack_rng(self.rng))
+            parts.append(_pack_rng(self.bot_rng))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, rng: Optional[random.Random] = None,
+                   bot_rng: Optional[random.Random] = None) -> Game:
+        """Rebuild a Game from to_bytes() output.
+
+        Random streams stored in data are restored; otherwise rng and bot_rng
+        (or fresh streams) are used.
+        """
+        (version, flags, rules, humans, current_index, color, winner, p4_by, p4_target, p4_penalty, p4_color,
+         initial_for, last_drawn, penalty_target, penalty, draw_stack, num_players) = _BYTES_HEADER.unpack_from(data)
+        if version != _BYTES_VERSION:
+            raise ValueError(f"Unsupported state version {version}")
+        pos = _BYTES_HEADER.size
+        slots = num_players * len(COLORS)
+        width = -(-slots // 8)
+        drawn = int.from_bytes(data[pos:pos + width], "little")
+        counters, pos = _unpack_varints(data, pos + width, 5 + len(PERSONAS) + bin(drawn).count("1"))
+        turns, recycles, challenges, challenges_won, draws = counters[:5]
+        persona_picks = counters[5:5 + len(PERSONAS)]
+        nonzero = iter(counters[5 + len(PERSONAS):])
+        color_draws = [next(nonzero) if drawn >> i & 1 else 0 for i in range(slots)]
+        counts = data[pos:pos + num_players + 2]
+        pos += num_players + 2
+        ids = []
+        for n in counts:
+            ids.append(data[pos:pos + n])
+            pos += n
+        piles = _pooled(ids)
+        rng = rng if rng is not None else random.Random()
+        bot_rng = bot_rng if bot_rng is not None else random.Random()
+        if flags & _HAS_RNG:
+            pos = _unpack_rng(rng, data, pos)
+            _unpack_rng(bot_rng, data, pos)
+        game = cls(num_players=num_players, rng=rng, bot_rng=bot_rng, rules=HouseRules.from_mask(rules),
+                   deck=Deck(rng, cards=piles[num_players]))
+        game.players = [Player(SEAT_NAMES[i], is_human=bool(humans >> i & 1))
+                        for i in range(num_players)]
+        for player, cards in zip(game.players, piles):
+            player.hand.extend(cards)
+        game.discard_pile = piles[num_players + 1]
+        game.current_index = current_index
+        game.direction = -1 if flags & _REVERSED else 1
+        game.current_color = None if color == _NONE else COLORS[color]
+        game.game_over = bool(flags & _GAME_OVER)
+        game.drew_this_turn = bool(flags & _DREW)
+        if last_drawn != _NONE:
+            game.last_drawn_card = piles[current_index][last_drawn]
+        game.last_penalty = (penalty_target, penalty) if penalty_target != _NONE else None
+        game.winner_index = None if winner == _NONE else winner
+        if flags & _PLUS4:
+            game.pending_plus4 = PendingPlus4(p4_by, p4_target, bool(flags & _PLUS4_LEGAL), p4_penalty,
+                                             None if p4_color == _NONE else COLORS[p4_color])
+        game.pending_initial_wild_for = None if initial_for == _NONE else initial_for
+        game.draw_stack = draw_stack
+        game.turns, game.recycles, game.plus4_challenges, game.plus4_challenges_won = (
+            turns, recycles, challenges, challenges_won)
+        game.draws = draws
+        game.persona_picks = persona_picks
+        game.color_draws = color_draws
+        return game
+
     # --- Bot helpers and AI ---
     def choose_color_for_bot(self, player_idx: int) -> str:
         """Pick the most frequent color in bot's hand; fallback random."""
@@ -468,7 +967,7 @@ class Game:
                 counts[card.color] += 1
         best_color = max(counts, key=lambda c: counts[c])
         if counts[best_color] == 0:
-            return random.choice(COLORS)
+            return self.bot_rng.choice(COLORS)
         return best_color
 
     def _color_counts(self, cards: List[Card]) -> dict:
@@ -478,85 +977,41 @@ class Game:
                 counts[c.color] += 1
         return counts
 
+    def _hand_colors(self, player_idx: int) -> dict:
+        """Color counts of a hand, cached per state version (read-only)."""
+        memo = self._memo()
+        key = ("colors", player_idx)
+        counts = memo.get(key)
+        if counts is None:
+            counts = memo[key] = self._color_counts(self.players[player_idx].hand)
+        return counts
+
+    def _colors_after(self, player_idx: int, played: Card) -> dict:
+        counts = self._hand_colors(player_idx)
+        if played.color in counts and played in self.players[player_idx].hand:
+            counts = dict(counts)
+            counts[played.color] -= 1
+        return counts
+
     def _best_color_after_play(self, player_idx: int, played: Card) -> str:
         # Choose color maximizing remaining hand color count after removing played
-        hand = list(self.players[player_idx].hand)
-        try:
-            hand.remove(played)
-        except ValueError:
-            pass
-        counts = self._color_counts(hand)
+        counts = self._colors_after(player_idx, played)
         best = max(counts, key=lambda k: counts[k])
-        return best if counts[best] > 0 else random.choice(COLORS)
+        return best if counts[best] > 0 else self.bot_rng.choice(COLORS)
 
     def _distinct_colors_after(self, player_idx: int, played: Card, chosen_color: Optional[str]) -> int:
-        hand = list(self.players[player_idx].hand)
-        try:
-            hand.remove(played)
-        except ValueError:
-            pass
-        colors = set([c.color for c in hand if c.color in COLORS])
-        return len(colors)
+        return sum(1 for n in self._colors_after(player_idx, played).values() if n > 0)
 
     def _pick_persona(self) -> dict:
-        personas = [
-            {  # Aggressive
-                "name": "Aggressive",
-                "impact_mult": {"+4": 1.4, "+2": 1.3, "Skip": 1.2, "Reverse": 1.0, "_default": 1.0},
-                "color_bias": 1.0,
-                "diversity_bias": 1.0,
-                "wild_penalty": 2.0,
-                "high_points_bias": 0.05,
-                "random_prob": 0.08,
-                "next_uno_scale": 1.2,
-            },
-            {  # Conservative
-                "name": "Conservative",
-                "impact_mult": {"+4": 0.9, "+2": 0.95, "Skip": 1.0, "Reverse": 1.0, "_default": 1.1},
-                "color_bias": 1.2,
-                "diversity_bias": 1.1,
-                "wild_penalty": 5.0,
-                "high_points_bias": 0.02,
-                "random_prob": 0.07,
-                "next_uno_scale": 1.0,
-            },
-            {  # Monochrome (color focusing)
-                "name": "Monochrome",
-                "impact_mult": {"+4": 1.0, "+2": 1.0, "Skip": 1.0, "Reverse": 1.0, "_default": 1.0},
-                "color_bias": 2.0,
-                "diversity_bias": 1.6,
-                "wild_penalty": 3.0,
-                "high_points_bias": 0.03,
-                "random_prob": 0.10,
-                "next_uno_scale": 1.0,
-            },
-            {  # Chaotic
-                "name": "Chaotic",
-                "impact_mult": {"+4": 1.0, "+2": 1.0, "Skip": 1.0, "Reverse": 1.0, "_default": 1.0},
-                "color_bias": 0.8,
-                "diversity_bias": 0.8,
-                "wild_penalty": 2.0,
-                "high_points_bias": 0.0,
-                "random_prob": 0.35,
-                "next_uno_scale": 0.8,
-            },
-            {  # Finisher
-                "name": "Finisher",
-                "impact_mult": {"+4": 1.2, "+2": 1.1, "Skip": 1.1, "Reverse": 1.0, "_default": 1.0},
-                "color_bias": 1.0,
-                "diversity_bias": 1.2,
-                "wild_penalty": 3.5,
-                "high_points_bias": 0.15,
-                "random_prob": 0.12,
-                "next_uno_scale": 1.3,
-            },
-        ]
-        return random.choice(personas)
+        # Same draw from bot_rng as choice(PERSONAS)
+        i = self.bot_rng.randrange(len(PERSONAS))
+        self.persona_picks[i] += 1
+        return PERSONAS[i]
 
     def _score_move(self, player_idx: int, card: Card, chosen_color: Optional[str], persona: Optional[dict] = None) -> float:
         # If playing this card wins immediately, prefer it
         if len(self.players[player_idx].hand) == 1:
-            return math.inf
+            return float("inf")
         persona = persona or {}
         impact_mult = persona.get("impact_mult", {})
         color_bias = persona.get("color_bias", 1.0)
@@ -589,7 +1044,7 @@ class Game:
         # Favor setting a color we hold
         color_to_set = chosen_color if card.is_wild() else card.color
         if color_to_set in COLORS:
-            counts = self._color_counts([c for c in self.players[player_idx].hand if c is not card])
+            counts = self._colors_after(player_idx, card)
             score += counts.get(color_to_set, 0) * 2.0 * color_bias
 
         # Prefer lower color diversity after play
@@ -603,8 +1058,8 @@ class Game:
             score -= wild_penalty
         return score
 
-    def choose_best_move(self, player_idx: int) -> Tuple[str, Optional[Card], Optional[str]]:
-        """Return (action, card, chosen_color). 'draw' if no allowed move. Persona randomized per turn."""
+    def choose_best_move(self, player_idx: int, persona: Optional[dict] = None) -> Tuple[str, Optional[Card], Optional[str]]:
+        """Return (action, card, chosen_color). 'draw' if no allowed move. Persona randomized per turn unless given."""
         moves = self.allowed_moves(player_idx)
         if not moves:
             return "draw", None, None
@@ -612,13 +1067,14 @@ class Game:
             card = moves[0]
             color = self._best_color_after_play(player_idx, card) if card.is_wild() else None
             return "play", card, color
-        persona = self._pick_persona()
+        if persona is None:
+            persona = self._pick_persona()
         # Random human-like behavior
-        if random.random() < persona.get("random_prob", 0.0):
-            card = random.choice(moves)
+        if self.bot_rng.random() < persona.get("random_prob", 0.0):
+            card = self.bot_rng.choice(moves)
             color = self._best_color_after_play(player_idx, card) if card.is_wild() else None
             return "play", card, color
-        best_score = -math.inf
+        best_score = -float("inf")
         best_move: Optional[Card] = None
         best_color: Optional[str] = None
         ordered = [c for c in moves if not c.is_wild()] + [c for c in moves if c.is_wild()]
@@ -631,6 +1087,82 @@ class Game:
                 best_color = color
         return "play", best_move, best_color
 
+    def acting_player(self) -> Optional[int]:
+        """Index of the seat that must act next: the +4 target, the starting-color chooser or the current player."""
+        if self.game_over:
+            return None
+        if self.pending_plus4 is not None:
+            return self.pending_plus4.target
+        if self.pending_initial_wild_for is not None:
+            return self.pending_initial_wild_for
+        return self.current_index
+
+    def bot_decision(self, player_idx: int, persona: Optional[dict] = None) -> Tuple[str, Optional[Card], Optional[str]]:
+        """Decide a bot's next action without changing the game.
+
+        persona (one of PERSONAS) fixes the play style; by default every turn
+        picks one at random.
+
+        Returns (action, card, color) where action is 'color' (starting Wild),
+        'accept'/'challenge' (+4 response, 'accept' also takes a stacked +2
+        penalty), 'play' or 'draw'.
+        """
+        if self.is_plus4_pending_for(player_idx):
+            if self.rules.stacking:
+                # Pass the penalty on whenever possible
+                for card in self.allowed_moves(player_idx):
+                    return "play", card, self._best_color_after_play(player_idx, card)
+            # Challenge when the estimated chance that the +4 was illegal beats the break-even
+            # odds: a won challenge saves the penalty, a lost one costs 2 more cards
+            p4 = self.pending_plus4
+            if PLUS4_MODEL.table is None:
+                # No table to judge by: challenge half the time
+                return ("challenge" if self.bot_rng.random() < 0.5 else "accept"), None, None
+            if p4 is not None and PLUS4_MODEL.probability(self) > 2 / (p4.penalty + 2):
+                return "challenge", None, None
+            return "accept", None, None
+        if self.pending_initial_wild_for == player_idx:
+            return "color", None, self.choose_color_for_bot(player_idx)
+        move = self.choose_best_move(player_idx, persona)
+        if move[0] == "draw" and self.draw_stack:
+            return "accept", None, None
+        return move
+
+    def apply_bot_decision(self, player_idx: int, decision: Tuple[str, Optional[Card], Optional[str]]) -> Tuple[str, Optional[Card], Optional[str]]:
+        """Apply a bot_decision() result and return what actually happened.
+
+        A 'draw' resolves to 'draw_play' when the drawn card is playable and to
+        'draw_pass' otherwise, mirroring the GUI bot turn.
+        """
+        action, card, color = decision
+        if action == "color":
+            self.set_initial_wild_color(color)
+            return decision
+        if action == "accept":
+            if self.pending_plus4 is not None:
+                self.accept_plus4(player_idx)
+            else:
+                self.accept_draw_stack(player_idx)
+            return decision
+        if action == "challenge":
+            self.challenge_plus4(player_idx)
+            return decision
+        if action == "play" and card is not None:
+            ok, _ = self.play_card(player_idx, card, chosen_color=color)
+            if ok:
+                return decision
+        ok, _, drawn = self.draw_one_action(player_idx)
+        if ok and drawn and self.is_playable(drawn):
+            color2 = self.choose_color_for_bot(player_idx) if drawn.is_wild() else None
+            self.play_card(player_idx, drawn, chosen_color=color2)
+            return "draw_play", drawn, color2
+        self.advance_turn(1)
+        return "draw_pass", drawn, None
+
+    def bot_act(self, player_idx: int) -> Tuple[str, Optional[Card], Optional[str]]:
+        """Let the bot in player_idx take its pending decision; see apply_bot_decision."""
+        return self.apply_bot_decision(player_idx, self.bot_decision(player_idx))
+
     def _recycle_discard_into_deck(self) -> None:
         """Recycle the discard pile (except the top card) back into the deck and shuffle."""
         if len(self.discard_pile) <= 1:
@@ -639,12 +1171,15 @@ class Game:
         top = self.discard_pile[-1]
         rest = self.discard_pile[:-1]
         self.discard_pile = [top]
-        random.shuffle(rest)
+        self.rng.shuffle(rest)
+        self.recycles += 1
         # Put recycled cards under current deck order (or simply assign if empty)
         self.deck.cards = rest + self.deck.cards
 
     def draw_cards(self, player_idx: int, n: int) -> None:
         """Draw n cards for the specified player, recycling deck as needed."""
+        self.version += 1
+        self.draws += n
         player = self.players[player_idx]
         for _ in range(n):
             if not self.deck.cards:
@@ -653,7 +1188,7 @@ class Game:
             if not self.deck.cards:
                 # Build a fresh deck and remove the current top card if present in it
                 current_top = self.top_card() if self.discard_pile else None
-                self.deck._build_deck()
+                self.deck._build_deck(shared=False)
                 # Remove one instance of current_top from deck if possible
                 if current_top is not None:
                     try:
@@ -662,3 +1197,348 @@ class Game:
                         pass
                     self.deck.shuffle()
             player.draw(self.deck, 1)
+
+
+# --- Card effects and house rules ---
+# Effects take (game, card, player who played it, next player, color in effect before the play)
+def _effect_advance(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    game.advance_turn(1)
+
+
+def _effect_skip(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    game.advance_turn(2)
+
+
+def _effect_reverse(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    game.direction *= -1
+    game.advance_turn(1)
+
+
+def _effect_draw_two(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    game.draw_cards(target_idx, 2)
+    game.last_penalty = (target_idx, 2)
+    game.advance_turn(2)
+
+
+def _hand_turn_to(game: Game, target_idx: int) -> None:
+    # The +4 target answers (and keeps the turn after a successful challenge) without
+    # inheriting the previous player's draw of this turn
+    game.version += 1
+    game.current_index = target_idx
+    game.drew_this_turn = False
+    game.last_drawn_card = None
+
+
+def _effect_wild_draw_four(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    # Legal only if the player held no card of the color in effect before the +4
+    was_legal = prev_color is None or not game.player_has_color(player_idx, prev_color)
+    game.pending_plus4 = PendingPlus4(played_by=player_idx, target=target_idx, was_legal=was_legal,
+                                     prev_color=prev_color)
+    _hand_turn_to(game, target_idx)
+
+
+def _effect_stack_two(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    # The next player stacks another +2 or takes the whole pile (accept_draw_stack)
+    game.draw_stack += 2
+    game.advance_turn(1)
+
+
+def _effect_stack_four(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    # A +4 played onto a pending +4 forfeits that challenge and passes both penalties on
+    stacked = game.pending_plus4.penalty if game.pending_plus4 is not None else 0
+    was_legal = prev_color is None or not game.player_has_color(player_idx, prev_color)
+    game.pending_plus4 = PendingPlus4(player_idx, target_idx, was_legal, penalty=stacked + 4, prev_color=prev_color)
+    _hand_turn_to(game, target_idx)
+
+
+def _effect_seven_swap(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    # 7: swap hands with the opponent holding the fewest cards (earliest in turn order on ties)
+    if game.players[player_idx].hand:
+        other = min((game.next_player_index(k) for k in range(1, len(game.players))),
+                    key=lambda i: len(game.players[i].hand))
+        a, b = game.players[player_idx], game.players[other]
+        a.hand, b.hand = b.hand, a.hand
+    game.advance_turn(1)
+
+
+def _effect_zero_rotate(game: Game, card: Card, player_idx: int, target_idx: int, prev_color: Optional[str]) -> None:
+    # 0: every hand moves one seat along the direction of play
+    if game.players[player_idx].hand:
+        hands = [p.hand for p in game.players]
+        for i, p in enumerate(game.players):
+            p.hand = hands[(i - game.direction) % len(hands)]
+    game.advance_turn(1)
+
+
+def _draw_one(game: Game, player_idx: int) -> Card:
+    if len(game.deck.cards) < 1:
+        game._recycle_discard_into_deck()
+    if not game.deck.cards:
+        # Every other card is in a hand: draw_cards rebuilds a fresh deck
+        game.draw_cards(player_idx, 1)
+        return game.players[player_idx].hand[-1]
+    game.draws += 1
+    return game.players[player_idx].draw(game.deck, 1)[0]
+
+
+def _draw_until_playable(game: Game, player_idx: int) -> Card:
+    card = _draw_one(game, player_idx)
+    # Bounded by the cards left to draw (deck plus recyclable discards) in case none is playable
+    for _ in range(len(game.deck.cards) + len(game.discard_pile) - 2):
+        if game.is_playable(card):
+            break
+        card = _draw_one(game, player_idx)
+    return card
+
+
+class HouseRules:
+    """Optional house-rule variants; HouseRules() is the official rule set.
+
+    Card effects are compiled once into a table indexed by card value and
+    variants replace entries in it, so a play costs one lookup however many
+    variants are enabled.
+
+    - stacking: a +2 may be answered with a +2 and a +4 with a +4; the last
+      player in the chain takes the total
+    - seven_zero: a 7 swaps hands with the opponent holding the fewest cards,
+      a 0 passes every hand one seat along the direction of play
+    - jump_in: a card identical to the top card may be played out of turn
+    - draw_until_playable: drawing continues until a playable card comes up
+    """
+    __slots__ = ("stacking", "seven_zero", "jump_in", "draw_until_playable", "effects", "draw")
+    NAMES = ("stacking", "seven_zero", "jump_in", "draw_until_playable")
+
+    def __init__(self, stacking: bool = False, seven_zero: bool = False, jump_in: bool = False,
+                 draw_until_playable: bool = False) -> None:
+        self.stacking = stacking
+        self.seven_zero = seven_zero
+        self.jump_in = jump_in
+        self.draw_until_playable = draw_until_playable
+        effects = {value: _effect_advance for value in VALUES}
+        effects.update({"Skip": _effect_skip, "Reverse": _effect_reverse, "+2": _effect_draw_two,
+                        "Wild": _effect_advance, "+4": _effect_wild_draw_four})
+        if stacking:
+            effects["+2"] = _effect_stack_two
+            effects["+4"] = _effect_stack_four
+        if seven_zero:
+            effects["7"] = _effect_seven_swap
+            effects["0"] = _effect_zero_rotate
+        self.effects = effects
+        self.draw = _draw_until_playable if draw_until_playable else _draw_one
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> HouseRules:
+        names = list(names)
+        unknown = [n for n in names if n not in cls.NAMES]
+        if unknown:
+            raise ValueError(f"Unknown house rule(s): {', '.join(unknown)}")
+        return cls(**{n: True for n in names})
+
+    def names(self) -> List[str]:
+        return [n for n in self.NAMES if getattr(self, n)]
+
+    def mask(self) -> int:
+        return sum(1 << i for i, n in enumerate(self.NAMES) if getattr(self, n))
+
+    @classmethod
+    def from_mask(cls, mask: int) -> HouseRules:
+        if not mask:
+            return OFFICIAL_RULES
+        return cls(*(bool(mask >> i & 1) for i in range(len(cls.NAMES))))
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not HouseRules:
+            return NotImplemented
+        return self.names() == other.names()
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.names()))
+
+    def __repr__(self) -> str:
+        return f"HouseRules({', '.join(n + '=True' for n in self.names())})"
+
+    def __reduce__(self):
+        return HouseRules, tuple(getattr(self, n) for n in self.NAMES)
+
+    def __deepcopy__(self, memo: dict) -> HouseRules:
+        # Immutable once built; copies of a game share it
+        return self
+
+
+OFFICIAL_RULES = HouseRules()
+
+
+# --- Binary state (Game.to_bytes / from_bytes) ---
+# Card id -> (color, value): the 13 colored values per color, then Wild and +4
+CARD_KINDS: List[Tuple[Optional[str], str]] = (
+    [(color, value) for color in COLORS for value in VALUES + ACTIONS] + [(None, value) for value in WILDS])
+_CARD_IDS = {kind: i for i, kind in enumerate(CARD_KINDS)}
+# Per card id, the instances shared by every game in this process (grown on demand);
+# a game holding n cards of one kind uses the first n, so they stay distinct within it
+_CARD_POOL: List[List[Card]] = [[] for _ in CARD_KINDS]
+
+
+def _pooled(piles: Iterable[Iterable[int]]) -> List[List[Card]]:
+    """Piles of card ids -> piles of pooled cards, no instance used twice across the piles."""
+    pool = _CARD_POOL
+    used = [0] * len(CARD_KINDS)
+    out = []
+    for ids in piles:
+        pile = []
+        for k in ids:
+            copies = pool[k]
+            j = used[k]
+            used[k] = j + 1
+            if j == len(copies):
+                copies.append(_new_card(*CARD_KINDS[k]))
+            pile.append(copies[j])
+        out.append(pile)
+    return out
+
+
+# The 108 cards in the order Deck._build_deck lays them out: per color one 0 and two
+# of each 1-9, then two of each action per color, then four each of Wild and +4
+_DECK_KINDS: List[Tuple[Optional[str], str]] = []
+for _color in COLORS:
+    _DECK_KINDS.append((_color, "0"))
+    for _n in range(1, 10):
+        _DECK_KINDS += [(_color, str(_n))] * 2
+for _color in COLORS:
+    for _action in ACTIONS:
+        _DECK_KINDS += [(_color, _action)] * 2
+_DECK_KINDS += [(None, "Wild"), (None, "+4")] * 4
+del _color, _n, _action
+_SHARED_DECK: List[Card] = _pooled([[_CARD_IDS[kind] for kind in _DECK_KINDS]])[0]
+_COLOR_IDS = {color: i for i, color in enumerate(COLORS)}
+_NONE = 255
+_BYTES_VERSION = 4
+# version, flags, rules mask, human seats mask, current index, current color, winner,
+# +4 played by / target / penalty / color before it, initial Wild chooser, last drawn hand index,
+# last penalty target / cards, draw stack, players; then a bit per player and color that
+# has drawn, as varints the turns, recycles, +4 challenges / won, draws, persona pick
+# counts and the nonzero player and color draw counts, and one count byte per pile
+_BYTES_HEADER = struct.Struct("<17B")
+_GAME_OVER, _DREW, _REVERSED, _PLUS4, _PLUS4_LEGAL, _HAS_RNG = (1 << i for i in range(6))
+_RNG = struct.Struct("<625I?d")
+
+
+def _pack_rng(rng: random.Random) -> bytes:
+    _, internal, gauss_next = rng.getstate()
+    return _RNG.pack(*internal, gauss_next is not None, gauss_next or 0.0)
+
+
+def _pack_varints(values: Iterable[int]) -> bytes:
+    """Unsigned LEB128: seven bits per byte, low bits first, high bit set on all but the last."""
+    out = bytearray()
+    for v in values:
+        while v >= 0x80:
+            out.append(v & 0x7F | 0x80)
+            v >>= 7
+        out.append(v)
+    return bytes(out)
+
+
+def _unpack_varints(data: bytes, pos: int, count: int) -> Tuple[List[int], int]:
+    values = []
+    for _ in range(count):
+        v = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            v |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(v)
+    return values, pos
+
+
+def _unpack_rng(rng: random.Random, data: bytes, pos: int) -> int:
+    values = _RNG.unpack_from(data, pos)
+    rng.setstate((3, values[:625], values[626] if values[625] else None))
+    return pos + _RNG.size
+
+
+def _card_state(card: Card) -> list:
+    return [card.color, card.value]
+
+
+def rng_state(rng: random.Random) -> list:
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def set_rng_state(rng: random.Random, state: list) -> None:
+    version, internal, gauss_next = state
+    rng.setstate((version, tuple(internal), gauss_next))
+
+
+# --- +4 challenge model ---
+class ChallengeModel:
+    """Probability that a pending +4 is illegal, looked up from public information.
+
+    The key is the color in effect before the +4, how often the player who
+    played it has drawn while that color was in effect (capped at DRAWS - 1)
+    and their hand size after the play (capped at HAND). The table is built
+    offline from simulated rounds (uno_sim.challenge_counts, `uno_cli.py
+    challenge-table`) and stored as one unsigned 16-bit fraction per key, so
+    loading it at import is one file read and a decision is one lookup.
+    """
+    __slots__ = ("table",)
+    DRAWS = 4
+    HAND = 12
+    SIZE = len(COLORS) * DRAWS * HAND
+    _HEADER = struct.Struct("<4s3B")
+    _MAGIC = b"UNO4"
+
+    def __init__(self, table: Optional[List[float]] = None) -> None:
+        # Without a table the bots fall back to challenging at random (Game.bot_decision)
+        self.table = list(table) if table is not None else None
+
+    @classmethod
+    def key(cls, game: Game) -> Optional[int]:
+        """Table index for game's pending +4; None if there is none or its color is unknown."""
+        p4 = game.pending_plus4
+        if p4 is None or p4.prev_color is None:
+            return None
+        color = _COLOR_IDS[p4.prev_color]
+        draws = min(game.color_draws[p4.played_by * len(COLORS) + color], cls.DRAWS - 1)
+        hand = min(max(len(game.players[p4.played_by].hand), 1), cls.HAND)
+        return (color * cls.DRAWS + draws) * cls.HAND + hand - 1
+
+    def probability(self, game: Game) -> float:
+        """Estimated chance that game's pending +4 was illegal (0.0 when it cannot be judged)."""
+        k = self.key(game)
+        return 0.0 if k is None or self.table is None else self.table[k]
+
+    @classmethod
+    def from_counts(cls, illegal: List[int], total: List[int], prior: float = 20.0) -> ChallengeModel:
+        """Smoothed rates: each key starts with prior pseudo-samples at the overall illegal rate."""
+        rate = sum(illegal) / max(1, sum(total))
+        return cls([(i + prior * rate) / (n + prior) for i, n in zip(illegal, total)])
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self._MAGIC, len(COLORS), self.DRAWS, self.HAND))
+            f.write(struct.pack(f"<{self.SIZE}H", *(round(p * 65535) for p in self.table)))
+
+    @classmethod
+    def load(cls, path: str) -> ChallengeModel:
+        """The table saved at path; a model without one (with a warning) if it is missing or stale."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            warnings.warn(f"No +4 challenge table ({e}); bots challenge at random. "
+                          "Build it with `python uno_cli.py challenge-table`.")
+            return cls()
+        if (len(data) != cls._HEADER.size + 2 * cls.SIZE
+                or cls._HEADER.unpack_from(data) != (cls._MAGIC, len(COLORS), cls.DRAWS, cls.HAND)):
+            warnings.warn(f"{path} does not match this table layout; bots challenge at random. "
+                          "Rebuild it with `python uno_cli.py challenge-table`.")
+            return cls()
+        return cls([v / 65535 for v in struct.unpack_from(f"<{cls.SIZE}H", data, cls._HEADER.size)])
+
+
+PLUS4_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plus4_table.bin")
+PLUS4_MODEL = ChallengeModel.load(PLUS4_TABLE)
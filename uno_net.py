@@ -0,0 +1,420 @@
+"""A bot driven by a small NumPy MLP, trained by imitation and self-play.
+
+The network maps the uno_env observation of a position to one logit per
+uno_env action; illegal actions are masked out and the bot plays the best
+remaining one. Decisions for many games are made with one matrix product
+(NetPolicy.decide_many, simulate), which is where it beats the per-card
+_score_move loop of the stock bot. NumPy is only needed here and is imported
+when a network is built or loaded.
+
+Training, from the command line:
+    imitate     fit the stock bot's moves in self-play logs (uno_cli simulate --log),
+                or in freshly played rounds
+    reinforce   REINFORCE self-play on uno_env.VecEnv, starting from saved weights
+    evaluate    win rate of the network in seat 0 against three stock bots
+    bench       decisions per second, batched network against the stock bot
+
+    python uno_net.py imitate --rounds 3000 --out net.npz
+    python uno_net.py reinforce --weights net.npz --iterations 50 --envs 256 --workers 4 --out net.npz
+    python uno_net.py evaluate --weights net.npz --rounds 2000
+    python uno_duplicate.py --policies net:net.npz,mixed --deals 500
+
+Weights are stored in .npz files (W0, b0, W1, b1, ...). As a policy the
+network is named "net:<path>" (see uno_policy.policy_by_name).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from uno_env import (ACCEPT, CHALLENGE, COLOR_BASE, DRAW, N_ACTIONS, OBS_SIZE, OPPONENTS, PENALTY, PLUS4_BASE,
+                     WILD_BASE, VecEnv, legal_actions, move_to_action, observe, observe_many)
+from uno_logic import CARD_KINDS, COLORS, Game, HouseRules
+from uno_sim import MAX_ACTIONS, Move, apply_move, new_game, play_out, record_round
+
+Decision = Tuple[str, Any, Optional[str]]
+HIDDEN = (128, 64)
+_MASKED = -1e9
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("uno_net needs NumPy: pip install numpy") from None
+    return np
+
+
+def _scale():
+    # Hand sizes and penalties are counts of up to tens of cards; bring them near the 0/1 features
+    np = _numpy()
+    scale = np.ones(OBS_SIZE, dtype=np.float32)
+    scale[OPPONENTS:OPPONENTS + 3] = 0.1
+    scale[PENALTY] = 0.25
+    return scale
+
+
+class MLP:
+    """ReLU MLP from observations to action logits, with forward and backward passes for training."""
+
+    def __init__(self, params: Dict[str, Any]) -> None:
+        np = _numpy()
+        self.np = np
+        self.weights = [params[f"W{i}"] for i in range(len(params) // 2)]
+        self.biases = [params[f"b{i}"] for i in range(len(params) // 2)]
+        self._scale = _scale()
+
+    @classmethod
+    def new(cls, hidden: Sequence[int] = HIDDEN, seed: int = 0) -> MLP:
+        np = _numpy()
+        rng = np.random.default_rng(seed)
+        sizes = [OBS_SIZE, *hidden, N_ACTIONS]
+        params = {}
+        for i, (n_in, n_out) in enumerate(zip(sizes, sizes[1:])):
+            params[f"W{i}"] = (rng.standard_normal((n_in, n_out)) * np.sqrt(2.0 / n_in)).astype(np.float32)
+            params[f"b{i}"] = np.zeros(n_out, dtype=np.float32)
+        return cls(params)
+
+    @classmethod
+    def load(cls, path: str) -> MLP:
+        np = _numpy()
+        with np.load(path) as data:
+            return cls({k: data[k].astype(np.float32) for k in data.files})
+
+    def save(self, path: str) -> None:
+        params = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            params[f"W{i}"], params[f"b{i}"] = w, b
+        self.np.savez(path, **params)
+
+    def params(self) -> List[Any]:
+        return [p for pair in zip(self.weights, self.biases) for p in pair]
+
+    def logits(self, obs) -> Any:
+        return self._forward(obs)[0]
+
+    def _forward(self, obs) -> Tuple[Any, List[Any]]:
+        x = self.np.asarray(obs, dtype=self.np.float32) * self._scale
+        activations = [x]
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < last:
+                x = self.np.maximum(x, 0.0)
+            activations.append(x)
+        return x, activations
+
+    def _backward(self, activations: List[Any], dlogits) -> List[Any]:
+        """Gradients of a loss, given its gradient wrt the logits, in params() order."""
+        grads = []
+        d = dlogits
+        for i in reversed(range(len(self.weights))):
+            grads.append(d.sum(axis=0))
+            grads.append(activations[i].T @ d)
+            if i:
+                d = (d @ self.weights[i].T) * (activations[i] > 0)
+        return grads[::-1]
+
+
+def masked_log_softmax(logits, masks):
+    np = _numpy()
+    z = np.where(masks, logits, _MASKED)
+    z = z - z.max(axis=1, keepdims=True)
+    return z - np.log(np.exp(z).sum(axis=1, keepdims=True))
+
+
+class Adam:
+    def __init__(self, params: List[Any], lr: float = 1e-3, betas: Tuple[float, float] = (0.9, 0.999),
+                 eps: float = 1e-8) -> None:
+        np = _numpy()
+        self.params = params
+        self.lr, self.betas, self.eps = lr, betas, eps
+        self.m = [np.zeros_like(p) for p in params]
+        self.v = [np.zeros_like(p) for p in params]
+        self.t = 0
+
+    def step(self, grads: List[Any]) -> None:
+        np = _numpy()
+        self.t += 1
+        b1, b2 = self.betas
+        for p, g, m, v in zip(self.params, grads, self.m, self.v):
+            m *= b1
+            m += (1 - b1) * g
+            v *= b2
+            v += (1 - b2) * g * g
+            p -= self.lr * (m / (1 - b1 ** self.t)) / (np.sqrt(v / (1 - b2 ** self.t)) + self.eps)
+
+
+# --- As a bot policy ---
+_KIND_IDS = {kind: i for i, kind in enumerate(CARD_KINDS)}
+_COLOR_CHOICES = [(COLOR_BASE + i, ("color", None, color)) for i, color in enumerate(COLORS)]
+
+
+def _policy_actions(game: Game, seat: int) -> Dict[int, Decision]:
+    """The actions open to a bot deciding for the acting seat, each as a Game.bot_decision() result.
+
+    Mirrors bot_decision rather than uno_sim.legal_moves: there is no pass
+    (a draw plays the drawn card when it can, see Game.apply_bot_decision)
+    and a stacked +2 penalty is taken with accept instead of draw.
+    """
+    if game.is_plus4_pending_for(seat):
+        actions = {ACCEPT: ("accept", None, None), CHALLENGE: ("challenge", None, None)}
+        if not game.rules.stacking:
+            return actions
+    elif game.pending_initial_wild_for == seat:
+        return dict(_COLOR_CHOICES)
+    elif game.draw_stack:
+        actions = {ACCEPT: ("accept", None, None)}
+    else:
+        actions = {DRAW: ("draw", None, None)}
+    ids = _KIND_IDS
+    for card in game.allowed_moves(seat):
+        value = card.value
+        if value == "Wild" or value == "+4":
+            base = WILD_BASE if value == "Wild" else PLUS4_BASE
+            if base not in actions:
+                for i, color in enumerate(COLORS):
+                    actions[base + i] = ("play", card, color)
+        else:
+            actions.setdefault(ids[card.color, value], ("play", card, None))
+    return actions
+
+
+class NetPolicy:
+    """A uno_policy policy backed by an MLP; greedy over the legal actions."""
+
+    def __init__(self, model: MLP, name: str = "net") -> None:
+        self.model = model
+        self.name = name
+
+    @classmethod
+    def from_file(cls, path: str) -> NetPolicy:
+        return cls(MLP.load(path), f"net:{path}")
+
+    def __call__(self, game: Game, seat: int) -> Decision:
+        return self.decide_many([game], [seat])[0]
+
+    def decide_many(self, games: Sequence[Game], seats: Sequence[int]) -> List[Decision]:
+        """One decision per (game, seat), from a single batched forward pass."""
+        np = self.model.np
+        legal = [_policy_actions(g, s) for g, s in zip(games, seats)]
+        masks = np.zeros(len(games) * N_ACTIONS, dtype=bool)
+        masks[[row * N_ACTIONS + a for row, actions in enumerate(legal) for a in actions]] = True
+        masks = masks.reshape(len(games), N_ACTIONS)
+        logits = self.model.logits(observe_many(games, seats))
+        best = np.where(masks, logits, _MASKED).argmax(axis=1)
+        return [actions[a] for actions, a in zip(legal, best.tolist())]
+
+    def __reduce__(self):
+        if self.name.startswith("net:"):
+            # Workers load the weights themselves, like PersonaPolicy resolves its persona
+            from uno_policy import policy_by_name
+            return policy_by_name, (self.name,)
+        return NetPolicy, (self.model, self.name)
+
+    def __repr__(self) -> str:
+        return f"NetPolicy({self.name!r})"
+
+
+def simulate(policy: NetPolicy, seeds: Sequence[int],
+             rules: Optional[HouseRules] = None) -> Tuple[List[int], int]:
+    """Play one round per seed with the network in every seat, all rounds in lock-step.
+
+    Returns the winners (-1 for aborted rounds) and the number of decisions.
+    """
+    games = [new_game(seed, rules) for seed in seeds]
+    actions = [0] * len(games)
+    live = list(range(len(games)))
+    while live:
+        seats = [games[i].acting_player() for i in live]
+        for i, seat, decision in zip(live, seats, policy.decide_many([games[i] for i in live], seats)):
+            games[i].apply_bot_decision(seat, decision)
+            actions[i] += 1
+        live = [i for i in live if not games[i].game_over and actions[i] < MAX_ACTIONS]
+    winners = [g.winner_index if g.game_over and g.winner_index is not None else -1 for g in games]
+    return winners, sum(actions)
+
+
+# --- Imitation ---
+def imitation_samples(rounds: Iterable[Tuple[int, List[Tuple[int, Move]], Optional[HouseRules]]]):
+    """(observations, masks, actions) for every logged move of every (seed, moves, rules) round."""
+    np = _numpy()
+    obs, masks, labels = [], [], []
+    for seed, moves, rules in rounds:
+        game = new_game(seed, rules)
+        for seat, move in moves:
+            mask = np.zeros(N_ACTIONS, dtype=bool)
+            mask[list(legal_actions(game, seat))] = True
+            obs.append(observe(game, seat))
+            masks.append(mask)
+            labels.append(move_to_action(game, seat, move))
+            apply_move(game, seat, move)
+    return np.asarray(obs, dtype=np.float32), np.asarray(masks), np.asarray(labels)
+
+
+def logged_rounds(path: str):
+    """Rounds from a uno_cli simulate --log file, as imitation_samples() input."""
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            moves = [(seat, (action, index, color)) for seat, action, index, color in record["moves"]]
+            yield record["seed"], moves, HouseRules.from_names(record.get("rules", ()))
+
+
+def played_rounds(count: int, base_seed: int = 0, rules: Optional[HouseRules] = None):
+    for seed in range(base_seed, base_seed + count):
+        yield seed, record_round(seed, rules=rules)[1], rules
+
+
+def train_imitation(model: MLP, obs, masks, labels, epochs: int = 10, batch: int = 256, lr: float = 1e-3,
+                    seed: int = 0, log=print) -> float:
+    """Minimize cross-entropy of the logged actions under the masked softmax; returns the final accuracy."""
+    np = model.np
+    rng = np.random.default_rng(seed)
+    opt = Adam(model.params(), lr)
+    n = len(labels)
+    accuracy = 0.0
+    for epoch in range(epochs):
+        order = rng.permutation(n)
+        loss = 0.0
+        for start in range(0, n, batch):
+            idx = order[start:start + batch]
+            logits, acts = model._forward(obs[idx])
+            logp = masked_log_softmax(logits, masks[idx])
+            rows = np.arange(len(idx))
+            loss -= logp[rows, labels[idx]].sum()
+            d = np.exp(logp)
+            d[rows, labels[idx]] -= 1.0
+            opt.step(model._backward(acts, d / len(idx)))
+        best = np.where(masks, model.logits(obs), _MASKED).argmax(axis=1)
+        accuracy = float((best == labels).mean())
+        log(f"epoch {epoch + 1}: loss {loss / n:.4f}, agreement with the bot {accuracy:.1%}")
+    return accuracy
+
+
+# --- Policy gradient ---
+def train_reinforce(model: MLP, iterations: int, envs: int = 256, workers: int = 0, episodes: int = 512,
+                    lr: float = 3e-4, seed: int = 0, log=print) -> float:
+    """REINFORCE in seat 0 against the stock bots: each iteration collects episodes and takes one step.
+
+    The reward is 1 for a win; a running mean of it is the baseline. Returns
+    the win rate of the last iteration's episodes.
+    """
+    np = model.np
+    rng = np.random.default_rng(seed)
+    opt = Adam(model.params(), lr)
+    baseline = 0.25
+    win_rate = 0.0
+    with VecEnv(envs, workers, seed=seed, use_numpy=True) as env:
+        obs, masks = env.reset()
+        rewards = dones = None
+        pending: List[List[Tuple[Any, Any, int]]] = [[] for _ in range(envs)]
+        for it in range(iterations):
+            batch_obs, batch_masks, batch_actions, batch_adv = [], [], [], []
+            finished = wins = 0
+            while finished < episodes:
+                logp = masked_log_softmax(model.logits(obs), masks)
+                probs = np.exp(logp)
+                # Inverse-CDF sampling, one row per environment
+                choice = np.minimum((probs.cumsum(axis=1) < rng.random((envs, 1))).sum(axis=1), N_ACTIONS - 1)
+                actions = np.where(masks[np.arange(envs), choice], choice, probs.argmax(axis=1))
+                step_obs, step_masks = obs.copy(), masks.copy()
+                obs, rewards, dones, masks = env.step(actions.tolist())
+                for i in range(envs):
+                    pending[i].append((step_obs[i], step_masks[i], int(actions[i])))
+                    if dones[i]:
+                        advantage = float(rewards[i]) - baseline
+                        for o, m, a in pending[i]:
+                            batch_obs.append(o)
+                            batch_masks.append(m)
+                            batch_actions.append(a)
+                            batch_adv.append(advantage)
+                        pending[i] = []
+                        finished += 1
+                        wins += rewards[i] > 0
+            win_rate = wins / finished
+            baseline = 0.9 * baseline + 0.1 * win_rate
+            x, m = np.asarray(batch_obs), np.asarray(batch_masks)
+            a, adv = np.asarray(batch_actions), np.asarray(batch_adv, dtype=np.float32)
+            logits, acts = model._forward(x)
+            d = np.exp(masked_log_softmax(logits, m))
+            d[np.arange(len(a)), a] -= 1.0
+            # Gradient of -sum(advantage * log pi(a)), averaged over episodes
+            opt.step(model._backward(acts, d * adv[:, None] / finished))
+            log(f"iteration {it + 1}: {finished} episodes, win rate {win_rate:.1%}")
+        del obs, masks, rewards, dones
+    return win_rate
+
+
+def evaluate(model: MLP, rounds: int, base_seed: int = 0) -> float:
+    """Win rate of the greedy network in seat 0 against three stock bots over rounds seeded rounds."""
+    from uno_policy import MixedPolicy, play_with
+    net = NetPolicy(model)
+    bot = MixedPolicy()
+    wins = 0
+    for seed in range(base_seed, base_seed + rounds):
+        game = new_game(seed)
+        play_with(game, [net, bot, bot, bot])
+        wins += game.game_over and game.winner_index == 0
+    return wins / rounds
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Train and evaluate the NumPy MLP bot.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_im = sub.add_parser("imitate", help="fit the stock bot's moves")
+    p_im.add_argument("--log", help="uno_cli simulate --log file; default: play --rounds fresh rounds")
+    p_im.add_argument("--rounds", type=int, default=2000)
+    p_im.add_argument("--epochs", type=int, default=10)
+    p_im.add_argument("--lr", type=float, default=1e-3)
+    p_im.add_argument("--seed", type=int, default=0)
+    p_im.add_argument("--out", default="net.npz")
+    p_rl = sub.add_parser("reinforce", help="policy-gradient self-play against the stock bots")
+    p_rl.add_argument("--weights", help="start from these weights (default: a fresh network)")
+    p_rl.add_argument("--iterations", type=int, default=50)
+    p_rl.add_argument("--envs", type=int, default=256)
+    p_rl.add_argument("--workers", type=int, default=0)
+    p_rl.add_argument("--episodes", type=int, default=512, help="episodes per gradient step")
+    p_rl.add_argument("--lr", type=float, default=3e-4)
+    p_rl.add_argument("--seed", type=int, default=0)
+    p_rl.add_argument("--out", default="net.npz")
+    p_ev = sub.add_parser("evaluate", help="win rate in seat 0 against three stock bots")
+    p_ev.add_argument("--weights", default="net.npz")
+    p_ev.add_argument("--rounds", type=int, default=2000)
+    p_ev.add_argument("--seed", type=int, default=1_000_000, help="first round (away from training seeds)")
+    p_bn = sub.add_parser("bench", help="decisions per second: batched network versus the stock bot")
+    p_bn.add_argument("--weights", help="default: a fresh network (speed does not depend on the weights)")
+    p_bn.add_argument("--games", type=int, default=512, help="rounds played in lock-step")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "imitate":
+        rounds = logged_rounds(args.log) if args.log else played_rounds(args.rounds, args.seed)
+        obs, masks, labels = imitation_samples(rounds)
+        print(f"{len(labels)} decisions")
+        model = MLP.new(seed=args.seed)
+        train_imitation(model, obs, masks, labels, args.epochs, lr=args.lr, seed=args.seed)
+        model.save(args.out)
+    elif args.cmd == "reinforce":
+        model = MLP.load(args.weights) if args.weights else MLP.new(seed=args.seed)
+        train_reinforce(model, args.iterations, args.envs, args.workers, args.episodes, args.lr, args.seed)
+        model.save(args.out)
+    elif args.cmd == "evaluate":
+        print(f"win rate in seat 0: {evaluate(MLP.load(args.weights), args.rounds, args.seed):.1%} "
+              f"over {args.rounds} rounds (25% is par)")
+    else:
+        policy = NetPolicy(MLP.load(args.weights) if args.weights else MLP.new())
+        seeds = range(args.games)
+        start = time.perf_counter()
+        bot_decisions = sum(play_out(new_game(seed)) for seed in seeds)
+        bot = time.perf_counter() - start
+        start = time.perf_counter()
+        net_decisions = simulate(policy, seeds)[1]
+        net = time.perf_counter() - start
+        print(f"stock bot: {bot_decisions / bot:.0f} decisions/s; network, {args.games} rounds in lock-step: "
+              f"{net_decisions / net:.0f} decisions/s")
+
+
+if __name__ == "__main__":
+    main()
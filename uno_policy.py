@@ -0,0 +1,98 @@
+"""Bot policies: what decides for a seat.
+
+A policy is any callable (game, seat) -> (action, card, color) returning the
+same decision shape as Game.bot_decision; Game.apply_bot_decision carries it
+out. Policies are plain picklable objects so they can be sent to worker
+processes, and policy_by_name() resolves the names used on command lines.
+
+    mixed                               the default bot: a random persona every turn
+    Aggressive                          one fixed persona from uno_logic.PERSONAS (any of them)
+    Aggressive:random_prob=0.2:wild_penalty=4
+                                        a persona with some numeric weights overridden
+    net:weights.npz                     the NumPy MLP bot (uno_net) with these weights
+"""
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from uno_logic import PERSONAS, PERSONAS_BY_NAME, Card, Game
+from uno_sim import MAX_ACTIONS
+
+Decision = Tuple[str, Optional[Card], Optional[str]]
+Policy = Callable[[Game, int], Decision]
+
+# Same label as uno_history.MIXED_BOT
+MIXED = "mixed"
+
+
+class MixedPolicy:
+    """The stock bot: picks a random persona for every turn."""
+    name = MIXED
+
+    def __call__(self, game: Game, seat: int) -> Decision:
+        return game.bot_decision(seat)
+
+    def __repr__(self) -> str:
+        return "MixedPolicy()"
+
+
+class PersonaPolicy:
+    """The stock bot locked to one persona."""
+
+    def __init__(self, persona: dict) -> None:
+        self.persona = persona
+        self.name = persona["name"]
+
+    def __call__(self, game: Game, seat: int) -> Decision:
+        return game.bot_decision(seat, persona=self.persona)
+
+    def __reduce__(self):
+        # Workers resolve the persona by name instead of receiving the dict
+        return policy_by_name, (self.name,)
+
+    def __repr__(self) -> str:
+        return f"PersonaPolicy({self.name!r})"
+
+
+def policy_names() -> List[str]:
+    return [MIXED] + [p["name"] for p in PERSONAS]
+
+
+def policy_by_name(name: str) -> Policy:
+    if name.lower() == MIXED:
+        return MixedPolicy()
+    for persona_name, persona in PERSONAS_BY_NAME.items():
+        if persona_name.lower() == name.lower():
+            return PersonaPolicy(persona)
+    if name.lower().startswith("net:"):
+        from uno_net import NetPolicy
+        return NetPolicy.from_file(name[4:])
+    base, *overrides = name.split(":")
+    for persona_name, persona in PERSONAS_BY_NAME.items():
+        if persona_name.lower() == base.lower() and overrides:
+            return PersonaPolicy(_tuned(persona, name, overrides))
+    raise ValueError(f"Unknown policy {name!r}; choose from {', '.join(policy_names())}")
+
+
+def _tuned(persona: dict, name: str, overrides: Sequence[str]) -> dict:
+    tuned = dict(persona, name=name)
+    for item in overrides:
+        key, sep, value = item.partition("=")
+        if not sep or not isinstance(persona.get(key), float):
+            raise ValueError(f"Bad override {item!r} in policy {name!r}; expected weight=number for one of "
+                             f"{', '.join(k for k, v in persona.items() if isinstance(v, float))}")
+        try:
+            tuned[key] = float(value)
+        except ValueError:
+            raise ValueError(f"Bad override {item!r} in policy {name!r}: {value!r} is not a number") from None
+    return tuned
+
+
+def play_with(game: Game, policies: Sequence[Policy], max_actions: int = MAX_ACTIONS) -> int:
+    """Play the round to the end with policies[seat] deciding for each seat; returns the number of actions."""
+    actions = 0
+    while not game.game_over and actions < max_actions:
+        seat = game.acting_player()
+        game.apply_bot_decision(seat, policies[seat](game, seat))
+        actions += 1
+    return actions
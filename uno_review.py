@@ -0,0 +1,222 @@
+"""Post-round review: grades every decision one seat made in a round.
+
+A decision point is the position just before the seat acted (Game.to_bytes())
+and the move it chose. Every legal alternative at that point (the other
+cards, the other Wild colors, drawing instead of playing, accepting instead
+of challenging a +4) is scored by determinized rollouts
+(uno_sim.rollout_wins) on a process pool. A move's value is the seat's
+probability of winning the round after it; a decision's loss is the best
+alternative's value minus the chosen move's. All moves of one decision are
+played out on the same rollout seeds, so the loss is a paired difference
+and its error bar shrinks much faster than that of the values themselves.
+
+The GUI records the human's decisions and offers a review after each round.
+From the command line, one seat of a bot-only round can be reviewed:
+
+    python uno_review.py --seed 7 --seat 0 --rollouts 200 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from uno_logic import Game
+from uno_sim import Move, bot_step, legal_moves, new_game, rollout_wins
+
+BATCH = 10
+# Losses at least this large, and clear of the noise, are flagged
+MISTAKE = 0.05
+BLUNDER = 0.15
+
+
+class DecisionPoint(NamedTuple):
+    turn: int
+    seat: int
+    position: bytes  # Game.to_bytes() just before the decision
+    move: Move
+
+
+class Grade(NamedTuple):
+    turn: int
+    seat: int
+    position: bytes
+    move: Move
+    best: Move
+    values: Dict[Move, float]  # win probability after each legal move
+    loss: float  # values[best] - values[move]
+    se: float  # standard error of loss
+    rollouts: int  # per move
+
+    @property
+    def clear(self) -> bool:
+        """The loss is more than two standard errors, i.e. not just rollout noise."""
+        return self.loss > 2 * self.se
+
+    @property
+    def verdict(self) -> str:
+        if not self.clear or self.loss < MISTAKE:
+            return ""
+        return "blunder" if self.loss >= BLUNDER else "mistake"
+
+
+def describe(position: bytes, seat: int, move: Move) -> str:
+    """A move in words, e.g. 'play Wild -> Red', 'draw', 'challenge +4'."""
+    action, index, color = move
+    if action == "play":
+        card = Game.from_bytes(position).players[seat].hand[index]
+        return f"play {card.display()}" + (f" -> {color}" if color else "")
+    if action == "color":
+        return f"start with {color}"
+    if action in ("accept", "challenge"):
+        return f"{action} +4" if Game.from_bytes(position).is_plus4_pending_for(seat) else "take the stacked cards"
+    return action
+
+
+class Review:
+    """Rollouts for a list of decisions, submitted to executor up front and collected with poll().
+
+    Decisions are queued in order, so early turns are graded first; with
+    only one legal move a decision is not graded at all.
+    """
+
+    def __init__(self, decisions: Sequence[DecisionPoint], executor: Executor, rollouts: int = 200,
+                 seed: Optional[int] = None) -> None:
+        rng = random.Random(seed)
+        self.batches = max(1, math.ceil(rollouts / BATCH))
+        self.points: List[DecisionPoint] = []
+        self._moves: List[List[Move]] = []
+        # Per decision, per move: wins in each batch (None until it arrives)
+        self._wins: List[Dict[Move, List[Optional[int]]]] = []
+        self._pending: Dict[Future, Tuple[int, Move, int]] = {}
+        for point in decisions:
+            moves = legal_moves(Game.from_bytes(point.position), point.seat)
+            if len(moves) < 2 or point.move not in moves:
+                continue
+            i = len(self.points)
+            self.points.append(point)
+            self._moves.append(moves)
+            self._wins.append({m: [None] * self.batches for m in moves})
+            for b in range(self.batches):
+                # Same seed for every move of this decision: paired comparison
+                batch_seed = rng.getrandbits(64)
+                for move in moves:
+                    fut = executor.submit(rollout_wins, point.position, point.seat, move, BATCH, batch_seed)
+                    self._pending[fut] = (i, move, b)
+        self._grades: Dict[int, Grade] = {}
+
+    @property
+    def futures(self) -> List[Future]:
+        return list(self._pending)
+
+    @property
+    def finished(self) -> bool:
+        return not self._pending
+
+    def poll(self) -> bool:
+        """Collect finished batches; returns True if a decision got its grade."""
+        graded = False
+        for fut in [f for f in self._pending if f.done()]:
+            i, move, b = self._pending.pop(fut)
+            if fut.cancelled() or fut.exception() is not None:
+                continue
+            self._wins[i][move][b] = fut.result()
+            if i not in self._grades and all(None not in w for w in self._wins[i].values()):
+                self._grades[i] = self._grade(i)
+                graded = True
+        return graded
+
+    def cancel(self) -> None:
+        for fut in self._pending:
+            fut.cancel()
+        self._pending = {}
+
+    def grades(self) -> List[Grade]:
+        """Graded decisions so far, in turn order."""
+        return [self._grades[i] for i in sorted(self._grades)]
+
+    def _grade(self, i: int) -> Grade:
+        point, wins = self.points[i], self._wins[i]
+        n = self.batches * BATCH
+        values = {m: sum(w) / n for m, w in wins.items()}
+        # Ties go to the move actually chosen
+        best = max(self._moves[i], key=lambda m: (values[m], m == point.move))
+        diffs = [(a - b) / BATCH for a, b in zip(wins[best], wins[point.move])]
+        mean = sum(diffs) / len(diffs)
+        var = sum((d - mean) ** 2 for d in diffs) / (len(diffs) - 1) if len(diffs) > 1 else 0.0
+        return Grade(point.turn, point.seat, point.position, point.move, best, values,
+                     values[best] - values[point.move], math.sqrt(var / len(diffs)), n)
+
+
+def review(decisions: Sequence[DecisionPoint], rollouts: int = 200, workers: Optional[int] = None,
+           seed: Optional[int] = None) -> List[Grade]:
+    """Grade every decision, blocking until all rollouts are done."""
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        job = Review(decisions, pool, rollouts, seed)
+        wait(job.futures)
+        job.poll()
+        return job.grades()
+
+
+def format_grade(grade: Grade) -> str:
+    chosen = describe(grade.position, grade.seat, grade.move)
+    text = f"Turn {grade.turn}: {chosen} ({grade.values[grade.move]:.0%} to win)"
+    if grade.best == grade.move:
+        return text + " - best move"
+    best = describe(grade.position, grade.seat, grade.best)
+    text += (f" - best: {best} ({grade.values[grade.best]:.0%}), "
+             f"loss {grade.loss * 100:.1f} ± {grade.se * 100:.1f} pp")
+    return text + (f"  [{grade.verdict}]" if grade.verdict else "")
+
+
+def summary(grades: Sequence[Grade]) -> str:
+    # The best move is picked on the same noisy values it is compared with, so every
+    # loss leans positive; only losses clear of the noise are added up
+    total = sum(g.loss for g in grades if g.clear)
+    flagged = sum(1 for g in grades if g.verdict)
+    return (f"{len(grades)} decisions graded, total loss {total * 100:.1f} pp of win probability "
+            f"(clear of the noise), {flagged} flagged")
+
+
+def bot_round_decisions(seed: int, seat: int) -> List[DecisionPoint]:
+    """The decisions seat made in bot-only round seed (each bot step counts as one decision)."""
+    game = new_game(seed)
+    points = []
+    turn = 0
+    while not game.game_over and turn < 10000:
+        turn += 1
+        acting = game.acting_player()
+        position = game.to_bytes()
+        steps = bot_step(game)
+        if acting == seat:
+            # A draw-and-play is graded as the draw; the play of a drawn card is forced anyway
+            points.append(DecisionPoint(turn, seat, position, steps[0][1]))
+    return points
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Grade one seat's decisions in a bot-only round.")
+    parser.add_argument("--seed", type=int, default=7, help="round to review (uno_sim.new_game seed)")
+    parser.add_argument("--seat", type=int, default=0, choices=range(4))
+    parser.add_argument("--rollouts", type=int, default=200, help="rollouts per legal move")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    decisions = bot_round_decisions(args.seed, args.seat)
+    start = time.perf_counter()
+    grades = review(decisions, args.rollouts, args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    for grade in grades:
+        print(format_grade(grade))
+    options = sum(len(g.values) for g in grades)
+    print(summary(grades))
+    print(f"{len(decisions)} decisions, {options} options x {args.rollouts} rollouts in {elapsed:.1f}s "
+          f"with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Local multiplayer UNO server.
+
+One asyncio process hosts many concurrent Game tables. Clients talk
+line-delimited JSON over TCP (one object per line, UTF-8):
+
+Client -> server
+    {"op": "join", "name": "Ana", "table": 3}   table is optional: omitted
+                                                 joins any table with a free
+                                                 seat, "new" opens a table
+    {"op": "play", "card": 2, "color": "Red"}   card is an index into "hand"
+    {"op": "draw"} / {"op": "pass"}
+    {"op": "accept"} / {"op": "challenge"}      answer a +4 aimed at you
+    {"op": "color", "color": "Blue"}            starting Wild color
+    {"op": "ping", "t": 123.4}                  echoed back as "pong"
+    {"op": "leave"}
+
+Server -> client
+    {"op": "joined", "table": 3, "seat": 1}
+    {"op": "state", "v": 7, "state": {...}}     full seat view, sent once
+    {"op": "diff", "v": 8, "set": {...}}        only the keys that changed
+    {"op": "event", "text": "..."}
+    {"op": "error", "msg": "..."}
+    {"op": "pong", "t": 123.4}
+
+Seats without a connected human are played by the built-in bot. Bot
+decisions run in an executor, on a copy of the position, so a slow policy
+neither stalls the event loop nor holds up the humans at its table.
+Broadcasts never wait for a client: one that stops reading is dropped once
+SEND_BUFFER_LIMIT bytes are queued for it, and a bot takes its seat.
+
+Run with:  python uno_server.py --port 8765
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import random
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from uno_logic import Game, COLORS
+
+# Seat names for bot-played seats, shared by every table
+BOT_NAMES = tuple(f"Bot {i + 1}" for i in range(4))
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Bytes queued for one client before it is dropped as too slow to keep up
+SEND_BUFFER_LIMIT = 2 ** 20
+
+
+def seat_view(game: Game, seat: int) -> dict:
+    """Everything the player in `seat` is allowed to see, as plain JSON values."""
+    hand = list(game.players[seat].hand)
+    allowed_ids = set(id(c) for c in game.allowed_moves(seat))
+    top = game.top_card()
+    return {
+        "seat": seat,
+        "players": [p.name for p in game.players],
+        "counts": [len(p.hand) for p in game.players],
+        "hand": [c.display() for c in hand],
+        "playable": [i for i, c in enumerate(hand) if id(c) in allowed_ids],
+        "top": top.display(),
+        "color": game.effective_color(),
+        "current": game.current_index,
+        "direction": game.direction,
+        "deck": len(game.deck.cards),
+        "plus4_target": game.pending_plus4.target if game.pending_plus4 else None,
+        "initial_color_for": game.pending_initial_wild_for,
+        "can_draw": game.can_draw(seat)[0],
+        "can_pass": game.can_pass(seat)[0],
+        "game_over": game.game_over,
+        "winner": game.winner_index,
+        "points": game.winner_points(),
+    }
+
+
+class Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.name = "Player"
+        self.table: Optional[Table] = None
+        self.seat: Optional[int] = None
+        # Last view sent, used to compute diffs
+        self.sent: Optional[dict] = None
+
+    def send(self, msg: dict) -> None:
+        if self.writer.is_closing():
+            return
+        self.writer.write((json.dumps(msg, separators=(",", ":")) + "\n").encode())
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > SEND_BUFFER_LIMIT:
+            # Otherwise every broadcast grows its buffer; _handle sees the close and frees the seat
+            transport.abort()
+
+    def push_state(self, version: int) -> None:
+        if self.table is None or self.seat is None:
+            return
+        view = seat_view(self.table.game, self.seat)
+        if self.sent is None:
+            self.send({"op": "state", "v": version, "state": view})
+        else:
+            changed = {k: v for k, v in view.items() if self.sent.get(k) != v}
+            if not changed:
+                return
+            self.send({"op": "diff", "v": version, "set": changed})
+        self.sent = view
+
+
+class Table:
+    __slots__ = ("id", "server", "seats", "scores", "version", "lock", "driver", "rng", "bot_rng", "game")
+
+    def __init__(self, table_id: int, server: UnoServer) -> None:
+        self.id = table_id
+        self.server = server
+        self.seats: Dict[int, Connection] = {}
+        self.scores = [0, 0, 0, 0]
+        self.version = 0
+        # Serializes human actions and bot moves on this table
+        self.lock = asyncio.Lock()
+        self.driver: Optional[asyncio.Task] = None
+        # Card and bot streams of this table alone, kept across its rounds: a table's
+        # rounds replay from the server seed and its id whatever the other tables do
+        seeder = random.Random(f"{server.seed}:{table_id}")
+        self.rng = random.Random(seeder.getrandbits(64))
+        self.bot_rng = random.Random(seeder.getrandbits(64))
+        self.game = self._new_game()
+
+    def _new_game(self) -> Game:
+        game = Game(num_players=4, rng=self.rng, bot_rng=self.bot_rng)
+        game.setup()
+        for i, p in enumerate(game.players):
+            conn = self.seats.get(i)
+            p.is_human = conn is not None
+            p.name = conn.name if conn is not None else BOT_NAMES[i]
+        return game
+
+    def free_seat(self) -> Optional[int]:
+        for i in range(4):
+            if i not in self.seats:
+                return i
+        return None
+
+    def sit(self, conn: Connection, seat: int) -> None:
+        self.seats[seat] = conn
+        conn.table, conn.seat, conn.sent = self, seat, None
+        self.game.players[seat].is_human = True
+        self.game.players[seat].name = conn.name
+        self.broadcast_event(f"{conn.name} joined seat {seat + 1}.")
+        self.changed()
+
+    def leave(self, conn: Connection) -> None:
+        if conn.seat is not None and self.seats.get(conn.seat) is conn:
+            del self.seats[conn.seat]
+            player = self.game.players[conn.seat]
+            player.is_human = False
+            player.name = BOT_NAMES[conn.seat]
+            self.broadcast_event(f"{conn.name} left; a bot takes seat {conn.seat + 1}.")
+        conn.table = conn.seat = conn.sent = None
+        if self.seats:
+            self.changed()
+        else:
+            self.server.close_table(self)
+
+    def broadcast_event(self, text: str) -> None:
+        for conn in self.seats.values():
+            conn.send({"op": "event", "text": text})
+
+    def push(self) -> None:
+        """Send every seated connection the diff since its last update."""
+        self.version += 1
+        for conn in list(self.seats.values()):
+            conn.push_state(self.version)
+
+    def changed(self) -> None:
+        """Push diffs and make sure bots keep the table moving."""
+        self.push()
+        if self.driver is None or self.driver.done():
+            self.driver = asyncio.ensure_future(self._drive())
+
+    async def _drive(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self.lock:
+                g = self.game
+                if g.game_over:
+                    if g.winner_index is not None:
+                        self.scores[g.winner_index] += g.winner_points()
+                        self.broadcast_event(f"{g.players[g.winner_index].name} wins the round.")
+                    break
+                idx = g.acting_player()
+                if idx is None or idx in self.seats:
+                    return
+                # The bot thinks on a copy, so humans can act on the table meanwhile
+                version = self.version
+                snapshot = copy.deepcopy(g)
+            decision = await loop.run_in_executor(self.server.executor, snapshot.bot_decision, idx)
+            async with self.lock:
+                if self.game is not g or self.version != version or idx in self.seats:
+                    continue  # the position changed while the bot was thinking: decide again
+                # The copy keeps hand order, so the card at the same index is the one chosen
+                action, card, color = decision
+                if card is not None:
+                    card = g.players[idx].hand[_hand_index(snapshot.players[idx].hand, card)]
+                g.bot_rng.setstate(snapshot.bot_rng.getstate())
+                g.persona_picks[:] = snapshot.persona_picks
+                action, card, color = g.apply_bot_decision(idx, (action, card, color))
+                self.broadcast_event(describe(g, idx, action, card, color))
+            self.push()
+            if self.server.bot_delay:
+                await asyncio.sleep(self.server.bot_delay)
+        # Round over: start the next one shortly, keeping the seats
+        self.push()
+        await asyncio.sleep(self.server.round_delay)
+        if self.seats:
+            async with self.lock:
+                self.game = self._new_game()
+            for conn in self.seats.values():
+                conn.sent = None
+            self.push()
+            self.driver = asyncio.ensure_future(self._drive())
+
+    async def human_action(self, conn: Connection, msg: dict) -> Optional[str]:
+        """Apply a human action; returns an error string or None."""
+        async with self.lock:
+            g = self.game
+            seat = conn.seat
+            op = msg.get("op")
+            if op == "play":
+                hand = list(g.players[seat].hand)
+                try:
+                    card = hand[int(msg.get("card"))]
+                except (TypeError, ValueError, IndexError):
+                    return "Unknown card index"
+                ok, err = g.can_play_card(seat, card)
+                if not ok:
+                    return err
+                if card.is_wild() and msg.get("color") not in COLORS:
+                    return "Choose a valid color for Wild"
+                ok, err = g.play_card(seat, card, msg.get("color") if card.is_wild() else None)
+                if not ok:
+                    return err
+                self.broadcast_event(describe(g, seat, "play", card, msg.get("color") if card.is_wild() else None))
+            elif op == "draw":
+                ok, err, card = g.draw_one_action(seat)
+                if not ok:
+                    return err
+                if not g.is_playable(card):
+                    g.advance_turn(1)
+                    self.broadcast_event(f"{conn.name} drew and ended the turn.")
+            elif op == "pass":
+                ok, err = g.can_pass(seat)
+                if not ok:
+                    return err
+                g.advance_turn(1)
+                self.broadcast_event(f"{conn.name} ended the turn.")
+            elif op == "accept":
+                ok, err = g.accept_plus4(seat)
+                if not ok:
+                    return err or "No +4 pending for you"
+                self.broadcast_event(describe(g, seat, "accept", None, None))
+            elif op == "challenge":
+                ok, err, _ = g.challenge_plus4(seat)
+                if not ok:
+                    return err or "No +4 pending for you"
+                self.broadcast_event(describe(g, seat, "challenge", None, None))
+            elif op == "color":
+                if g.pending_initial_wild_for != seat:
+                    return "No starting color to choose"
+                ok, err = g.set_initial_wild_color(msg.get("color"))
+                if not ok:
+                    return err
+            else:
+                return f"Unknown op {op!r}"
+        self.changed()
+        return None
+
+
+def _hand_index(hand, card) -> int:
+    for i, c in enumerate(hand):
+        if c is card:
+            return i
+    raise ValueError("card not in hand")
+
+
+def describe(game: Game, idx: int, action: str, card, color: Optional[str]) -> str:
+    name = game.players[idx].name
+    if action == "color":
+        return f"{name} chose starting color {color}."
+    if action == "accept":
+        return f"{name} accepted +4 and drew {game.last_penalty[1]}."
+    if action == "challenge":
+        return f"{name} challenged +4."
+    if action == "draw_pass":
+        return f"{name} drew and ended the turn."
+    verb = "drew and played" if action == "draw_play" else "played"
+    return f"{name} {verb} {card.display()}{' choosing ' + color if color else ''}."
+
+
+class UnoServer:
+    def __init__(self, executor: Optional[Executor] = None, bot_delay: float = 0.0, round_delay: float = 0.5,
+                 seed: Optional[int] = None) -> None:
+        self.executor = executor or ThreadPoolExecutor(max_workers=4)
+        self.bot_delay = bot_delay
+        self.round_delay = round_delay
+        self.tables: Dict[int, Table] = {}
+        # Every table derives its random streams from this seed and its table id
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    def open_table(self) -> Table:
+        table = Table(next(self._ids), self)
+        self.tables[table.id] = table
+        return table
+
+    def close_table(self, table: Table) -> None:
+        self.tables.pop(table.id, None)
+        if table.driver is not None:
+            table.driver.cancel()
+
+    def find_table(self, wanted) -> Optional[Table]:
+        if wanted == "new":
+            return self.open_table()
+        if wanted is not None:
+            table = self.tables.get(wanted)
+            return table if table is not None and table.free_seat() is not None else None
+        for table in self.tables.values():
+            if table.free_seat() is not None:
+                return table
+        return self.open_table()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port, limit=2 ** 16)
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for table in list(self.tables.values()):
+            self.close_table(table)
+        self.executor.shutdown(wait=False)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = Connection(reader, writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    conn.send({"op": "error", "msg": "Malformed JSON"})
+                    continue
+                if not isinstance(msg, dict):
+                    conn.send({"op": "error", "msg": "Expected a JSON object"})
+                    continue
+                if msg.get("op") == "leave":
+                    break
+                err = await self._dispatch(conn, msg)
+                if err:
+                    conn.send({"op": "error", "msg": err})
+                if writer.transport.get_write_buffer_size() > 2 ** 16:
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if conn.table is not None:
+                conn.table.leave(conn)
+            writer.close()
+
+    async def _dispatch(self, conn: Connection, msg: dict) -> Optional[str]:
+        op = msg.get("op")
+        if op == "ping":
+            conn.send({"op": "pong", "t": msg.get("t")})
+            return None
+        if op == "join":
+            if conn.table is not None:
+                return "Already seated"
+            conn.name = str(msg.get("name") or "Player")[:24]
+            table = self.find_table(msg.get("table"))
+            if table is None:
+                return "Table not found or full"
+            seat = table.free_seat()
+            conn.send({"op": "joined", "table": table.id, "seat": seat})
+            table.sit(conn, seat)
+            return None
+        if conn.table is None:
+            return "Join a table first"
+        return await conn.table.human_action(conn, msg)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = UnoServer(bot_delay=args.bot_delay, round_delay=args.round_delay, seed=args.seed)
+    await server.start(args.host, args.port)
+    print(f"UNO server listening on {args.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Host UNO tables over line-delimited JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--bot-delay", type=float, default=0.0, help="seconds between bot moves")
+    parser.add_argument("--round-delay", type=float, default=0.5, help="seconds before the next round starts")
+    parser.add_argument("--seed", type=int, default=None, help="server seed; table N replays from (seed, N)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
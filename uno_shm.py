@@ -0,0 +1,216 @@
+"""Shared-memory result rings for multi-process simulation.
+
+Worker processes simulate rounds and write one fixed-size record per round
+into their own lane of a multiprocessing.shared_memory segment, so results
+reach the collector without pickling a single Python object. Each lane is a
+single-producer/single-consumer ring: the worker only advances the write
+counter, the collector only advances the read counter.
+
+Segment layout (little-endian):
+    lane i header   write_count u64, read_count u64
+    lane i slots    capacity * RECORD.size bytes
+
+Run a parallel simulation with:  python uno_shm.py --rounds 100000 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional
+
+from uno_logic import HouseRules
+from uno_sim import RoundResult, play_round
+
+# seed, winner, winner_points, turns, recycles, plus4_challenges, plus4_challenges_won.
+# The counters are u32: a long round can pass 65535 points or recycles, and one
+# field out of range would make pack_into raise and lose the whole batch.
+RECORD = struct.Struct("<QbxxxIIIII")
+HEADER = struct.Struct("<QQ")
+# NumPy view of the same record, for collectors that want columns
+NUMPY_DTYPE = [("seed", "<u8"), ("winner", "i1"), ("_pad0", "V3"), ("winner_points", "<u4"),
+               ("turns", "<u4"), ("recycles", "<u4"), ("plus4_challenges", "<u4"),
+               ("plus4_challenges_won", "<u4")]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing its lifetime to this process."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions register the segment again, but workers started through
+    # multiprocessing share the parent's resource tracker, which keeps a set
+    return shared_memory.SharedMemory(name=name)
+
+
+class ResultRing:
+    """A shared-memory segment holding one SPSC record ring per worker lane."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, lanes: int, capacity: int, owner: bool) -> None:
+        self.shm = shm
+        self.lanes = lanes
+        self.capacity = capacity
+        self.owner = owner
+        self._lane_size = HEADER.size + capacity * RECORD.size
+
+    @classmethod
+    def create(cls, lanes: int, capacity: int = 4096) -> ResultRing:
+        size = lanes * (HEADER.size + capacity * RECORD.size)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        return cls(shm, lanes, capacity, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, lanes: int, capacity: int) -> ResultRing:
+        return cls(_attach(name), lanes, capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _offset(self, lane: int) -> int:
+        return lane * self._lane_size
+
+    # --- Producer side (one worker per lane) ---
+    def write(self, lane: int, result: RoundResult, spin_sleep: float = 0.0005) -> None:
+        base = self._offset(lane)
+        buf = self.shm.buf
+        while True:
+            write_count, read_count = HEADER.unpack_from(buf, base)
+            if write_count - read_count < self.capacity:
+                break
+            # Ring full: wait for the collector to drain
+            time.sleep(spin_sleep)
+        slot = base + HEADER.size + (write_count % self.capacity) * RECORD.size
+        RECORD.pack_into(buf, slot, result.seed, result.winner, result.winner_points, result.turns,
+                         result.recycles, result.plus4_challenges, result.plus4_challenges_won)
+        # Publish only after the record is in place
+        struct.pack_into("<Q", buf, base, write_count + 1)
+
+    # --- Consumer side (the collector) ---
+    def drain_raw(self, lane: int) -> bytes:
+        """Take every published record from a lane as one contiguous bytes object."""
+        base = self._offset(lane)
+        buf = self.shm.buf
+        write_count, read_count = HEADER.unpack_from(buf, base)
+        if write_count == read_count:
+            return b""
+        slots = base + HEADER.size
+        start = read_count % self.capacity
+        end = start + (write_count - read_count)
+        if end <= self.capacity:
+            data = bytes(buf[slots + start * RECORD.size:slots + end * RECORD.size])
+        else:
+            data = (bytes(buf[slots + start * RECORD.size:slots + self.capacity * RECORD.size])
+                    + bytes(buf[slots:slots + (end - self.capacity) * RECORD.size]))
+        struct.pack_into("<Q", buf, base + 8, write_count)
+        return data
+
+    def drain(self) -> Iterator[RoundResult]:
+        for lane in range(self.lanes):
+            for fields in RECORD.iter_unpack(self.drain_raw(lane)):
+                yield RoundResult(*fields)
+
+    def drain_numpy(self):
+        """Drain every lane into one NumPy structured array (requires numpy)."""
+        import numpy as np
+        data = b"".join(self.drain_raw(lane) for lane in range(self.lanes))
+        return np.frombuffer(data, dtype=np.dtype(NUMPY_DTYPE))
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker(name: str, lanes: int, capacity: int, lane: int, seeds: range,
+            rules: Optional[HouseRules] = None) -> None:
+    ring = ResultRing.attach(name, lanes, capacity)
+    try:
+        for seed in seeds:
+            ring.write(lane, play_round(seed, rules=rules))
+    finally:
+        ring.close()
+
+
+class Totals:
+    """Running totals over drained records."""
+
+    def __init__(self) -> None:
+        self.rounds = 0
+        self.wins = [0, 0, 0, 0]
+        self.aborted = 0
+        self.points = 0
+        self.turns = 0
+        self.recycles = 0
+        self.plus4_challenges = 0
+        self.plus4_challenges_won = 0
+
+    def add(self, r: RoundResult) -> None:
+        self.rounds += 1
+        if r.winner < 0:
+            self.aborted += 1
+        else:
+            self.wins[r.winner] += 1
+        self.points += r.winner_points
+        self.turns += r.turns
+        self.recycles += r.recycles
+        self.plus4_challenges += r.plus4_challenges
+        self.plus4_challenges_won += r.plus4_challenges_won
+
+    def summary(self) -> str:
+        n = max(1, self.rounds)
+        return (f"rounds={self.rounds} wins={self.wins} aborted={self.aborted} "
+                f"avg_points={self.points / n:.1f} avg_turns={self.turns / n:.1f} "
+                f"recycles/round={self.recycles / n:.3f} "
+                f"+4 challenges={self.plus4_challenges} won={self.plus4_challenges_won}")
+
+
+def simulate_parallel(rounds: int, workers: int, base_seed: int = 0, capacity: int = 4096,
+                      poll: float = 0.002, rules: Optional[HouseRules] = None) -> Totals:
+    """Simulate `rounds` seeded rounds over `workers` processes and aggregate via shared memory."""
+    ring = ResultRing.create(workers, capacity)
+    totals = Totals()
+    procs: List[mp.Process] = []
+    try:
+        for lane in range(workers):
+            seeds = range(base_seed + lane, base_seed + rounds, workers)
+            p = mp.Process(target=_worker, args=(ring.name, workers, capacity, lane, seeds, rules), daemon=True)
+            p.start()
+            procs.append(p)
+        while totals.rounds < rounds:
+            before = totals.rounds
+            for r in ring.drain():
+                totals.add(r)
+            if totals.rounds == before:
+                if not any(p.is_alive() for p in procs):
+                    # Pick up anything written just before the last exit
+                    for r in ring.drain():
+                        totals.add(r)
+                    break
+                time.sleep(poll)
+    finally:
+        for p in procs:
+            p.join(timeout=1.0)
+        ring.close()
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate bot-only rounds across processes via shared memory.")
+    parser.add_argument("--rounds", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--capacity", type=int, default=4096, help="records per worker lane")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    totals = simulate_parallel(args.rounds, args.workers, args.seed, args.capacity)
+    elapsed = time.perf_counter() - start
+    print(totals.summary())
+    print(f"{totals.rounds / elapsed:.0f} rounds/s over {args.workers} workers ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Headless simulation of UNO rounds where every seat is played by the bot."""
+from __future__ import annotations
+
+import random
+from typing import List, NamedTuple, Optional, Tuple
+
+from uno_logic import COLORS, ChallengeModel, Game, Hand, HouseRules
+
+# A single decision as plain data: (action, hand index, color). Actions are
+# 'play', 'draw', 'pass', 'accept', 'challenge' and 'color' (starting Wild)
+Move = Tuple[str, Optional[int], Optional[str]]
+
+# Safety net against a pathological round that never ends
+MAX_ACTIONS = 10000
+
+
+class RoundResult(NamedTuple):
+    seed: int
+    winner: int  # -1 if the round hit MAX_ACTIONS
+    winner_points: int
+    turns: int
+    recycles: int
+    plus4_challenges: int
+    plus4_challenges_won: int
+    draws: int = 0
+    persona_picks: Tuple[int, ...] = ()  # bot turns per persona, uno_logic.PERSONAS order
+
+
+def new_game(seed: int, rules: Optional[HouseRules] = None) -> Game:
+    """Create and set up a Game whose card and bot streams both derive from seed."""
+    seeder = random.Random(seed)
+    game = Game(num_players=4, rng=random.Random(seeder.getrandbits(64)),
+                bot_rng=random.Random(seeder.getrandbits(64)), rules=rules)
+    game.setup()
+    return game
+
+
+def play_out(game: Game, max_actions: int = MAX_ACTIONS) -> int:
+    """Let the bot act for every seat until the round ends; returns the number of actions."""
+    actions = 0
+    jump_in = game.rules.jump_in
+    while not game.game_over and actions < max_actions:
+        if not (jump_in and bot_jump_in(game)):
+            game.bot_act(game.acting_player())
+        actions += 1
+    return actions
+
+
+def play_round(seed: int, max_actions: int = MAX_ACTIONS, rules: Optional[HouseRules] = None) -> RoundResult:
+    game = new_game(seed, rules)
+    play_out(game, max_actions)
+    return round_result(game, seed)
+
+
+def round_result(game: Game, seed: int = 0) -> RoundResult:
+    winner = game.winner_index if game.game_over and game.winner_index is not None else -1
+    return RoundResult(
+        seed=seed,
+        winner=winner,
+        winner_points=game.winner_points(),
+        turns=game.turns,
+        recycles=game.recycles,
+        plus4_challenges=game.plus4_challenges,
+        plus4_challenges_won=game.plus4_challenges_won,
+        draws=game.draws,
+        persona_picks=tuple(game.persona_picks),
+    )
+
+
+# --- Moves as data (hints, speculation, analysis) ---
+def legal_moves(game: Game, seat: int) -> List[Move]:
+    """Every action open to seat right now, including house-rule plays out of turn."""
+    moves: List[Move] = []
+    if game.is_plus4_pending_for(seat):
+        moves += [("accept", None, None), ("challenge", None, None)]
+    elif game.pending_initial_wild_for == seat:
+        return [("color", None, color) for color in COLORS]
+    elif game.draw_stack and game.current_index == seat:
+        moves.append(("accept", None, None))
+    allowed = set(id(c) for c in game.allowed_moves(seat))
+    # Only a card equal to the top card can jump in; comparing first skips can_jump_in for the rest
+    top = game.top_card() if game.rules.jump_in else None
+    for i, card in enumerate(game.players[seat].hand):
+        if id(card) in allowed:
+            if card.is_wild():
+                moves.extend(("play", i, color) for color in COLORS)
+            else:
+                moves.append(("play", i, None))
+        elif top is not None and card == top and game.can_jump_in(seat, card):
+            moves.append(("play", i, None))
+    if game.can_draw(seat)[0]:
+        moves.append(("draw", None, None))
+    if game.can_pass(seat)[0]:
+        moves.append(("pass", None, None))
+    return moves
+
+
+def apply_move(game: Game, seat: int, move: Move) -> None:
+    """Apply a legal_moves() entry the way the GUI does for the human."""
+    action, index, color = move
+    if action == "play":
+        game.play_card(seat, game.players[seat].hand[index], chosen_color=color)
+    elif action == "pass":
+        game.advance_turn(1)
+    elif action == "accept":
+        if game.pending_plus4 is not None:
+            game.accept_plus4(seat)
+        else:
+            game.accept_draw_stack(seat)
+    elif action == "challenge":
+        game.challenge_plus4(seat)
+    elif action == "color":
+        game.set_initial_wild_color(color)
+    elif action == "draw":
+        ok, _, card = game.draw_one_action(seat)
+        if ok and not game.is_playable(card):
+            # The GUI passes automatically when the drawn card cannot be played
+            game.advance_turn(1)
+    else:
+        raise ValueError(f"Unknown action {action!r}")
+
+
+def bot_step(game: Game) -> List[Tuple[int, Move]]:
+    """Let the acting bot take its next decision; returns it as (seat, move) entries.
+
+    Applying the entries with apply_move() to the game as it was reproduces
+    the step without consulting the bot: a draw-and-play becomes a 'draw'
+    followed by a 'play' of the drawn card.
+    """
+    seat = game.acting_player()
+    decision = game.bot_decision(seat)
+    action, card, color = decision
+    hand = game.players[seat].hand
+    index = next((i for i, c in enumerate(hand) if c is card), None)
+    result, _, played_color = game.apply_bot_decision(seat, decision)
+    if result == "draw_play":
+        # The drawn card was last in this hand until it was played
+        return [(seat, ("draw", None, None)), (seat, ("play", len(hand), played_color))]
+    if result == "draw_pass":
+        return [(seat, ("draw", None, None))]
+    return [(seat, (action, index, color))]
+
+
+def bot_jump_in(game: Game) -> Optional[Tuple[int, Move]]:
+    """Jump-in house rule: the first bot holding a copy of the top card plays it out of turn."""
+    candidate = game.jump_in_candidate()
+    if candidate is None:
+        return None
+    seat, card = candidate
+    index = next(i for i, c in enumerate(game.players[seat].hand) if c is card)
+    game.play_card(seat, card)
+    return seat, ("play", index, None)
+
+
+def record_round(seed: int, max_actions: int = MAX_ACTIONS,
+                 rules: Optional[HouseRules] = None) -> Tuple[Game, List[Tuple[int, Move]]]:
+    """Play a bot-only round and return the finished game with its move log."""
+    game = new_game(seed, rules)
+    log: List[Tuple[int, Move]] = []
+    actions = 0
+    jump_in = game.rules.jump_in
+    while not game.game_over and actions < max_actions:
+        jumped = bot_jump_in(game) if jump_in else None
+        if jumped is not None:
+            log.append(jumped)
+        else:
+            log.extend(bot_step(game))
+        actions += 1
+    return game, log
+
+
+def replay(seed: int, log: List[Tuple[int, Move]], on_move=None, rules: Optional[HouseRules] = None) -> Game:
+    """Re-deal round seed and apply a move log, checking every move against legal_moves().
+
+    on_move(game, seat, move), if given, is called after each move. Raises
+    ValueError at the first move that is not legal at that point.
+    """
+    game = new_game(seed, rules)
+    for step, (seat, move) in enumerate(log):
+        if move not in legal_moves(game, seat):
+            raise ValueError(f"Move {step} {move!r} by seat {seat} is not legal here")
+        apply_move(game, seat, move)
+        if on_move is not None:
+            on_move(game, seat, move)
+    return game
+
+
+# --- Rollouts ---
+def determinize(game: Game, perspective: int, rng: random.Random) -> None:
+    """Reshuffle what perspective cannot see (other hands and the deck), keeping every hand size."""
+    keep = game.last_drawn_card if game.drew_this_turn and game.current_index != perspective else None
+    hidden = list(game.deck.cards)
+    for i, p in enumerate(game.players):
+        if i != perspective:
+            hidden.extend(c for c in p.hand if c is not keep)
+    rng.shuffle(hidden)
+    pos = 0
+    for i, p in enumerate(game.players):
+        if i == perspective:
+            continue
+        n = len(p.hand) - (1 if keep is not None and keep in p.hand else 0)
+        cards = hidden[pos:pos + n]
+        if keep is not None and keep in p.hand:
+            cards.append(keep)
+        p.hand = Hand(cards)
+        pos += n
+    game.deck.cards = hidden[pos:]
+    p4 = game.pending_plus4
+    if p4 is not None and p4.played_by != perspective and p4.prev_color is not None:
+        # Whether a hidden +4 was a bluff follows from the redealt hand, not the real one
+        p4.was_legal = not any(c.color == p4.prev_color for c in game.players[p4.played_by].hand)
+    game.version += 1
+
+
+def reseed(game: Game, seed: int) -> None:
+    """Give the game fresh card and bot streams derived from seed."""
+    seeder = random.Random(seed)
+    game.rng = random.Random(seeder.getrandbits(64))
+    game.deck.rng = game.rng
+    game.bot_rng = random.Random(seeder.getrandbits(64))
+
+
+def rollout(position: bytes, seat: int, move: Optional[Move], seed: int) -> int:
+    """Play one determinized continuation from seat's point of view; returns the winner (-1 if aborted).
+
+    position is Game.to_bytes() output. The hidden cards are redealt, move (if
+    any) is applied for seat and the bot then plays every seat to the end.
+    """
+    rng = random.Random(seed)
+    # Both streams are replaced by reseed() below; no need to build fresh ones
+    game = Game.from_bytes(position, rng=rng, bot_rng=rng)
+    determinize(game, seat, rng)
+    reseed(game, rng.getrandbits(64))
+    if move is not None:
+        apply_move(game, seat, move)
+    play_out(game)
+    return game.winner_index if game.game_over and game.winner_index is not None else -1
+
+
+def rollout_wins(position: bytes, seat: int, move: Optional[Move], n: int, seed: int) -> int:
+    """Number of rollout() wins for seat over n continuations seeded from seed.
+
+    The same seed gives the same n redeals for any move, so comparing moves
+    on equal seeds cancels most of the luck of the hidden cards.
+    """
+    rng = random.Random(seed)
+    return sum(rollout(position, seat, move, rng.getrandbits(64)) == seat for _ in range(n))
+
+
+def rollout_winners(position: bytes, seat: int, n: int, seed: int, num_players: int = 4) -> List[int]:
+    """Wins per seat over n rollout() continuations from seat's point of view; the last entry counts aborted ones."""
+    rng = random.Random(seed)
+    counts = [0] * (num_players + 1)
+    for _ in range(n):
+        counts[rollout(position, seat, None, rng.getrandbits(64))] += 1  # -1 (aborted) is the last entry
+    return counts
+
+
+def challenge_counts(start: int, stop: int, rules: Optional[HouseRules] = None) -> Tuple[List[int], List[int]]:
+    """Illegal and total +4s per ChallengeModel key over the bot rounds seeded start..stop-1."""
+    illegal = [0] * ChallengeModel.SIZE
+    total = [0] * ChallengeModel.SIZE
+    for seed in range(start, stop):
+        game = new_game(seed, rules)
+        jump_in = game.rules.jump_in
+        actions = 0
+        while not game.game_over and actions < MAX_ACTIONS:
+            k = ChallengeModel.key(game)
+            if k is not None:
+                total[k] += 1
+                illegal[k] += not game.pending_plus4.was_legal
+            if not (jump_in and bot_jump_in(game)):
+                game.bot_act(game.acting_player())
+            actions += 1
+    return illegal, total
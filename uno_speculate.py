@@ -0,0 +1,137 @@
+"""Speculative precomputation of bot replies while the human is thinking.
+
+When it becomes the human's turn, BotReplySpeculator copies the game and, on
+a background thread, plays every move the human could make: each allowed
+card, each Wild color, drawing, passing and the +4 responses. For each of
+these branches it records the decisions the bots would take until the human
+is to act again. The copies carry the same random streams as the live game,
+so a recorded decision is exactly the decision the bot would compute live.
+
+Bot turns ask take() first: the branch matching the live state is kept and
+every other branch is dropped. On a miss the caller computes the decision
+as usual.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from uno_logic import Card, Game
+from uno_sim import Move, apply_move, legal_moves
+
+HUMAN = 0
+# Decision with the card replaced by its index in the bot's hand, plus the bot
+# random stream state right after deciding
+Reply = Tuple[Move, tuple]
+
+
+def state_key(game: Game) -> tuple:
+    """Hashable fingerprint of everything a bot decision can depend on."""
+    p4 = game.pending_plus4
+    return (
+        game.current_index, game.direction, game.current_color, game.drew_this_turn, game.game_over,
+        (p4.played_by, p4.target, p4.was_legal, p4.penalty, p4.prev_color) if p4 else None, game.draw_stack,
+        game.pending_initial_wild_for,
+        # The +4 challenge model reads the draws per color (uno_logic.ChallengeModel.key)
+        tuple(game.color_draws),
+        tuple(tuple((c.color, c.value) for c in p.hand) for p in game.players),
+        tuple((c.color, c.value) for c in game.deck.cards),
+        tuple((c.color, c.value) for c in game.discard_pile),
+        game.bot_rng.getstate(),
+    )
+
+
+def human_moves(game: Game) -> List[Move]:
+    return legal_moves(game, HUMAN)
+
+
+def apply_human_move(game: Game, move: Move) -> None:
+    apply_move(game, HUMAN, move)
+
+
+def _encode(game: Game, idx: int, decision: Tuple[str, Optional[Card], Optional[str]]) -> Move:
+    action, card, color = decision
+    if card is None:
+        return action, None, color
+    for i, c in enumerate(game.players[idx].hand):
+        if c is card:
+            return action, i, color
+    raise ValueError("decision card not in hand")
+
+
+class BotReplySpeculator:
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uno-speculate")
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Branch root (state after the human move) -> {state key: reply}
+        self._branches: Dict[tuple, Dict[tuple, Reply]] = {}
+        # Branch kept after the human committed; {} once we know nothing matches
+        self._chosen: Optional[Dict[tuple, Reply]] = None
+        self.hits = 0
+        self.misses = 0
+
+    def start(self, game: Game) -> None:
+        """Discard old branches and speculate on the human's options in the background."""
+        with self._lock:
+            self._generation += 1
+            self._branches = {}
+            self._chosen = None
+            generation = self._generation
+        self._executor.submit(self._speculate, copy.deepcopy(game), generation)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._branches = {}
+            self._chosen = {}
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _stale(self, generation: int, entries: Dict[tuple, Reply]) -> bool:
+        return generation != self._generation or (self._chosen is not None and self._chosen is not entries)
+
+    def _speculate(self, snapshot: Game, generation: int) -> None:
+        for move in human_moves(snapshot):
+            branch = copy.deepcopy(snapshot)
+            apply_human_move(branch, move)
+            entries: Dict[tuple, Reply] = {}
+            with self._lock:
+                if self._stale(generation, entries):
+                    return
+                self._branches[state_key(branch)] = entries
+            while not branch.game_over:
+                idx = branch.acting_player()
+                if idx == HUMAN:
+                    break
+                key = state_key(branch)
+                decision = branch.bot_decision(idx)
+                with self._lock:
+                    if self._stale(generation, entries):
+                        # The human committed to another branch or moved on
+                        return
+                    entries[key] = (_encode(branch, idx, decision), branch.bot_rng.getstate())
+                branch.apply_bot_decision(idx, decision)
+
+    def take(self, game: Game, idx: int) -> Optional[Tuple[str, Optional[Card], Optional[str]]]:
+        """Return the precomputed decision for the live state, or None on a miss."""
+        key = state_key(game)
+        with self._lock:
+            if self._chosen is None:
+                # First bot turn after the human committed: keep only the matching branch
+                self._chosen = self._branches.get(key, {})
+                self._branches = {}
+            reply = self._chosen.pop(key, None)
+        if reply is None:
+            self.misses += 1
+            return None
+        (action, index, color), rng_after = reply
+        # Leave the bot stream exactly where computing the decision would have
+        game.bot_rng.setstate(rng_after)
+        card = game.players[idx].hand[index] if index is not None else None
+        self.hits += 1
+        return action, card, color
@@ -0,0 +1,295 @@
+"""Constant-memory statistics over very long simulation runs.
+
+RoundStats consumes uno_sim.RoundResult records one at a time and keeps,
+for every numeric metric (winner points, turns, cards drawn, recycles, +4
+challenges), an online mean and variance (Welford) and a t-digest quantile
+sketch, plus win counts per seat and the number of bot turns played by each
+persona (Game._pick_persona). Memory does not grow with the number of
+rounds: a digest keeps at most a few hundred centroids.
+
+Every piece merges exactly (moments, counts) or within the sketch's error
+(digests), so workers aggregate their own share of the rounds and the parent
+merges the partial RoundStats:
+
+    python uno_stats.py --rounds 1000000 --workers 8
+    python uno_stats.py --rounds 100000 --rules stacking,jump_in --compression 200
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from uno_logic import PERSONAS, HouseRules
+from uno_sim import RoundResult, play_round
+
+# RoundResult fields summarized as distributions; winner_points only over won rounds
+METRICS = ("winner_points", "turns", "draws", "recycles", "plus4_challenges")
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Moments:
+    """Count, mean, variance, min and max of a stream (Welford; merged with Chan et al.)."""
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other: Moments) -> None:
+        if not other.count:
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.mean += delta * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest, k1 scale function).
+
+    Values are buffered and folded into at most about compression centroids;
+    centroids near the tails stay small, so extreme quantiles are the most
+    accurate. Exact for streams shorter than the compression.
+    """
+    __slots__ = ("compression", "_means", "_weights", "_buffer", "count", "min", "max")
+
+    def __init__(self, compression: float = 100) -> None:
+        self.compression = compression
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[Tuple[float, float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float, weight: float = 1.0) -> None:
+        self._buffer.append((x, weight))
+        self.count += weight
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other: TDigest) -> None:
+        other._compress()
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total = self.count
+        means: List[float] = []
+        weights: List[float] = []
+        done = 0.0  # weight of the centroids already emitted
+        mean, weight = items[0]
+        limit = self._k_inverse(self._k(0.0) + 1) * total
+        for x, w in items[1:]:
+            if done + weight + w <= limit:
+                weight += w
+                mean += (x - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = self._k_inverse(self._k(done / total) + 1) * total
+                mean, weight = x, w
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (0 <= q <= 1); nan for an empty digest."""
+        self._compress()
+        if not self._means:
+            return math.nan
+        means, weights = self._means, self._weights
+        target = q * self.count
+        if len(means) == 1:
+            return means[0]
+        # The tails interpolate between the extremes and the outer centroids' centres
+        if target <= weights[0] / 2:
+            return self.min + (means[0] - self.min) * target / (weights[0] / 2)
+        if target >= self.count - weights[-1] / 2:
+            rest = self.count - target
+            return self.max - (self.max - means[-1]) * rest / (weights[-1] / 2)
+        seen = weights[0] / 2  # cumulative weight at the centre of centroid i
+        for i in range(len(means) - 1):
+            step = (weights[i] + weights[i + 1]) / 2
+            if seen + step >= target:
+                return means[i] + (means[i + 1] - means[i]) * (target - seen) / step
+            seen += step
+        return means[-1]
+
+    def __len__(self) -> int:
+        self._compress()
+        return len(self._means)
+
+
+class Metric:
+    """Moments and a quantile sketch of one value."""
+    __slots__ = ("moments", "digest")
+
+    def __init__(self, compression: float = 100) -> None:
+        self.moments = Moments()
+        self.digest = TDigest(compression)
+
+    def add(self, x: float) -> None:
+        self.moments.add(x)
+        self.digest.add(x)
+
+    def merge(self, other: Metric) -> None:
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+
+    def describe(self) -> str:
+        m = self.moments
+        if not m.count:
+            return "no data"
+        quantiles = " ".join(f"p{q * 100:g}={self.digest.quantile(q):.1f}" for q in QUANTILES)
+        return f"mean={m.mean:.2f} sd={m.std:.2f} min={m.min:g} {quantiles} max={m.max:g}"
+
+
+class RoundStats:
+    """Running statistics over RoundResult records; merge() combines partial aggregates."""
+
+    def __init__(self, compression: float = 100, num_players: int = 4) -> None:
+        self.rounds = 0
+        self.aborted = 0
+        self.wins = [0] * num_players
+        self.plus4_challenges_won = 0
+        self.persona_picks = [0] * len(PERSONAS)
+        self.metrics: Dict[str, Metric] = {name: Metric(compression) for name in METRICS}
+
+    def add(self, r: RoundResult) -> None:
+        self.rounds += 1
+        if r.winner < 0:
+            self.aborted += 1
+        else:
+            self.wins[r.winner] += 1
+            self.metrics["winner_points"].add(r.winner_points)
+        for name in METRICS[1:]:
+            self.metrics[name].add(getattr(r, name))
+        self.plus4_challenges_won += r.plus4_challenges_won
+        for i, n in enumerate(r.persona_picks):
+            self.persona_picks[i] += n
+
+    def extend(self, results: Iterable[RoundResult]) -> None:
+        for r in results:
+            self.add(r)
+
+    def merge(self, other: RoundStats) -> None:
+        self.rounds += other.rounds
+        self.aborted += other.aborted
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.plus4_challenges_won += other.plus4_challenges_won
+        self.persona_picks = [a + b for a, b in zip(self.persona_picks, other.persona_picks)]
+        for name, metric in self.metrics.items():
+            metric.merge(other.metrics[name])
+
+    def summary(self) -> str:
+        n = max(1, self.rounds)
+        lines = [f"rounds={self.rounds} aborted={self.aborted} "
+                 f"win rate by seat: {' '.join(f'{w / n:.2%}' for w in self.wins)}"]
+        for name, metric in self.metrics.items():
+            lines.append(f"{name:>17}: {metric.describe()}")
+        challenges = self.metrics["plus4_challenges"].moments.mean * self.rounds
+        lines.append(f"{'+4 challenges won':>17}: {self.plus4_challenges_won / max(1, challenges):.1%}")
+        picks = max(1, sum(self.persona_picks))
+        lines.append(f"{'persona turns':>17}: " + " ".join(
+            f"{p['name']}={c / picks:.1%}" for p, c in zip(PERSONAS, self.persona_picks)))
+        return "\n".join(lines)
+
+
+def _chunk_stats(start: int, stop: int, rules: Optional[HouseRules], compression: float) -> RoundStats:
+    stats = RoundStats(compression)
+    for seed in range(start, stop):
+        stats.add(play_round(seed, rules=rules))
+    return stats
+
+
+def simulate_stats(rounds: int, workers: int = 1, base_seed: int = 0, rules: Optional[HouseRules] = None,
+                   compression: float = 100, chunk: int = 2000) -> RoundStats:
+    """Simulate seeded rounds and aggregate them; each worker task returns a partial RoundStats."""
+    chunks = ((s, min(s + chunk, base_seed + rounds)) for s in range(base_seed, base_seed + rounds, chunk))
+    if workers <= 1:
+        total = RoundStats(compression)
+        for start, stop in chunks:
+            total.merge(_chunk_stats(start, stop, rules, compression))
+        return total
+    total = RoundStats(compression)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A bounded number of tasks in flight, so memory stays flat however many rounds
+        inflight: Set[Future] = set()
+        for start, stop in chunks:
+            inflight.add(pool.submit(_chunk_stats, start, stop, rules, compression))
+            if len(inflight) >= 2 * workers:
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    total.merge(fut.result())
+        for fut in inflight:
+            total.merge(fut.result())
+    return total
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Streaming statistics over bot-only rounds.")
+    parser.add_argument("--rounds", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=2000, help="rounds per worker task")
+    parser.add_argument("--compression", type=float, default=100, help="t-digest size/accuracy trade-off")
+    parser.add_argument("--rules", default="", help="comma-separated house rules")
+    args = parser.parse_args(argv)
+
+    rules = HouseRules.from_names(n.strip() for n in args.rules.split(",") if n.strip())
+    start = time.perf_counter()
+    stats = simulate_stats(args.rounds, args.workers, args.seed, rules, args.compression, args.chunk)
+    elapsed = time.perf_counter() - start
+    print(stats.summary())
+    print(f"{stats.rounds / elapsed:.0f} rounds/s over {args.workers} workers ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Long-running, resumable bot tournaments.
+
+A tournament plays `matches` bot-only matches to `target_score` points.
+Progress (completed matches, current match scores, aggregates, the master
+random stream and the round in progress) is checkpointed to a JSON file
+every few seconds and on SIGINT/SIGTERM. Checkpoints are written to a
+temporary file and renamed over the old one, so a crash mid-write leaves
+the previous checkpoint intact. Restarting with the same arguments resumes
+exactly where the run stopped; aggregates are only updated at round end,
+together with the checkpointed state, so no round is counted twice.
+
+    python uno_tournament.py --matches 10000 --checkpoint run.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import signal
+import tempfile
+import time
+from typing import List, Optional
+
+from uno_logic import Game, rng_state, set_rng_state
+from uno_sim import MAX_ACTIONS, new_game
+
+CHECKPOINT_VERSION = 1
+
+
+class Tournament:
+    def __init__(self, matches: int, target_score: int = 500, seed: int = 0) -> None:
+        self.config = {"matches": matches, "target_score": target_score, "seed": seed}
+        self.master = random.Random(seed)
+        self.matches_done = 0
+        self.rounds_done = 0
+        self.scores = [0, 0, 0, 0]
+        self.match_wins = [0, 0, 0, 0]
+        self.round_wins = [0, 0, 0, 0]
+        self.points = [0, 0, 0, 0]
+        self.aborted_rounds = 0
+        self.turns = 0
+        self.recycles = 0
+        self.plus4_challenges = 0
+        self.plus4_challenges_won = 0
+        self.game: Optional[Game] = None
+        self.game_actions = 0
+        self._stop = False
+
+    @property
+    def finished(self) -> bool:
+        return self.matches_done >= self.config["matches"]
+
+    # --- Checkpointing ---
+    def to_checkpoint(self) -> dict:
+        return {
+            "version": CHECKPOINT_VERSION,
+            "config": self.config,
+            "master_rng": rng_state(self.master),
+            "matches_done": self.matches_done,
+            "rounds_done": self.rounds_done,
+            "scores": self.scores,
+            "match_wins": self.match_wins,
+            "round_wins": self.round_wins,
+            "points": self.points,
+            "aborted_rounds": self.aborted_rounds,
+            "totals": [self.turns, self.recycles, self.plus4_challenges, self.plus4_challenges_won],
+            "game": self.game.to_state() if self.game is not None else None,
+            "game_actions": self.game_actions,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, data: dict) -> Tournament:
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {data.get('version')!r}")
+        t = cls(**data["config"])
+        set_rng_state(t.master, data["master_rng"])
+        t.matches_done = data["matches_done"]
+        t.rounds_done = data["rounds_done"]
+        t.scores = data["scores"]
+        t.match_wins = data["match_wins"]
+        t.round_wins = data["round_wins"]
+        t.points = data["points"]
+        t.aborted_rounds = data["aborted_rounds"]
+        t.turns, t.recycles, t.plus4_challenges, t.plus4_challenges_won = data["totals"]
+        t.game = Game.from_state(data["game"]) if data["game"] is not None else None
+        t.game_actions = data["game_actions"]
+        return t
+
+    def save(self, path: str) -> None:
+        """Atomically replace the checkpoint at path."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(prefix=".uno-ckpt-", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.to_checkpoint(), f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(directory, os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    @classmethod
+    def load(cls, path: str) -> Tournament:
+        with open(path) as f:
+            return cls.from_checkpoint(json.load(f))
+
+    # --- Running ---
+    def _finish_round(self) -> None:
+        g = self.game
+        self.rounds_done += 1
+        self.turns += g.turns
+        self.recycles += g.recycles
+        self.plus4_challenges += g.plus4_challenges
+        self.plus4_challenges_won += g.plus4_challenges_won
+        if g.game_over and g.winner_index is not None:
+            pts = g.winner_points()
+            self.round_wins[g.winner_index] += 1
+            self.points[g.winner_index] += pts
+            self.scores[g.winner_index] += pts
+            if self.scores[g.winner_index] >= self.config["target_score"]:
+                self.match_wins[g.winner_index] += 1
+                self.matches_done += 1
+                self.scores = [0, 0, 0, 0]
+        else:
+            self.aborted_rounds += 1
+        self.game = None
+        self.game_actions = 0
+
+    def step(self) -> None:
+        """Advance by one action, starting or finishing rounds as needed."""
+        if self.game is None:
+            self.game = new_game(self.master.getrandbits(64))
+        g = self.game
+        if not g.game_over and self.game_actions < MAX_ACTIONS:
+            g.bot_act(g.acting_player())
+            self.game_actions += 1
+        if g.game_over or self.game_actions >= MAX_ACTIONS:
+            self._finish_round()
+
+    def request_stop(self, *_args) -> None:
+        self._stop = True
+
+    def run(self, checkpoint: Optional[str] = None, every: float = 30.0) -> bool:
+        """Run until finished or stopped; returns True when the tournament is complete."""
+        last_save = time.monotonic()
+        while not self.finished and not self._stop:
+            self.step()
+            if checkpoint and time.monotonic() - last_save >= every:
+                self.save(checkpoint)
+                last_save = time.monotonic()
+        if checkpoint:
+            self.save(checkpoint)
+        return self.finished
+
+    def summary(self) -> str:
+        n = max(1, self.rounds_done)
+        return (f"matches={self.matches_done}/{self.config['matches']} rounds={self.rounds_done} "
+                f"match_wins={self.match_wins} round_wins={self.round_wins} aborted={self.aborted_rounds} "
+                f"avg_turns={self.turns / n:.1f} recycles={self.recycles} "
+                f"+4 challenges={self.plus4_challenges} won={self.plus4_challenges_won}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a resumable bot-only UNO tournament.")
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--target-score", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint", default="uno_tournament.ckpt.json")
+    parser.add_argument("--every", type=float, default=30.0, help="seconds between checkpoints")
+    args = parser.parse_args(argv)
+
+    config = {"matches": args.matches, "target_score": args.target_score, "seed": args.seed}
+    if os.path.exists(args.checkpoint):
+        tournament = Tournament.load(args.checkpoint)
+        if tournament.config != config:
+            parser.error(f"{args.checkpoint} belongs to a run with {tournament.config}")
+        print(f"Resuming: {tournament.summary()}")
+    else:
+        tournament = Tournament(**config)
+    signal.signal(signal.SIGINT, tournament.request_stop)
+    signal.signal(signal.SIGTERM, tournament.request_stop)
+    done = tournament.run(args.checkpoint, args.every)
+    print(("Finished: " if done else "Stopped, checkpoint saved: ") + tournament.summary())
+
+
+if __name__ == "__main__":
+    main()
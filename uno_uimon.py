@@ -0,0 +1,210 @@
+"""Tk event-loop latency and render-time monitor.
+
+UiMonitor measures how responsive the GUI is:
+
+- loop lag: a heartbeat rescheduled with root.after(interval) records how
+  late each beat fires; anything the main loop does between beats (AI,
+  rendering) shows up here
+- wall time of instrumented methods (refresh, render_bots, process_bot_turn),
+  less any time spent in a modal dialog opened under paused()
+- widgets created and destroyed per frame, i.e. per refresh call; the
+  widget tree is walked around one frame a second, since walking it around
+  every frame costs about as much as the refresh being measured
+
+Recent samples are kept per series and shown as live percentiles in a small
+diagnostics window; a full report is written to a file on exit.
+
+    python main.py --monitor                 # report to uno_uimon.txt on exit
+    python main.py --monitor --monitor-out lag.txt
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import time
+import tkinter as tk
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_OUT = "uno_uimon.txt"
+PERCENTILES = (50, 90, 99)
+
+
+def _walk(widget: tk.Misc, names: Set[str]) -> None:
+    for child in widget.winfo_children():
+        names.add(str(child))
+        _walk(child, names)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class Series:
+    """Most recent samples of one measurement plus lifetime count, total and max."""
+
+    def __init__(self, window: int) -> None:
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def summary(self) -> Tuple[int, float, List[float], float]:
+        """(count, mean, recent percentiles, lifetime max)."""
+        ordered = sorted(self.samples)
+        mean = self.total / self.count if self.count else 0.0
+        return self.count, mean, [percentile(ordered, p) for p in PERCENTILES], self.max
+
+
+class UiMonitor:
+    def __init__(self, root: tk.Misc, interval_ms: int = 50, window: int = 2000,
+                 panel_every_ms: int = 500, widgets_every_ms: int = 1000) -> None:
+        self.root = root
+        self.interval_ms = interval_ms
+        self.window = window
+        self.panel_every_ms = panel_every_ms
+        self.widgets_every_ms = widgets_every_ms
+        self.series: Dict[str, Series] = {}
+        self.units: Dict[str, str] = {}
+        self._expected: Optional[float] = None
+        self._beat_id: Optional[str] = None
+        self._panel: Optional[tk.Toplevel] = None
+        self._panel_label: Optional[tk.Label] = None
+        self._panel_id: Optional[str] = None
+        self._widgets_id: Optional[str] = None
+        self._count_next = False  # walk the widget tree around the next frame
+        self._depth = 0
+        self._paused = 0.0  # seconds spent under paused(), left out of method timings
+
+    def record(self, name: str, value: float, unit: str = "ms") -> None:
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = Series(self.window)
+            self.units[name] = unit
+        series.add(value)
+
+    # --- Heartbeat ---
+    def start(self) -> None:
+        if self._beat_id is None:
+            self._expected = time.perf_counter() + self.interval_ms / 1000.0
+            self._beat_id = self.root.after(self.interval_ms, self._beat)
+        if self._widgets_id is None:
+            self._widgets_id = self.root.after(self.widgets_every_ms, self._arm_widget_count)
+
+    def stop(self) -> None:
+        for timer in (self._beat_id, self._panel_id, self._widgets_id):
+            if timer is not None:
+                try:
+                    self.root.after_cancel(timer)
+                except tk.TclError:
+                    pass
+        self._beat_id = self._panel_id = self._widgets_id = None
+
+    def _beat(self) -> None:
+        now = time.perf_counter()
+        self.record("loop lag", max(0.0, (now - self._expected) * 1000.0))
+        self._expected = now + self.interval_ms / 1000.0
+        self._beat_id = self.root.after(self.interval_ms, self._beat)
+
+    def _arm_widget_count(self) -> None:
+        self._count_next = True
+        self._widgets_id = self.root.after(self.widgets_every_ms, self._arm_widget_count)
+
+    @contextlib.contextmanager
+    def paused(self) -> Iterator[None]:
+        """Leave the time spent in the block out of the timings, e.g. a modal messagebox.
+
+        The enclosing instrumented methods don't count it, and a heartbeat held
+        back by the dialog is not reported as loop lag.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._paused += now - start
+            if self._expected is not None:
+                self._expected = max(self._expected, now)
+
+    # --- Method timing ---
+    def instrument(self, obj: object, names: Iterable[str], frame: str = "refresh") -> None:
+        """Replace obj's methods with timed wrappers; the frame method also samples widget churn.
+
+        Wrappers are set on the instance, so callbacks bound later (root.after,
+        button commands) go through them as well.
+        """
+        for name in names:
+            setattr(obj, name, self._timed(name, getattr(obj, name), count_widgets=(name == frame)))
+
+    def _timed(self, name: str, method, count_widgets: bool = False):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            # Only the outermost frame counts widgets (refresh may nest), and only when
+            # the sampling timer asked for it
+            churn = count_widgets and self._count_next and self._depth == 0
+            if churn:
+                self._count_next = False
+                before: Set[str] = set()
+                _walk(self.root, before)
+            self._depth += 1
+            start = time.perf_counter()
+            paused = self._paused
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start - (self._paused - paused)
+                self.record(name, elapsed * 1000.0)
+                self._depth -= 1
+                if churn:
+                    after: Set[str] = set()
+                    _walk(self.root, after)
+                    self.record("widgets created", len(after - before), unit="")
+                    self.record("widgets destroyed", len(before - after), unit="")
+        return wrapper
+
+    # --- Reporting ---
+    def report(self) -> str:
+        head = ", ".join(f"p{p}" for p in PERCENTILES)
+        lines = [f"{'series':<18} {'n':>7} {'mean':>8}  {head} (last {self.window}), max"]
+        for name, series in self.series.items():
+            count, mean, pcts, peak = series.summary()
+            unit = self.units[name]
+            values = " ".join(f"{v:8.2f}" for v in pcts)
+            lines.append(f"{name:<18} {count:>7} {mean:8.2f}  {values} {peak:8.2f} {unit}")
+        return "\n".join(lines)
+
+    def dump(self, path: str = DEFAULT_OUT) -> None:
+        with open(path, "w") as f:
+            f.write(time.strftime("UNO UI monitor report, %Y-%m-%d %H:%M:%S\n"))
+            f.write(f"heartbeat every {self.interval_ms} ms\n\n")
+            f.write(self.report() + "\n")
+
+    # --- Live panel ---
+    def show_panel(self) -> None:
+        if self._panel is None:
+            self._panel = tk.Toplevel(self.root)
+            self._panel.title("UI diagnostics")
+            self._panel.configure(bg="#111")
+            # Closing the panel only hides it; monitoring continues
+            self._panel.protocol("WM_DELETE_WINDOW", self._panel.withdraw)
+            self._panel_label = tk.Label(self._panel, text="", justify=tk.LEFT, anchor="nw",
+                                         fg="#9cdcfe", bg="#111", font=("Consolas", 10))
+            self._panel_label.pack(fill=tk.BOTH, expand=True, padx=8, pady=6)
+        self._panel.deiconify()
+        if self._panel_id is None:
+            self._update_panel()
+
+    def _update_panel(self) -> None:
+        if self._panel_label is not None:
+            self._panel_label.config(text=self.report())
+        self._panel_id = self.root.after(self.panel_every_ms, self._update_panel)
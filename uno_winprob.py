@@ -0,0 +1,170 @@
+"""Win probability of every seat, seen from one seat, by determinized rollouts.
+
+From the perspective seat, the cards it cannot see are redealt and the bot
+plays the round out (uno_sim.rollout); the share of rollouts each seat wins
+is its estimated win probability, with a Wilson score interval. Many
+positions are estimated in one call: their rollouts are cut into batches,
+and batches of different positions are packed into the same worker task, so
+process start-up and hand-off (positions travel as Game.to_bytes()) are paid
+once per task rather than once per position. Rollout seeds are fixed per
+position before any work is split, so the result does not depend on the
+number of workers.
+
+    from uno_winprob import estimate, estimate_many
+    est = estimate(game, seat=0, rollouts=400)
+    est.probs[2], est.low[2], est.high[2]
+    labels = estimate_many([(g, g.acting_player()) for g in games], rollouts=200, workers=8)
+
+Positions sampled from bot rounds can be labelled from the command line:
+
+    python uno_winprob.py --positions 200 --turn 20 --rollouts 200 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from uno_logic import Game
+from uno_sim import new_game, play_out, rollout_winners
+
+BATCH = 25
+# Worker tasks per worker: enough to balance uneven positions, few enough to amortize hand-off
+TASKS_PER_WORKER = 4
+
+Position = Union[Game, bytes]
+# One batch: (position index, Game.to_bytes(), perspective seat, rollouts, seed)
+Batch = Tuple[int, bytes, int, int, int]
+
+
+class WinEstimate(NamedTuple):
+    seat: int  # perspective
+    probs: Tuple[float, ...]  # per seat
+    low: Tuple[float, ...]  # confidence interval per seat
+    high: Tuple[float, ...]
+    rollouts: int
+    aborted: int  # rollouts that hit MAX_ACTIONS (counted as nobody's win)
+
+
+def wilson(wins: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for wins out of n; stays inside [0, 1] even at 0 or n wins."""
+    if n == 0:
+        return 0.0, 1.0
+    p = wins / n
+    centre = p + z * z / (2 * n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+    denom = 1 + z * z / n
+    return max(0.0, (centre - margin) / denom), min(1.0, (centre + margin) / denom)
+
+
+def _run_batches(batches: Sequence[Batch]) -> List[Tuple[int, List[int]]]:
+    return [(i, rollout_winners(position, seat, n, seed)) for i, position, seat, n, seed in batches]
+
+
+def _finished(game: Game, seat: int) -> WinEstimate:
+    probs = tuple(1.0 if i == game.winner_index else 0.0 for i in range(len(game.players)))
+    return WinEstimate(seat, probs, probs, probs, 0, 0)
+
+
+def estimate_many(positions: Sequence[Tuple[Position, int]], rollouts: int = 400, workers: int = 1,
+                  seed: Optional[int] = None, z: float = 1.96,
+                  executor: Optional[Executor] = None) -> List[WinEstimate]:
+    """Estimate every (position, perspective seat) pair; positions are Games or Game.to_bytes() output.
+
+    Work runs on executor if given (workers then only sizes the tasks), on a
+    fresh process pool if workers > 1, and in this process otherwise. A
+    finished round is reported exactly.
+    """
+    rng = random.Random(seed)
+    results: List[Optional[WinEstimate]] = [None] * len(positions)
+    counts: List[List[int]] = []
+    batches: List[Batch] = []
+    for i, (position, seat) in enumerate(positions):
+        game = position if isinstance(position, Game) else Game.from_bytes(position)
+        counts.append([0] * (len(game.players) + 1))
+        if game.game_over:
+            results[i] = _finished(game, seat)
+            continue
+        data = position if isinstance(position, bytes) else game.to_bytes()
+        for start in range(0, rollouts, BATCH):
+            batches.append((i, data, seat, min(BATCH, rollouts - start), rng.getrandbits(64)))
+
+    tasks = max(1, workers * TASKS_PER_WORKER)
+    size = max(1, math.ceil(len(batches) / tasks))
+    chunks = [batches[k:k + size] for k in range(0, len(batches), size)]
+    if executor is not None:
+        done = executor.map(_run_batches, chunks)
+    elif workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(_run_batches, chunks))
+    else:
+        done = map(_run_batches, chunks)
+    for part in done:
+        for i, winners in part:
+            total = counts[i]
+            for k, c in enumerate(winners):
+                total[k] += c
+
+    for i, (position, seat) in enumerate(positions):
+        if results[i] is not None:
+            continue
+        *wins, aborted = counts[i]
+        intervals = [wilson(w, rollouts, z) for w in wins]
+        results[i] = WinEstimate(seat, tuple(w / rollouts for w in wins), tuple(lo for lo, _ in intervals),
+                                 tuple(hi for _, hi in intervals), rollouts, aborted)
+    return results
+
+
+def estimate(position: Position, seat: int, rollouts: int = 400, seed: Optional[int] = None,
+             z: float = 1.96, workers: int = 1) -> WinEstimate:
+    """Win probability of every seat in one position, from seat's point of view."""
+    return estimate_many([(position, seat)], rollouts, workers, seed, z)[0]
+
+
+def sample_positions(count: int, turn: int, base_seed: int = 0) -> List[Tuple[int, Game]]:
+    """(seed, game) after the bot has played turn actions of round seed; rounds that end sooner are skipped."""
+    out = []
+    seed = base_seed
+    while len(out) < count:
+        game = new_game(seed)
+        play_out(game, turn)
+        if not game.game_over:
+            out.append((seed, game))
+        seed += 1
+    return out
+
+
+def format_estimate(est: WinEstimate) -> str:
+    return "  ".join(f"seat {i}: {p:5.1%} [{lo:5.1%}, {hi:5.1%}]"
+                     for i, (p, lo, hi) in enumerate(zip(est.probs, est.low, est.high)))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Estimate win probabilities of positions from bot rounds.")
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--turn", type=int, default=20, help="bot actions played before each position")
+    parser.add_argument("--rollouts", type=int, default=200, help="rollouts per position")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--quiet", "-q", action="store_true", help="only print the totals")
+    args = parser.parse_args(argv)
+
+    sampled = sample_positions(args.positions, args.turn, args.seed)
+    start = time.perf_counter()
+    estimates = estimate_many([(g, g.acting_player()) for _, g in sampled], args.rollouts, args.workers,
+                              seed=args.seed)
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        for (seed, _), est in zip(sampled, estimates):
+            print(f"round {seed} from seat {est.seat}: {format_estimate(est)}")
+    total = len(estimates) * args.rollouts
+    print(f"{len(estimates)} positions x {args.rollouts} rollouts in {elapsed:.1f}s "
+          f"({total / elapsed:.0f} rollouts/s with {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()